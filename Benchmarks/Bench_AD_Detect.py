@@ -0,0 +1,82 @@
+"""
+- Benchmark of the CV ad detection raster: full-resolution path vs downscaled detection (`AD_DETECT_ZOOM`)
+- Full path: render the first page at --full zoom (3x) and run `CV_Detect_Boxes` on it
+- Tiered path: render at --zoom (1x), detect, map the boxes back to page coordinates (`CV_Page_Boxes`)
+- Agreement: boxes of both paths are matched by IoU in page coordinates (a box agrees with IoU >= --iou)
+
+Usage:
+    python Benchmarks/Bench_AD_Detect.py H:/AI_Data/RMRB/2015/20150102/2015010204.pdf [more.pdf ...] --zoom 1 --repeat 3
+    python Benchmarks/Bench_AD_Detect.py --synthetic 10      # 10 pages of text columns, half of them with an ad frame
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path: sys.path.append(script_dir)
+import fitz
+import numpy as np
+from RMRBCore.RMRB_Image_v6 import CV_Page_Boxes
+
+def Synthetic_PDF(Path, AD):
+    # Newspaper-like page: text columns, with AD a framed ad over about half of the page
+    with fitz.open() as PDF:
+        page = PDF.new_page(width=842, height=1191)
+        for column in range(4):
+            page.insert_textbox(fitz.Rect(40 + column * 195, 60, 220 + column * 195, 1150), f"News column {column} " * 120, fontsize=8)
+        if AD:
+            page.draw_rect(fitz.Rect(40, 560, 802, 1090), color=(0, 0, 0), fill=(1, 1, 1), width=2)
+            page.insert_textbox(fitz.Rect(80, 600, 760, 1050), "Advertisement " * 40, fontsize=20)
+        PDF.save(Path)
+
+def Detect(pdf_path, Zoom):
+    # Render the first page at Zoom and return (seconds, boxes in page coordinates)
+    begin = time.perf_counter()
+    with fitz.open(pdf_path) as PDF:
+        pix = PDF.load_page(0).get_pixmap(matrix=fitz.Matrix(Zoom, Zoom))
+        Boxes = CV_Page_Boxes(np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n), Zoom)
+    return time.perf_counter() - begin, Boxes
+
+def IoU(a, b):
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0: return 0.0
+    Inter = w * h
+    return Inter / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - Inter)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CV ad detection: full-resolution vs downscaled raster")
+    parser.add_argument("pdfs", nargs="*")
+    parser.add_argument("--synthetic", type=int, default=0, help="Benchmark N synthetic one-page PDFs")
+    parser.add_argument("--full", type=float, default=3, help="Zoom of the current path (default: 3)")
+    parser.add_argument("--zoom", type=float, default=1, help="Zoom of the detection raster (default: 1)")
+    parser.add_argument("--iou", type=float, default=0.9, help="IoU for two boxes to agree (default: 0.9)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    Work_Dir = tempfile.mkdtemp(prefix="Bench_AD_Detect_")
+    PDFs = list(args.pdfs)
+    for i in range(args.synthetic):
+        PDFs.append(os.path.join(Work_Dir, f"Synthetic_{i + 1:02d}.pdf"))
+        Synthetic_PDF(PDFs[-1], AD=i % 2 == 0)
+    if not PDFs: sys.exit("No PDF given (use --synthetic N)")
+    print(f"{'PDF':<28}{f'{args.full:g}x (s)':>10}{f'{args.zoom:g}x (s)':>10}{'Boxes':>8}{'Agree':>8}{'Mean IoU':>10}")
+    Totals = {"Full": 0.0, "Tiered": 0.0, "Boxes": 0, "Agree": 0}
+    try:
+        for pdf_path in PDFs:
+            Full_Time, Full_Boxes = min(Detect(pdf_path, args.full) for _ in range(args.repeat))
+            Tiered_Time, Tiered_Boxes = min(Detect(pdf_path, args.zoom) for _ in range(args.repeat))
+            Best = [max((IoU(box, other) for other in Tiered_Boxes), default=0.0) for box in Full_Boxes]
+            Agree = sum(value >= args.iou for value in Best)
+            # Boxes found only by the tiered path count as disagreements too
+            Boxes = max(len(Full_Boxes), len(Tiered_Boxes))
+            Mean = sum(Best) / len(Best) if Best else float(not Tiered_Boxes)
+            print(f"{os.path.basename(pdf_path):<28}{Full_Time:>10.3f}{Tiered_Time:>10.3f}{Boxes:>8}{Agree:>8}{Mean:>10.3f}")
+            Totals["Full"] += Full_Time
+            Totals["Tiered"] += Tiered_Time
+            Totals["Boxes"] += Boxes
+            Totals["Agree"] += Agree
+        print(f"{'Total':<28}{Totals['Full']:>10.3f}{Totals['Tiered']:>10.3f}{Totals['Boxes']:>8}{Totals['Agree']:>8}"
+              f"  (speed-up {Totals['Full'] / max(Totals['Tiered'], 1e-9):.1f}x)")
+    finally: shutil.rmtree(Work_Dir, ignore_errors=True)
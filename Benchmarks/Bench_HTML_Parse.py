@@ -0,0 +1,74 @@
+"""
+- Micro-benchmark of the per-page parse cost of the official node_XX.html pages
+- Old path: `apparent_encoding` (chardet) + BeautifulSoup; new path: `Decode_HTML` + fast tokenizer/regex
+- Both paths must agree on every fixture page (the BeautifulSoup path stays the verified fallback)
+
+Usage:
+    python Benchmarks/Bench_HTML_Parse.py --repeat 200                   # run the benchmark on the checked-in Tests/Fixtures pages
+    python Benchmarks/Bench_HTML_Parse.py FIXTURE_DIR --save 20250102   # save node_XX.html pages of a date
+    python Benchmarks/Bench_HTML_Parse.py FIXTURE_DIR --repeat 200       # run the benchmark on saved pages
+"""
+import os
+import sys
+import time
+import argparse
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path: sys.path.append(script_dir)
+from requests.compat import chardet
+from RMRBCore.RMRB_Downloader_v2 import (
+    Official_Page_URL, Decode_HTML, Fast_Version_Num, Fast_PDF_Link,
+    Soup_Version_Num, Soup_PDF_Link
+)
+from RMRBCore.RMRB_HTTP_v6 import Limited_Get
+from Utils.main import TextUtils
+Format_Num = TextUtils.Format_Num
+FIXTURE_DIR = os.path.join(script_dir, "Tests", "Fixtures")
+
+def Save_Fixtures(Fixture_Dir, DATE):
+    os.makedirs(Fixture_Dir, exist_ok=True)
+    YEAR, MONTH, DAY = DATE[:4], DATE[4:6], DATE[6:8]
+    response = Limited_Get(Official_Page_URL(YEAR, MONTH, DAY))
+    response.raise_for_status()
+    Version_Num = Fast_Version_Num(Decode_HTML(response.content, response.headers.get("Content-Type", ""))) or 1
+    for Version in range(1, Version_Num + 1):
+        url = Official_Page_URL(YEAR, MONTH, DAY, Format_Num(Version))
+        content = Limited_Get(url).content
+        with open(os.path.join(Fixture_Dir, f"{DATE}_node_{Format_Num(Version)}.html"), "wb") as file: file.write(content)
+        print(f"Saved {url}")
+
+def Old_Path(content, url):
+    text = content.decode(chardet.detect(content)["encoding"] or "utf-8", errors="replace")
+    return Soup_Version_Num(text), Soup_PDF_Link(text, url)
+
+def New_Path(content, url):
+    text = Decode_HTML(content)
+    return Fast_Version_Num(text), Fast_PDF_Link(text, url)
+
+def Timeit(Fun, content, url, Repeat):
+    begin = time.perf_counter()
+    for _ in range(Repeat): Fun(content, url)
+    return (time.perf_counter() - begin) / Repeat
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-page parse cost of node_XX.html pages")
+    parser.add_argument("fixture_dir", nargs="?", default=FIXTURE_DIR, help="Folder of node_XX.html pages (default: Tests/Fixtures)")
+    parser.add_argument("--save", metavar="YYYYMMDD", help="Download the node_XX.html pages of a date into fixture_dir")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    if args.save:
+        Save_Fixtures(args.fixture_dir, args.save)
+        sys.exit()
+    Pages = sorted(name for name in os.listdir(args.fixture_dir) if name.endswith(".html"))
+    if not Pages: sys.exit(f"No .html fixture in {args.fixture_dir} (use --save YYYYMMDD)")
+    Old_Total = New_Total = 0
+    print(f"{'Page':<32}{'Old (ms)':>12}{'New (ms)':>12}{'Speedup':>10}  Agree")
+    for name in Pages:
+        with open(os.path.join(args.fixture_dir, name), "rb") as file: content = file.read()
+        url = "http://paper.people.com.cn/rmrb/pc/layout/000000/00/" + name.split("_", 1)[-1]
+        Agree = Old_Path(content, url) == New_Path(content, url)
+        Old = Timeit(Old_Path, content, url, args.repeat)
+        New = Timeit(New_Path, content, url, args.repeat)
+        Old_Total += Old
+        New_Total += New
+        print(f"{name:<32}{Old * 1000:>12.3f}{New * 1000:>12.3f}{Old / New:>9.1f}x  {Agree}")
+    print(f"{'Mean':<32}{Old_Total / len(Pages) * 1000:>12.3f}{New_Total / len(Pages) * 1000:>12.3f}{Old_Total / New_Total:>9.1f}x")
@@ -0,0 +1,77 @@
+"""
+- Benchmark of the AD image storage formats of `Save_Image`: write/read time, throughput and size per format
+- Formats: PNG at several zlib levels (`AD_PNG_COMPRESSION`), lossless WebP, raw .npy (memmapped on read)
+- Every format must read back the exact pixels (lossless)
+- Pick a format per stage in `AD_IMAGE_FORMAT` ("Page", "Marked", "Block"); write the output to the drive you use
+(--dir H:/tmp) since encode time and disk speed trade off differently on external drives
+
+Usage:
+    python Benchmarks/Bench_Image_Format.py H:/AI_Data/RMRB/2015/20150102/2015010204.pdf [more.pdf ...] --zoom 3 --repeat 3
+    python Benchmarks/Bench_Image_Format.py --synthetic --dir H:/tmp
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path: sys.path.append(script_dir)
+import fitz
+import numpy as np
+from RMRBCore.RMRB_Image_v6 import Save_Image, Load_Image
+
+# (label, format, PNG level)
+FORMATS = [("png-0", "png", 0), ("png-1", "png", 1), ("png-3", "png", 3), ("png-6", "png", 6), ("png-9", "png", 9), ("webp", "webp", None), ("npy", "npy", None)]
+
+def Synthetic_Page(Path):
+    # Newspaper-like page: dense text columns, a framed ad and a photo
+    Pixels = (np.random.default_rng(0).random((300, 400, 3)) * 255).astype(np.uint8)
+    Photo = fitz.Pixmap(fitz.csRGB, 400, 300, Pixels.tobytes(), False).tobytes("png")
+    with fitz.open() as PDF:
+        page = PDF.new_page(width=842, height=1191)
+        for column in range(4):
+            page.insert_textbox(fitz.Rect(40 + column * 195, 60, 220 + column * 195, 540), f"News column {column} " * 60, fontsize=8)
+        page.insert_image(fitz.Rect(440, 560, 802, 830), stream=Photo)
+        page.draw_rect(fitz.Rect(40, 860, 802, 1150), color=(0, 0, 0), width=2)
+        page.insert_textbox(fitz.Rect(60, 880, 780, 1130), "Advertisement " * 40, fontsize=18)
+        PDF.save(Path)
+
+def Render(pdf_path, Zoom):
+    # BGR array of the first page, like the stored AD pages
+    with fitz.open(pdf_path) as PDF: pix = PDF.load_page(0).get_pixmap(matrix=fitz.Matrix(Zoom, Zoom))
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)[:, :, ::-1].copy()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AD image formats: throughput and size")
+    parser.add_argument("pdfs", nargs="*")
+    parser.add_argument("--synthetic", action="store_true", help="Benchmark a synthetic newspaper page")
+    parser.add_argument("--zoom", type=float, default=3, help="Render zoom (default: 3, as AD_RENDER_ZOOM)")
+    parser.add_argument("--dir", default="", help="Folder for the written files (default: system temp)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    Work_Dir = tempfile.mkdtemp(prefix="Bench_Image_Format_", dir=args.dir or None)
+    PDFs = list(args.pdfs)
+    if args.synthetic:
+        PDFs.append(os.path.join(Work_Dir, "Synthetic.pdf"))
+        Synthetic_Page(PDFs[-1])
+    if not PDFs: sys.exit("No PDF given (use --synthetic)")
+    try:
+        for pdf_path in PDFs:
+            Image = Render(pdf_path, args.zoom)
+            Raw_MB = Image.nbytes / 1024 / 1024
+            print(f"{os.path.basename(pdf_path)}: {Image.shape[1]}x{Image.shape[0]} ({Raw_MB:.1f} MB raw)")
+            print(f"{'Format':<10}{'Write (s)':>11}{'MB/s':>9}{'Read (s)':>10}{'Size (KB)':>12}{'Ratio':>8}  Lossless")
+            for label, Format, Level in FORMATS:
+                Writes, Reads = [], []
+                for _ in range(args.repeat):
+                    begin = time.perf_counter()
+                    Path = Save_Image(Image, os.path.join(Work_Dir, f"Page_{label}"), Format=Format, Level=Level)
+                    Writes.append(time.perf_counter() - begin)
+                    begin = time.perf_counter()
+                    Loaded = np.asarray(Load_Image(Path)) # .npy: touch the pages of the memmap
+                    Lossless = np.array_equal(Loaded, Image)
+                    Reads.append(time.perf_counter() - begin)
+                Size = os.path.getsize(Path)
+                print(f"{label:<10}{min(Writes):>11.3f}{Raw_MB / min(Writes):>9.0f}{min(Reads):>10.3f}{Size / 1024:>12.0f}{Image.nbytes / Size:>8.1f}  {Lossless}")
+    finally: shutil.rmtree(Work_Dir, ignore_errors=True)
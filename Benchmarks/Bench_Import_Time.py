@@ -0,0 +1,63 @@
+"""
+- Import-time harness: runs each target in a fresh `python -X importtime` process
+- Reports wall time, the cumulative import time of the target and the slowest imported packages
+- Targets are import statements; the defaults cover the facade, the CLI and every core module
+
+Usage:
+    python Benchmarks/Bench_Import_Time.py                                # default targets
+    python Benchmarks/Bench_Import_Time.py "from RMRB_Main import OCR" --top 15
+    python Benchmarks/Bench_Import_Time.py --repeat 5                     # best of 5 runs
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = [
+    "import RMRB_Main",
+    "from RMRB_Main import Check_RMRB_Exist",
+    "from RMRB_Main import Check_OCR_Completion",
+    "from RMRB_Main import Check_Summary_Completion",
+    "import RMRB_CLI",
+    "import RMRBCore.RMRB_Downloader_v2",
+    "import RMRBCore.RMRB_PDF_v6",
+    "import RMRBCore.RMRB_OCR_v6",
+    "import RMRBCore.RMRB_LLM_v6",
+    "import RMRBCore.RMRB_Image_v6",
+    "import RMRBCore.RMRB_AD_v6",
+]
+
+def Import_Time(Statement):
+    """
+    - Return (wall seconds, {indented module name: cumulative microseconds}, error)
+    """
+    begin = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", Statement], cwd=script_dir, capture_output=True, text=True)
+    wall = time.perf_counter() - begin
+    Modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        Modules[name[1:].rstrip()] = int(cumulative) # Keep the indent: nested imports are indented by two spaces per level
+    error = process.stderr.strip().splitlines()[-1] if process.returncode else ""
+    return wall, Modules, error
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup cost of the RMRB entry points")
+    parser.add_argument("targets", nargs="*", default=TARGETS, help="Import statements (default: core modules)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level packages to show per target")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per target (best is reported)")
+    args = parser.parse_args()
+    print(f"{'Target':<50}{'Wall (s)':>10}{'Import (s)':>12}  Slowest")
+    for Statement in args.targets:
+        Runs = [Import_Time(Statement) for _ in range(args.repeat)]
+        wall, Modules, error = min(Runs, key=lambda run: run[0])
+        if error:
+            print(f"{Statement:<50}{'':>10}{'':>12}  ❌{error}")
+            continue
+        # Top-level entries (no leading spaces in the raw name) add up to the whole import
+        Top = {name: us for name, us in Modules.items() if not name.startswith(" ")}
+        Slowest = sorted(Top.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(f"{Statement:<50}{wall:>10.3f}{sum(Top.values()) / 1e6:>12.3f}  " + ", ".join(f"{name} {us / 1e6:.2f}" for name, us in Slowest))
@@ -0,0 +1,71 @@
+"""
+- Benchmark of the PDF split engines of `PDF_Split_To`: time and total output size per engine
+- Old path: one PyPDF2 `PdfWriter` per page; new path: PyMuPDF `insert_pdf` + garbage/deflate
+- Every engine must produce the same number of pages with the same text
+
+Usage:
+    python Benchmarks/Bench_PDF_Split.py H:/AI_Data/RMRB/2015/20150102/20150102.pdf [more.pdf ...] --repeat 3
+    python Benchmarks/Bench_PDF_Split.py --synthetic 20      # 20-page PDF sharing one font and one image
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path: sys.path.append(script_dir)
+import fitz
+from RMRBCore.RMRB_PDF_v6 import PDF_Split_To
+
+ENGINES = ["pypdf2", "pymupdf"]
+
+def Synthetic_PDF(Path, Pages):
+    # Every page shares the same font and image, like a daily issue
+    import numpy as np
+    Pixels = (np.random.default_rng(0).random((400, 600, 3)) * 255).astype(np.uint8)
+    Image = fitz.Pixmap(fitz.csRGB, 600, 400, Pixels.tobytes(), False).tobytes("png")
+    with fitz.open() as PDF:
+        for i in range(Pages):
+            page = PDF.new_page()
+            page.insert_text((72, 72), f"Page {i + 1} " * 20, fontname="helv")
+            page.insert_image(fitz.Rect(72, 120, 520, 420), stream=Image)
+        PDF.save(Path, garbage=3, deflate=True)
+
+def Page_Texts(Paths):
+    Texts = []
+    for path in Paths:
+        with fitz.open(path) as PDF: Texts.append("".join(page.get_text() for page in PDF))
+    return Texts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF split engines: time and output size")
+    parser.add_argument("pdfs", nargs="*")
+    parser.add_argument("--synthetic", type=int, default=0, help="Benchmark a synthetic PDF with N pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    Work_Dir = tempfile.mkdtemp(prefix="Bench_PDF_Split_")
+    PDFs = list(args.pdfs)
+    if args.synthetic:
+        PDFs.append(os.path.join(Work_Dir, "Synthetic.pdf"))
+        Synthetic_PDF(PDFs[-1], args.synthetic)
+    if not PDFs: sys.exit("No PDF given (use --synthetic N)")
+    print(f"{'PDF':<28}{'Input (KB)':>12}" + "".join(f"{engine + ' (s)':>16}{engine + ' (KB)':>16}" for engine in ENGINES) + "  Agree")
+    try:
+        for pdf_path in PDFs:
+            Row = f"{os.path.basename(pdf_path):<28}{os.path.getsize(pdf_path) / 1024:>12.1f}"
+            Texts = {}
+            for engine in ENGINES:
+                Times = []
+                for _ in range(args.repeat):
+                    Output_Dir = os.path.join(Work_Dir, engine)
+                    shutil.rmtree(Output_Dir, ignore_errors=True)
+                    os.makedirs(Output_Dir)
+                    begin = time.perf_counter()
+                    Output_Paths = PDF_Split_To(pdf_path, os.path.join(Output_Dir, "Page"), Engine=engine)
+                    Times.append(time.perf_counter() - begin)
+                Size = sum(os.path.getsize(path) for path in Output_Paths)
+                Texts[engine] = Page_Texts(Output_Paths)
+                Row += f"{min(Times):>16.3f}{Size / 1024:>16.1f}"
+            print(Row + f"  {len(set(map(tuple, Texts.values()))) == 1}")
+    finally: shutil.rmtree(Work_Dir, ignore_errors=True)
@@ -71,4 +71,52 @@ EXIT_ERRORS = {
     NO_FOUND_ERROR, RATE_LIMIT_ERROR, CREDITS_RUN_OUT_ERROR, 
     CREDITS_RUN_OUT_ERROR, BALANCE_RUN_OUT_ERROR, 
     MAX_RETRIES_EXCEEDED, TOO_MANY_REQUESTS, UNKNOWN_ERROR, 
-    LOCATION_ERROR, ERROR, TIMEOUT_ERROR}
\ No newline at end of file
+    LOCATION_ERROR, ERROR, TIMEOUT_ERROR}
+
+# Downloader
+RMRB_OFFICIAL_URL = "http://paper.people.com.cn/rmrb/pc/layout/" # Official channel (2023 onwards), node_XX.html pages
+RMRB_JOJO_URL = "https://1314955862-79a3hvoqxc-bj.scf.tencentcs.com/RMRB/" # Whole-day PDFs (before 2023)
+JOJO_KEEP_ORIGINAL = False # Keep the whole-day JOJO PDF at {root}Archive/YYYY/YYYYMMDD.pdf, outside the date folders (archiving)
+DOWNLOAD_MAX_WORKERS = 8 # Worker threads of the concurrent downloader
+HOST_MAX_CONCURRENCY = 4 # Max in-flight requests per host
+HOST_RATE_LIMIT = 2.0 # Requests per second per host (token bucket refill rate)
+HOST_RATE_BURST = 4 # Token bucket capacity per host
+HTTP_POOL_SIZE = 16 # Keep-alive connections kept per host by the shared session
+HTTP_MAX_RETRIES = 3 # Retries of the shared session adapter (connect/read errors and 429/5xx)
+HTTP_BACKOFF_FACTOR = 2 # Exponential backoff between retries: 0s, 4s, 8s, ...
+HTTP_TIMEOUT = (10, 60) # (connect, read) timeout in seconds
+HTTP_CHUNK_SIZE = 1024 * 1024 # Bytes per chunk of streamed downloads
+HTTP_MAX_RESUMES = 3 # Range resumes of one streamed download after a mid-transfer failure
+HTTP_CHECKPOINT_SIZE = 8 * 1024 * 1024 # Bytes between `.part` offset checkpoints
+INDEX_FOLDER = "Index/" # Index/catalog folder under each data root
+ROOTS_INDEX_ROOT = MAIN_PATH # Data root whose index also holds the cross-root copy index (see `RMRB_Roots_v6`)
+
+# PDF validation
+PDF_EXPECTED_PAGES = {4, 8, 12, 16, 20, 24, 28, 32} # Valid page totals of one day
+PDF_SPECIAL_DATES = ["20160128", "20200528", "20150911"] + [str(num) for num in range(20140101, 20140111)] # Known irregular days
+PDF_VALIDATION_WORKERS = 4 # Worker processes of the year-wide validation
+PDF_VALIDATION_MIN_JOBS = 64 # Fewer uncached PDFs than this are counted in-process
+PDF_SPLIT_ENGINE = "pymupdf" # "pymupdf" (falls back to PyPDF2) or "pypdf2"
+PDF_SPLIT_WRITERS = 4 # Threads writing the split pages
+# First-page text cache: "pdfplumber" or "pymupdf" (faster, falls back to pdfplumber). The AD classifier reads "广告" by
+# character position (Text_Range) and `Cipher_AD` was taken from pdfplumber output; PyMuPDF breaks lines differently,
+# so keep "pdfplumber" unless both backends were compared on a sample year
+PAGE_TEXT_BACKEND = "pdfplumber"
+PAGE_TEXT_WORKERS = 4 # Worker processes extracting uncached page text
+PAGE_TEXT_MIN_JOBS = 64 # Fewer uncached PDFs than this are extracted in-process
+
+# AD detection
+AD_RENDER_ZOOM = 3 # Zoom of the rendered AD pages (3x: cleaner text for OCR)
+AD_VECTOR_PREFILTER = False # Rasterize a page without "广告" only if its drawings or images hold an ad-sized box (off until compared with CV on a real year)
+AD_DETECT_ENGINE = "cv" # Ad blocks of the pages without "广告": "cv" (render + OpenCV contours) or "vector" (PDF drawings)
+AD_DETECT_ZOOM = 3 # Zoom of the CV detection raster; below AD_RENDER_ZOOM only the pages with boxes are rendered at AD_RENDER_ZOOM
+AD_CV_NMS_IOU = 0 # > 0: drop CV boxes overlapping a larger box by more than this IoU (0: off)
+AD_CV_ASPECT = None # (min, max) w / h of the CV boxes, e.g. (1.4, 1.5) as `AD_Shape_Filter` (None: off)
+AD_SINGLE_PASS = True # `Genetare_AD_Image_New` also clips the ad blocks from the rendered page (no `Extract_AD_Block` pass)
+AD_IMAGE_WORKERS = 4 # Worker processes of `Genetare_AD_Image_New` (one day per task, 1: serial)
+AD_IMAGE_FORMAT = {"Page": "png", "Marked": "png", "Block": "png"} # FAD/HAD pages, marked CV pages, ad blocks: "png", "webp" (lossless) or "npy" (raw, for intermediates)
+AD_PNG_COMPRESSION = 3 # zlib level of the PNGs (0-9, OpenCV default 3; 9 is ~7x slower for ~15% fewer bytes, see `Benchmarks/Bench_Image_Format.py`)
+AD_IMAGE_SUFFIXES = (".png", ".webp", ".npy") # AD image files recognized by the catalog and the maintenance rules
+
+# Maintenance
+MAINTENANCE_FOLDER = ".Maintenance/" # Journals, dry-run plans and trash of `Run_Maintenance`, under the maintained folder
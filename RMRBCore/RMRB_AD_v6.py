@@ -5,15 +5,15 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 from datetime import datetime, timedelta
 import numpy as np
-import pdfplumber
 import fitz
 from collections import defaultdict
 from collections import Counter
-import matplotlib.pyplot as plt
-from pdf2image import convert_from_path
+from concurrent.futures import ProcessPoolExecutor
 from RMRBCore.RMRB_PDF_v6 import Check_PDF_Exist
-from RMRBCore.RMRB_Image_v6 import CV_Detect_Ads
-from Config.Config import Advertisement_Text, Cipher_AD
+from RMRBCore.RMRB_Image_v6 import CV_Detect_Ads, Page_Has_Vector_Box, Vector_Detect_Ads, Mark_Ads, Clip_Ads, CV_Page_Boxes, AD_Shape_Filter, Save_Image
+from RMRBCore.RMRB_Text_v6 import Page_Texts
+from RMRBCore.RMRB_Catalog_v6 import Catalog_Sync, Catalog_Images, Catalog_Set_Filter
+from Config.Config import LOG_PATH, Advertisement_Text, Cipher_AD, AD_RENDER_ZOOM, AD_VECTOR_PREFILTER, AD_DETECT_ENGINE, AD_DETECT_ZOOM, AD_SINGLE_PASS, AD_IMAGE_WORKERS, AD_IMAGE_SUFFIXES
 from Utils.main import PrintUtils, FileUtils, JsonUtils, TimeUtils, TextUtils
 Create_Date = TimeUtils.Create_Date
 THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
@@ -38,6 +38,7 @@ def Genetare_AD_Image(YEAR, Folder_Path, Poppler_Path="", Begin_date="0101", End
     - Generate image for all ad pages
     - Suppose each PDF contains just one version content
     """
+    from pdf2image import convert_from_path # Deferred: only the old generator rasterizes with poppler
     PDF_CHECK = Check_PDF_Exist(
         YEAR=YEAR, Folder_Path=Folder_Path, 
         Begin_date=Begin_date, End_date=End_date,
@@ -47,6 +48,7 @@ def Genetare_AD_Image(YEAR, Folder_Path, Poppler_Path="", Begin_date="0101", End
         return
     AD_PATH = Folder_Path + f"{YEAR}_AD/" # Advertisement Data Path
     Check_Folder(Folder_Path=AD_PATH, Log_File_Path=Log_File_Path)
+    Texts = Page_Texts(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path=Log_File_Path) # First-page text layer (cached)
     start_date, end_date = Create_Date(YEAR, Begin_date), Create_Date(YEAR, End_date)
     THREAD_SAFE_PRINT("Generate AD Image", f"Begin date: {YEAR + Begin_date}, End date: {YEAR + End_date}", Log_File_Path)
     current_date = start_date
@@ -63,41 +65,174 @@ def Genetare_AD_Image(YEAR, Folder_Path, Poppler_Path="", Begin_date="0101", End
             Version = filename.split(".")[0][-2:]
             File_Path = PDF_DATE_PATH + filename
             if Suffix == "pdf":
-                with pdfplumber.open(File_Path) as PDF:
-                    # PDF = PdfReader(file)
-                    if Poppler_Path: IMAGE = convert_from_path(pdf_path=File_Path, poppler_path=Poppler_Path)
-                    else: IMAGE = convert_from_path(pdf_path=File_Path)
-                    text_original = PDF.pages[0].extract_text().replace(" ", "") # use index 0
-                    text = text_original[:Text_Range+1]
-                    if Advertisement_Text in text: # First filter: plaintext "广告"
-                        Check_Folder(Folder_Path=AD_DATE_PATH, Log_File_Path=Log_File_Path)
-                        # Attension: first_page and last_page starts at 1
-                        IMAGE_PATH = AD_DATE_PATH + f"{PDF_Name_Without_Version}_{Version}_FAD.png"
-                        IMAGE[0].save(IMAGE_PATH, "PNG") # use index 0
-                        THREAD_SAFE_PRINT("Generate AD Image", f"Full Ad: {IMAGE_PATH}", Log_File_Path)
-                    # elif Advertisement in text_original:
-                    #     Remove_File_If_Exists(IMAGE_PATH)
-                    elif Cipher_AD in text_original: # Second filter: ciphertext "广告"
-                        Check_Folder(Folder_Path=AD_DATE_PATH, Log_File_Path=Log_File_Path)
-                        # Attension: first_page and last_page starts at 1
-                        # IMAGE = convert_from_path(PDF_PATH, first_page=page_num+1, last_page=page_num+1)
-                        IMAGE_PATH = AD_DATE_PATH + f"{PDF_Name_Without_Version}_{Version}_HAD.png"
-                        IMAGE[0].save(IMAGE_PATH, "PNG") # use index 0
-                        THREAD_SAFE_PRINT("Generate AD Image", f"Half Ad {IMAGE_PATH}", Log_File_Path)
-                    else:
-                        CV_Detect_Ads(
-                            root_path=AD_DATE_PATH, pdf_name=File_Name_No_Suffix, 
-                            pdf_version=Version, image_element=IMAGE[0])
+                # Only the first page is used: render just that one (poppler used to rasterize the whole PDF)
+                if Poppler_Path: IMAGE = convert_from_path(pdf_path=File_Path, first_page=1, last_page=1, poppler_path=Poppler_Path)
+                else: IMAGE = convert_from_path(pdf_path=File_Path, first_page=1, last_page=1)
+                text_original = Texts.get((f"{YEAR}{MONTH}{DAY}", File_Name_No_Suffix[8:]), "").replace(" ", "") # use index 0
+                text = text_original[:Text_Range+1]
+                if Advertisement_Text in text: # First filter: plaintext "广告"
+                    Check_Folder(Folder_Path=AD_DATE_PATH, Log_File_Path=Log_File_Path)
+                    # Attension: first_page and last_page starts at 1
+                    IMAGE_PATH = AD_DATE_PATH + f"{PDF_Name_Without_Version}_{Version}_FAD.png"
+                    IMAGE[0].save(IMAGE_PATH, "PNG") # use index 0
+                    THREAD_SAFE_PRINT("Generate AD Image", f"Full Ad: {IMAGE_PATH}", Log_File_Path)
+                # elif Advertisement in text_original:
+                #     Remove_File_If_Exists(IMAGE_PATH)
+                elif Cipher_AD in text_original: # Second filter: ciphertext "广告"
+                    Check_Folder(Folder_Path=AD_DATE_PATH, Log_File_Path=Log_File_Path)
+                    # Attension: first_page and last_page starts at 1
+                    # IMAGE = convert_from_path(PDF_PATH, first_page=page_num+1, last_page=page_num+1)
+                    IMAGE_PATH = AD_DATE_PATH + f"{PDF_Name_Without_Version}_{Version}_HAD.png"
+                    IMAGE[0].save(IMAGE_PATH, "PNG") # use index 0
+                    THREAD_SAFE_PRINT("Generate AD Image", f"Half Ad {IMAGE_PATH}", Log_File_Path)
+                else:
+                    CV_Detect_Ads(
+                        root_path=AD_DATE_PATH, pdf_name=File_Name_No_Suffix, 
+                        pdf_version=Version, image_element=IMAGE[0])
         current_date += timedelta(days=1)
+    Catalog_Sync(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path) # Register the new images
 # Genetare_AD_Image("2015")
 # PDF lackage! ['D:/AI_data_analysis/RMRB/2015/20150307.pdf']
 
-def Genetare_AD_Image_New(YEAR, Folder_Path, Begin_date="0101", End_date="1231", Text_Range=34, Log_File_Path=""):
+def Worker_Log_Path(Log_File_Path=""):
+    # Log file of one worker process: "{log} AD-Worker-{pid}.log" next to the main log (no shared lock or file)
+    Base = os.path.splitext(Log_File_Path or LOG_PATH + datetime.now().strftime("%Y-%m-%d %H") + ".log")[0]
+    return f"{Base} AD-Worker-{os.getpid()}.log"
+
+def Remove_Page_Blocks(AD_DATE_PATH, DATE, Version, Log_File_Path=""):
+    """
+    - Delete the ad blocks of one page ({DATE}_{Version}_{Kind}_Block_{k}, any image format) before it is clipped again,
+    so a re-run that finds fewer boxes leaves no stale `_Block_k` behind
+    - The JSON sidecars stay (a block clipped again under the same name keeps its OCR), see `Drop_Stale_Blocks`
+    - Return {"{DATE}_{Version}_{k}": block path without suffix} (the shape dict keys of the removed blocks)
+    """
+    Removed = {}
+    if not os.path.isdir(AD_DATE_PATH): return Removed
+    for name in os.listdir(AD_DATE_PATH):
+        if not (name.startswith(f"{DATE}_{Version}_") and name.endswith(AD_IMAGE_SUFFIXES)): continue
+        name_split_list = name.rsplit(".", 1)[0].split("_")
+        if len(name_split_list) != 5 or name_split_list[3] != "Block": continue
+        os.remove(AD_DATE_PATH + name)
+        Removed[f"{DATE}_{Version}_{name_split_list[4]}"] = AD_DATE_PATH + name.rsplit(".", 1)[0]
+    if Removed: THREAD_SAFE_PRINT("Remove Page Blocks", f"{DATE}_{Version}: {len(Removed)} old blocks removed", Log_File_Path)
+    return Removed
+
+def Drop_Stale_Blocks(SHAPE_DICT, New_Shape_Dict, Pages, Removed, Log_File_Path=""):
+    """
+    - Year shape dict without the old blocks of the pages clipped again (Pages: ["{DATE}_{Version}", ...]), merged with the new ones
+    - Sidecars of removed blocks that were not clipped again are deleted (their image is gone)
+    """
+    Pages = set(Pages)
+    SHAPE_DICT = {Key: Shape for Key, Shape in SHAPE_DICT.items() if Key.rsplit("_", 1)[0] not in Pages}
+    for Key, Path_No_Suffix in Removed.items():
+        if Key not in New_Shape_Dict and os.path.isfile(Path_No_Suffix + ".json"):
+            os.remove(Path_No_Suffix + ".json")
+            THREAD_SAFE_PRINT("Drop Stale Blocks", f"Removed orphan sidecar {Path_No_Suffix}.json", Log_File_Path)
+    return {**SHAPE_DICT, **New_Shape_Dict}
+
+def Pixmap_Array(pix):
+    # RGB numpy view of a PyMuPDF pixmap
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+
+def Generate_AD_Day(YEAR, DATE, Folder_Path, Texts, Text_Range=34, Detect_Engine=AD_DETECT_ENGINE, Extract_Blocks=False, Detect_Zoom=AD_DETECT_ZOOM, Worker=False, Log_File_Path=""):
+    """
+    - AD images of one day (`Genetare_AD_Image_New` calls it per date, serially or in a process pool)
+    - Texts: {Version: first-page text} of the day
+    - Extract_Blocks: also clip the HAD/CV ad blocks from the same in-memory raster (what `Extract_AD_Block`
+    does later from the saved PNGs), so each page is rendered once and never decoded back
+    - Detect_Zoom below AD_RENDER_ZOOM: CV boxes are found on a Detect_Zoom raster and mapped back to page coordinates;
+    only pages with boxes are rendered at AD_RENDER_ZOOM, so every saved image and block keeps the full resolution
+    - Worker: log to `Worker_Log_Path` instead of Log_File_Path
+    - Images are named {DATE}_{Version}_{Kind}.{format} (`AD_IMAGE_FORMAT`) whatever the PDF name, and PDFs are visited in name order
+    - Extract_Blocks: the old blocks of every visited page are removed first (`Remove_Page_Blocks`)
+    - Return {"Rendered": n, "Skipped": n, "Vector_Boxes": {"YYYYMMDD_Version": [[x0, y0, x1, y1], ...]}, "Shape_Dict": {...},
+    "Pages": ["YYYYMMDD_Version", ...] (pages clipped again), "Removed_Blocks": {...}, "Log": path}
+    """
+    if Worker: Log_File_Path = Worker_Log_Path(Log_File_Path)
+    Tiered = Detect_Zoom != AD_RENDER_ZOOM
+    Summary = {"Rendered": 0, "Skipped": 0, "Vector_Boxes": {}, "Shape_Dict": {}, "Pages": [], "Removed_Blocks": {}, "Log": Log_File_Path}
+    PDF_DATE_PATH = Folder_Path + f"{YEAR}/{DATE}/"
+    AD_DATE_PATH = Folder_Path + f"{YEAR}_AD/{DATE}/"
+    THREAD_SAFE_PRINT("Generate AD Image", f"AD PATH: {PDF_DATE_PATH}", Log_File_Path)
+    for filename in sorted(os.listdir(PDF_DATE_PATH)):
+        File_Name_No_Suffix = filename.split(".")[0] # without suffix
+        Suffix = filename.split(".")[1]
+        Version = filename.split(".")[0][-2:]
+        File_Path = PDF_DATE_PATH + filename
+        if Suffix != "pdf": continue
+        text_original = Texts.get(File_Name_No_Suffix[8:], "").replace(" ", "") # use index 0
+        text = text_original[:Text_Range+1]
+        # Staged: text layer -> vector boxes -> rasterize only the candidate page
+        if Advertisement_Text in text: Kind = "FAD" # First filter: plaintext "广告"
+        elif Cipher_AD in text_original: Kind = "HAD" # Second filter: ciphertext "广告"
+        else: Kind = "CV"
+        if Extract_Blocks:
+            Summary["Pages"].append(f"{DATE}_{Version}")
+            Summary["Removed_Blocks"].update(Remove_Page_Blocks(AD_DATE_PATH, DATE, Version, Log_File_Path))
+        with fitz.open(File_Path) as pymupdf:
+            page = pymupdf.load_page(0)
+            if Kind == "CV" and Detect_Engine == "vector":
+                Boxes = Vector_Detect_Ads(page) # Milliseconds, the page is rendered only if it has ads
+                if Boxes: Summary["Vector_Boxes"][f"{DATE}_{Version}"] = [list(box) for box in Boxes]
+                Candidate = bool(Boxes)
+            elif Kind == "CV": Candidate = not AD_VECTOR_PREFILTER or Page_Has_Vector_Box(page)
+            else: Candidate = True
+            if not Candidate:
+                Summary["Skipped"] += 1
+                continue
+            Summary["Rendered"] += 1
+            if Kind in ("FAD", "HAD"):
+                # matrix = fitz.Matrix(3, 3) makes it 3x higher resolution (cleaner text)
+                pix = page.get_pixmap(matrix=fitz.Matrix(AD_RENDER_ZOOM, AD_RENDER_ZOOM))
+                Check_Folder(Folder_Path=AD_DATE_PATH, Log_File_Path=Log_File_Path)
+                IMAGE_PATH = Save_Image(Pixmap_Array(pix), AD_DATE_PATH + f"{DATE}_{Version}_{Kind}", "Page", RGB=True)
+                THREAD_SAFE_PRINT("Generate AD Image", f"Full Ad: {IMAGE_PATH}" if Kind == "FAD" else f"Half Ad {IMAGE_PATH}", Log_File_Path)
+                if Kind == "FAD" or not Extract_Blocks: continue
+                if Tiered:
+                    # Boxes from the small raster, blocks cut from the full one
+                    Boxes = CV_Page_Boxes(Pixmap_Array(page.get_pixmap(matrix=fitz.Matrix(Detect_Zoom, Detect_Zoom))), Detect_Zoom)
+                    Summary["Shape_Dict"].update(Clip_Ads(
+                        Pixmap_Array(pix), Boxes, AD_RENDER_ZOOM, root_path=AD_DATE_PATH, image_type="HAD",
+                        pdf_name=DATE, pdf_version=Version, Log_File_Path=Log_File_Path))
+                else: Summary["Shape_Dict"].update(CV_Detect_Ads(
+                    root_path=AD_DATE_PATH, image_type="HAD", pdf_name=DATE,
+                    pdf_version=Version, image_element=Pixmap_Array(pix),
+                    Image_Clip_Bool=True, Whole_Image_Bool=False, AD_SHAPE_ANALYSIS=True, Log_File_Path=Log_File_Path))
+            elif Tiered or Detect_Engine == "vector":
+                # Boxes in page coordinates (vector, or CV on the detection raster); only a page with boxes is rendered
+                # at AD_RENDER_ZOOM, so the marked page (input of `Extract_AD_Block`) and the blocks keep the full resolution
+                if Detect_Engine != "vector": Boxes = CV_Page_Boxes(Pixmap_Array(page.get_pixmap(matrix=fitz.Matrix(Detect_Zoom, Detect_Zoom))), Detect_Zoom)
+                if not Boxes: continue
+                IMAGE_ARRAY = Pixmap_Array(page.get_pixmap(matrix=fitz.Matrix(AD_RENDER_ZOOM, AD_RENDER_ZOOM)))
+                Check_Folder(Folder_Path=AD_DATE_PATH, Log_File_Path=Log_File_Path)
+                Mark_Ads(IMAGE_ARRAY, Boxes, AD_RENDER_ZOOM, AD_DATE_PATH + f"{DATE}_{Version}_CV", Log_File_Path)
+                if Extract_Blocks: Summary["Shape_Dict"].update(Clip_Ads(
+                    IMAGE_ARRAY, Boxes, AD_RENDER_ZOOM, root_path=AD_DATE_PATH, pdf_name=DATE, pdf_version=Version, Log_File_Path=Log_File_Path))
+            else:
+                # One pass over the raster: whole marked image and, with Extract_Blocks, the clipped blocks
+                pix = page.get_pixmap(matrix=fitz.Matrix(AD_RENDER_ZOOM, AD_RENDER_ZOOM))
+                Shape_Dict = CV_Detect_Ads(
+                    root_path=AD_DATE_PATH, pdf_name=DATE, 
+                    pdf_version=Version, image_element=Pixmap_Array(pix),
+                    Image_Clip_Bool=Extract_Blocks, AD_SHAPE_ANALYSIS=Extract_Blocks, Log_File_Path=Log_File_Path)
+                if Shape_Dict: Summary["Shape_Dict"].update(Shape_Dict)
+    return Summary
+
+def Genetare_AD_Image_New(YEAR, Folder_Path, Begin_date="0101", End_date="1231", Text_Range=34, Detect_Engine=AD_DETECT_ENGINE, Extract_Blocks=AD_SINGLE_PASS, Detect_Zoom=AD_DETECT_ZOOM, Max_Workers=AD_IMAGE_WORKERS, Log_File_Path=""):
     """
     - Core function of AD image generation (New)
     - Use fitz (PyMuPDF)
     - Generate image for all ad pages
+    - Staged: pages with "广告" in the text layer are rendered directly, the others only if
+    `Page_Has_Vector_Box` finds an ad-sized box (`AD_VECTOR_PREFILTER`), then go through `CV_Detect_Ads`
+    - Detect_Engine: "cv" (render + `CV_Detect_Ads`) or "vector" (`Vector_Detect_Ads` on the drawings, the page is
+    rendered only to save the marked CV image); vector boxes go to {YEAR}_AD/{YEAR}_Vector_Boxes.json in page coordinates
+    - Extract_Blocks: clip the ad blocks in the same pass (see `Generate_AD_Day`) and update {YEAR}_Shape_Dict.json,
+    so `Extract_AD_Block` is not needed for these dates
+    - Detect_Zoom: zoom of the CV detection raster (`AD_DETECT_ZOOM`, e.g. 1 for a 9x smaller image than 3x)
+    - Max_Workers > 1: the days are shared by a process pool, each worker logging to its own file (`Worker_Log_Path`)
     - Suppose each PDF contains just one version content
+    - Return the dates that failed in the pool ([] if all succeeded)
     """
     PDF_CHECK = Check_PDF_Exist(
         YEAR=YEAR, Folder_Path=Folder_Path, 
@@ -108,53 +243,46 @@ def Genetare_AD_Image_New(YEAR, Folder_Path, Begin_date="0101", End_date="1231",
         return
     AD_PATH = Folder_Path + f"{YEAR}_AD/" # Advertisement Data Path
     Check_Folder(Folder_Path=AD_PATH, Log_File_Path=Log_File_Path)
+    Texts = Page_Texts(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path=Log_File_Path) # First-page text layer (cached)
     start_date, end_date = Create_Date(YEAR, Begin_date), Create_Date(YEAR, End_date)
     THREAD_SAFE_PRINT("Generate AD Image", f"Begin date: {YEAR + Begin_date}, End date: {YEAR + End_date}", Log_File_Path)
-    current_date = start_date
-    while current_date <= end_date:
-        MONTH = Format_Num(str(current_date.month))
-        DAY = Format_Num(str(current_date.day))
-        PDF_DATE_PATH = Folder_Path + f"{YEAR}/{YEAR}{MONTH}{DAY}/"
-        AD_DATE_PATH = AD_PATH + f"{YEAR}{MONTH}{DAY}/"
-        THREAD_SAFE_PRINT("Generate AD Image", f"AD PATH: {PDF_DATE_PATH}", Log_File_Path)
-        for filename in os.listdir(PDF_DATE_PATH):
-            File_Name_No_Suffix = filename.split(".")[0] # without suffix
-            Suffix = filename.split(".")[1]
-            Version = filename.split(".")[0][-2:]
-            File_Path = PDF_DATE_PATH + filename
-            if Suffix == "pdf":
-                with pdfplumber.open(File_Path) as PDF:
-                    # PDF = PdfReader(file)
-                    text_original = PDF.pages[0].extract_text().replace(" ", "") # use index 0
-                    text = text_original[:Text_Range+1]
-                    # Open the PDF (pymupdf)
-                    pymupdf = fitz.open(File_Path)
-                    # Loop through pages (here we just take the first page: index 0)
-                    page = pymupdf.load_page(0)
-                    # Render the page to an image (Pixmap)
-                    # matrix = fitz.Matrix(3, 3) makes it 3x higher resolution (cleaner text)
-                    pix = page.get_pixmap(matrix=fitz.Matrix(3, 3))
-                    if Advertisement_Text in text: # First filter: plaintext "广告"
-                        Check_Folder(Folder_Path=AD_DATE_PATH, Log_File_Path=Log_File_Path)
-                        # Attension: first_page and last_page starts at 1
-                        IMAGE_PATH = AD_DATE_PATH + f"{File_Name_No_Suffix}_{Version}_FAD.png"
-                        pix.save(IMAGE_PATH)
-                        THREAD_SAFE_PRINT("Generate AD Image", f"Full Ad: {IMAGE_PATH}", Log_File_Path)
-                    # elif Advertisement in text_original:
-                    #     Remove_File_If_Exists(IMAGE_PATH)
-                    elif Cipher_AD in text_original: # Second filter: ciphertext "广告"
-                        Check_Folder(Folder_Path=AD_DATE_PATH, Log_File_Path=Log_File_Path)
-                        # Attension: first_page and last_page starts at 1
-                        # IMAGE = convert_from_path(PDF_PATH, first_page=page_num+1, last_page=page_num+1)
-                        IMAGE_PATH = AD_DATE_PATH + f"{File_Name_No_Suffix}_{Version}_HAD.png"
-                        pix.save(IMAGE_PATH)
-                        THREAD_SAFE_PRINT("Generate AD Image", f"Half Ad {IMAGE_PATH}", Log_File_Path)
-                    else:
-                        IMAGE_ARRAY = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
-                        CV_Detect_Ads(
-                            root_path=AD_DATE_PATH, pdf_name=File_Name_No_Suffix, 
-                            pdf_version=Version, image_element=IMAGE_ARRAY)
-        current_date += timedelta(days=1)
+    DATES = [(start_date + timedelta(days=n)).strftime("%Y%m%d") for n in range((end_date - start_date).days + 1)]
+    Day_Texts = defaultdict(dict) # {DATE: {Version: Text}}
+    for (DATE, Version), Text in Texts.items(): Day_Texts[DATE][Version] = Text
+    if Max_Workers > 1 and len(DATES) > 1:
+        THREAD_SAFE_PRINT("Generate AD Image", f"{len(DATES)} days in {Max_Workers} processes", Log_File_Path)
+        with ProcessPoolExecutor(max_workers=min(Max_Workers, len(DATES))) as executor:
+            Futures = [
+                executor.submit(Generate_AD_Day, YEAR, DATE, Folder_Path, Day_Texts[DATE], Text_Range, Detect_Engine, Extract_Blocks, Detect_Zoom, True, Log_File_Path)
+                for DATE in DATES]
+            Results, Failed = [], []
+            for DATE, future in zip(DATES, Futures):
+                if future.exception():
+                    THREAD_SAFE_PRINT("Generate AD Image", f"❌{DATE} failed: {future.exception()}", Log_File_Path)
+                    Failed.append(DATE)
+                    continue
+                Results.append(future.result())
+        for Worker_Log in sorted({Result["Log"] for Result in Results}): THREAD_SAFE_PRINT("Generate AD Image", f"Worker log: {Worker_Log}", Log_File_Path)
+    else: Results, Failed = [Generate_AD_Day(YEAR, DATE, Folder_Path, Day_Texts[DATE], Text_Range, Detect_Engine, Extract_Blocks, Detect_Zoom, Log_File_Path=Log_File_Path) for DATE in DATES], []
+    Rendered = sum(Result["Rendered"] for Result in Results)
+    Skipped = sum(Result["Skipped"] for Result in Results)
+    Vector_Boxes = {Key: Boxes for Result in Results for Key, Boxes in Result["Vector_Boxes"].items()}
+    THREAD_SAFE_PRINT("Generate AD Image", f"Rendered: {Rendered}, skipped without rendering: {Skipped}", Log_File_Path)
+    if Vector_Boxes:
+        Boxes_Path = f"{AD_PATH}{YEAR}_Vector_Boxes.json"
+        if os.path.exists(Boxes_Path): Vector_Boxes = {**JsonFile_to_Dict(Boxes_Path, Log_File_Path=Log_File_Path), **Vector_Boxes}
+        Dict_to_JsonFile(Vector_Boxes, Boxes_Path)
+    if Extract_Blocks:
+        # Same file as `Extract_AD_Block`, merged so that a date range does not drop the other dates
+        SHAPE_DICT = {Key: Shape for Result in Results for Key, Shape in Result["Shape_Dict"].items()}
+        Pages = [Page for Result in Results for Page in Result["Pages"]]
+        Removed = {Key: Path for Result in Results for Key, Path in Result["Removed_Blocks"].items()}
+        Shape_Path = f"{AD_PATH}{YEAR}_Shape_Dict.json"
+        Old_Shape_Dict = JsonFile_to_Dict(Shape_Path, Log_File_Path=Log_File_Path) if os.path.exists(Shape_Path) else {}
+        Dict_to_JsonFile(Drop_Stale_Blocks(Old_Shape_Dict, SHAPE_DICT, Pages, Removed, Log_File_Path), Shape_Path)
+    Catalog_Sync(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path) # Register the new images (and blocks)
+    if Failed: THREAD_SAFE_PRINT("Generate AD Image", f"❌{len(Failed)} days failed: {Failed}", Log_File_Path)
+    return Failed
 
 def Extract_AD_Block(
     YEAR, Folder_Path, Begin_date="0101", 
@@ -172,50 +300,40 @@ def Extract_AD_Block(
     - 2. For "HAD": Use `CV_Detect_Ads` to detect ad area
     """
     if Ad_Shape_Analysis: SHAPE_DICT = {}
+    Pages, Removed = [], {} # Pages clipped again and their old blocks (see `Remove_Page_Blocks`)
     AD_PATH = Folder_Path + f"{YEAR}_AD/"
-    start_date, end_date = Create_Date(YEAR, Begin_date), Create_Date(YEAR, End_date)
     THREAD_SAFE_PRINT("Extract AD Block", f"Begin date: {YEAR + Begin_date}, End date: {YEAR + End_date}", Log_File_Path)
-    current_date = start_date
-    while current_date <= end_date:
-        MONTH = Format_Num(str(current_date.month))
-        DAY = Format_Num(str(current_date.day))
-        AD_Folder_PATH = AD_PATH + f"{YEAR}{MONTH}{DAY}/"
-        if os.path.exists(AD_Folder_PATH): # Note that the path may not exist
+    # Original "CV"/"HAD" images from the catalog ("FAD" ads don't need to extract)
+    Catalog_Sync(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path)
+    AD_Folder_PATH = ""
+    for Image in Catalog_Images(YEAR, Folder_Path, Begin_date, End_date, Kinds=["CV", "HAD"], Log_File_Path=Log_File_Path):
+        if not AD_Folder_PATH.endswith(f"{Image['Date']}/"):
+            AD_Folder_PATH = AD_PATH + f"{Image['Date']}/"
             THREAD_SAFE_PRINT("Extract AD Block", f"AD PATH: {AD_Folder_PATH}", Log_File_Path)
-            for filename in os.listdir(AD_Folder_PATH):
-                file_path = os.path.join(AD_Folder_PATH, filename)
-                name = filename.split(".")[0]
-                suffix = filename.split(".")[1]
-                # Check if it is a file (not a directory)
-                if os.path.isfile(file_path):  # Ensure it is a file
-                    if suffix == "png": # Ensure it is an image
-                        # Ensure the image is original (Avoid repeated extraction)
-                        name_split_list = name.split("_")
-                        if len(name_split_list) == 3:
-                            if name_split_list[2] in {"CV", "HAD"}:  # "FAD" ads don't need to extract
-                                # Attention that the file names include suffix like '20220104_13_HAD.png'
-                                PDF_NAME = name_split_list[0]
-                                IMAGE_PATH = os.path.join(AD_Folder_PATH, filename)
-                                VERSION = name_split_list[1]
-                                TYPE = name_split_list[2]
-                                # For result correction, we use original thershold [0.4, 0.6]
-                                Shape_Dict = CV_Detect_Ads(
-                                    root_path=AD_Folder_PATH,
-                                    image_type=TYPE,
-                                    pdf_name=PDF_NAME,
-                                    pdf_version=VERSION,
-                                    image_path=IMAGE_PATH,
-                                    Image_Path_Bool=True,
-                                    Image_Clip_Bool=True,
-                                    Whole_Image_Bool=False,
-                                    AD_SHAPE_ANALYSIS=Ad_Shape_Analysis,
-                                    Log_File_Path=Log_File_Path
-                                )
-                                if Ad_Shape_Analysis: SHAPE_DICT.update(Shape_Dict)
-        current_date += timedelta(days=1)
-    if Ad_Shape_Analysis and SHAPE_DICT: 
-        # Saving to a pickle file
-        Dict_to_JsonFile(SHAPE_DICT, f"{AD_PATH}{YEAR}_Shape_Dict.json")
+        # Attention that the file names include suffix like '20220104_13_HAD.png'
+        name_split_list = Image["Name"].split(".")[0].split("_")
+        Pages.append(f"{name_split_list[0]}_{Image['Version']}")
+        Removed.update(Remove_Page_Blocks(AD_Folder_PATH, name_split_list[0], Image["Version"], Log_File_Path))
+        # For result correction, we use original thershold [0.4, 0.6]
+        Shape_Dict = CV_Detect_Ads(
+            root_path=AD_Folder_PATH,
+            image_type=Image["Kind"],
+            pdf_name=name_split_list[0],
+            pdf_version=Image["Version"],
+            image_path=Image["Path"],
+            Image_Path_Bool=True,
+            Image_Clip_Bool=True,
+            Whole_Image_Bool=False,
+            AD_SHAPE_ANALYSIS=Ad_Shape_Analysis,
+            Log_File_Path=Log_File_Path
+        )
+        if Ad_Shape_Analysis and Shape_Dict: SHAPE_DICT.update(Shape_Dict)
+    Catalog_Sync(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path) # Register the new blocks
+    if Ad_Shape_Analysis and (SHAPE_DICT or Pages): 
+        # Merged into the year file so that a date range does not drop the other dates
+        Shape_Path = f"{AD_PATH}{YEAR}_Shape_Dict.json"
+        Old_Shape_Dict = JsonFile_to_Dict(Shape_Path, Log_File_Path=Log_File_Path) if os.path.exists(Shape_Path) else {}
+        Dict_to_JsonFile(Drop_Stale_Blocks(Old_Shape_Dict, SHAPE_DICT, Pages, Removed, Log_File_Path), Shape_Path)
         return SHAPE_DICT
     else: return None
 # Shape_list = Extract_Ad_Block("2022", Ad_Shape_Analysis=True)
@@ -226,12 +344,14 @@ def Analysis_AD_Position(YEAR, Folder_Path, Begin_date="0101", End_date="1231",
     - Analysis ad Advertisement test position
     - Suppose each PDF contains just one version content
     """
+    import matplotlib.pyplot as plt # Deferred: only needed for the histogram
     PDF_PATH = Folder_Path + f"{YEAR}/"
     Check_Folder(PDF_PATH)
     Position_Dict = {}
     start_date = datetime(int(YEAR), int(Begin_date[:2]), int(Begin_date[2:]))
     end_date = datetime(int(YEAR), int(End_date[:2]), int(End_date[2:]))
     THREAD_SAFE_PRINT("Analysis of AD Position", f"Begin date: {YEAR + Begin_date}, End date: {YEAR + End_date}", Log_File_Path)
+    Texts = Page_Texts(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path=Log_File_Path) # First-page text layer (cached)
     current_date = start_date
     while current_date <= end_date:
         DATE = current_date.strftime("%Y%m%d")
@@ -244,13 +364,11 @@ def Analysis_AD_Position(YEAR, Folder_Path, Begin_date="0101", End_date="1231",
         for filename in os.listdir(PDF_Folder_PATH):
             PDF_PATH = PDF_Folder_PATH + filename
             Version = filename.split(".")[0][-2:]
-            with pdfplumber.open(PDF_PATH) as PDF:
-                # PDF = PdfReader(file)
-                text = PDF.pages[0].extract_text().replace(" ", "")
-                if Advertisement_Text in text:
-                    Position = text.find(Advertisement_Text)
-                    DICT = {Version: Position}
-                    version_list.append(DICT)
+            text = Texts.get((DATE, filename.split(".")[0][8:]), "").replace(" ", "")
+            if Advertisement_Text in text:
+                Position = text.find(Advertisement_Text)
+                DICT = {Version: Position}
+                version_list.append(DICT)
         temp_dict[DATE] = version_list
         THREAD_SAFE_PRINT("Analysis of AD Position", temp_dict, Log_File_Path)
         Position_Dict[DATE] = version_list
@@ -282,11 +400,6 @@ def AD_Shape_Analysis(YEAR, Folder_Path, IS_CMD=False, Log_File_Path=""):
     """
     - Used after `Extract_AD_Block` with "Ad_Shape_Analysis" is True
     """
-    def Filter(W, H, W_Divide_H):
-        #  Output is True means the picture is correct
-        if int(W):
-            if int(H):
-                if 1.4 <= float(W_Divide_H) <= 1.5: return True
     AD_PATH = Folder_Path + f"{YEAR}_AD/"
     Shape_Dict = JsonFile_to_Dict(f"{AD_PATH}{YEAR}_Shape_Dict.json", Log_File_Path=Log_File_Path)
     Filter_Num = 0
@@ -302,7 +415,7 @@ def AD_Shape_Analysis(YEAR, Folder_Path, IS_CMD=False, Log_File_Path=""):
         w = Shape_Dict[pdf_name_version]["w"]
         h = Shape_Dict[pdf_name_version]["h"]
         w_divide_h = Shape_Dict[pdf_name_version]["w_divide_h"]
-        if Filter(w, h, w_divide_h):
+        if AD_Shape_Filter(w, h, w_divide_h):
             # THREAD_SAFE_PRINT("AD Shape Analysis", f"{link_full}, {w}, {h}, {w_divide_h}", Log_File_Path)
             Filter_list_With_Shape.append([link_full, w, h, w_divide_h])
             Filter_list.append(link)
@@ -356,17 +469,9 @@ def Check_Duplicated_Images(YEAR, Folder_Path, Filter_List_Bool=True, IS_CMD=Fal
             THREAD_SAFE_PRINT("Check Duplicated Images", f"{Filter_Path} does not exist!")
             return
     else: 
-        for foldername, _, filenames in os.walk(AD_PATH):
-            for filename in filenames:
-                file_path = os.path.join(foldername, filename)
-                name = filename.split(".")[0]
-                suffix = filename.split(".")[1]
-                # Check if it is a file (not a directory)
-                if os.path.isfile(file_path): # Ensure it is a file
-                    if suffix == "png": # Ensure it is an image
-                        name_split_list = name.split("_")
-                        if "Block" in name_split_list: # Ensure the image is an ad block
-                            Filter_List.append(filename)
+        # All ad blocks of the year, from the catalog
+        Catalog_Sync(YEAR, Folder_Path, Log_File_Path=Log_File_Path)
+        Filter_List = [Image["Name"] for Image in Catalog_Images(YEAR, Folder_Path, Kinds=["Block"], Log_File_Path=Log_File_Path)]
 
     # Group images by date and version
     date_version_groups = defaultdict(list)
@@ -400,5 +505,6 @@ def Check_Duplicated_Images(YEAR, Folder_Path, Filter_List_Bool=True, IS_CMD=Fal
     Output_Dict["Final_Filter"] = Final_Filter
     Output_Dict["Final_Outlier"] = Final_Outlier
     Dict_to_JsonFile(Output_Dict, f"{AD_PATH}{YEAR}_Shape_Dict_Final_Filter_Outlier.json")
+    Catalog_Set_Filter(YEAR, Folder_Path, Final_Filter, Log_File_Path)
     THREAD_SAFE_PRINT("Check Duplicated Images", f"✅{AD_PATH}{YEAR}_Shape_Dict_Final_Filter_Outlier.json Stored", Log_File_Path)
     return Final_Filter, Final_Outlier
\ No newline at end of file
@@ -0,0 +1,197 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import json
+from datetime import datetime, timedelta
+from RMRBCore.RMRB_Index_v6 import INDEX_LOCK, Index_Connect, Index_Path
+from Config.Config import AD_IMAGE_SUFFIXES
+from Utils.main import PrintUtils, TimeUtils
+THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
+Create_Date = TimeUtils.Create_Date
+
+# Catalog of the AD artifacts of a data root, in the index database (see `RMRB_Index_v6`)
+# PDFs are already indexed there (Downloads / Page_Counts); the catalog adds every image of {YEAR}_AD/{DATE}/,
+# its JSON sidecar status (OCR per model, number of summaries) and whether it is an OCR/summary target
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Images (
+    Path TEXT PRIMARY KEY,      -- {Folder_Path}{YEAR}_AD/{DATE}/{Name}
+    Name TEXT NOT NULL,         -- 20220104_13_HAD_Block_1.png
+    Year TEXT NOT NULL,
+    Date TEXT NOT NULL,         -- YYYYMMDD
+    Version TEXT NOT NULL,
+    Kind TEXT NOT NULL,         -- FAD / HAD / CV / Block
+    Size INTEGER NOT NULL,
+    Mtime_NS INTEGER NOT NULL,
+    Selected INTEGER NOT NULL,  -- 1: FAD, or a block in {YEAR}_Shape_Dict_Final_Filter_Outlier.json
+    Sidecar_Mtime_NS INTEGER NOT NULL DEFAULT 0, -- {Name}.json as parsed (0: no sidecar)
+    Summary_Num INTEGER NOT NULL DEFAULT 0,
+    Updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS Images_Year_Date ON Images (Year, Date);
+CREATE TABLE IF NOT EXISTS OCR_Results (
+    Path TEXT NOT NULL,         -- image path
+    OCR_Model TEXT NOT NULL,
+    Length INTEGER NOT NULL,
+    PRIMARY KEY (Path, OCR_Model)
+);
+CREATE TABLE IF NOT EXISTS Catalog_Years (
+    Year TEXT PRIMARY KEY,
+    Synced TEXT NOT NULL
+);
+"""
+CATALOG_READY = set()
+
+def Catalog_Connect(Folder_Path, Log_File_Path=""):
+    """
+    - Index connection of the data root with the catalog tables created
+    """
+    with INDEX_LOCK:
+        connection = Index_Connect(Folder_Path, Log_File_Path)
+        if Index_Path(Folder_Path) not in CATALOG_READY:
+            connection.executescript(CATALOG_SCHEMA)
+            CATALOG_READY.add(Index_Path(Folder_Path))
+        return connection
+
+def Parse_Image_Name(Name):
+    """
+    - "20220104_13_HAD.png" -> ("20220104", "13", "HAD"), "20220104_13_HAD_Block_1.png" -> (..., "Block")
+    - Return None for names that are not AD images
+    """
+    name_split_list = Name.rsplit(".", 1)[0].split("_")
+    if len(name_split_list) < 3: return None
+    Kind = "Block" if "Block" in name_split_list else name_split_list[2]
+    return name_split_list[0], name_split_list[1], Kind
+
+def Filter_Set(YEAR, Folder_Path, Log_File_Path=""):
+    # Final filter list of `Check_Duplicated_Images` (empty if it does not exist yet)
+    Filter_Path = f"{Folder_Path}{YEAR}_AD/{YEAR}_Shape_Dict_Final_Filter_Outlier.json"
+    if not os.path.isfile(Filter_Path): return set()
+    try:
+        with open(Filter_Path, "r", encoding="utf-8") as file: return set(json.load(file).get("Final_Filter", []))
+    except (OSError, ValueError) as e:
+        THREAD_SAFE_PRINT("Catalog", f"❌Invalid {Filter_Path} ({e})", Log_File_Path)
+        return set()
+
+def Parse_Sidecar(Sidecar_Path):
+    """
+    - Return ({OCR_Model: Length}, Summary_Num) of a JSON sidecar (OCR_* keys with content, "Summary~..." keys)
+    """
+    try:
+        with open(Sidecar_Path, "r", encoding="utf-8") as file: Text_Dict = json.load(file)
+    except (OSError, ValueError): return {}, 0
+    OCR = {key[4:]: len(value) for key, value in Text_Dict.items() if key.startswith("OCR_") and not key.endswith("_Len") and value}
+    Summary_Num = sum("Summary" in key.split("~") for key in Text_Dict)
+    return OCR, Summary_Num
+
+def Record_Sidecar(connection, Image_Path, Sidecar_Mtime_NS):
+    # Caller holds INDEX_LOCK
+    OCR, Summary_Num = Parse_Sidecar(Image_Path.rsplit(".", 1)[0] + ".json") if Sidecar_Mtime_NS else ({}, 0)
+    connection.execute("DELETE FROM OCR_Results WHERE Path = ?", (Image_Path,))
+    connection.executemany("INSERT INTO OCR_Results VALUES (?, ?, ?)", [(Image_Path, Model, Length) for Model, Length in OCR.items()])
+    connection.execute("UPDATE Images SET Sidecar_Mtime_NS = ?, Summary_Num = ? WHERE Path = ?", (Sidecar_Mtime_NS, Summary_Num, Image_Path))
+
+def Catalog_Sync(YEAR, Folder_Path, Begin_date="0101", End_date="1231", Log_File_Path=""):
+    """
+    - Bring the catalog of {YEAR}_AD/ up to date for the date range with one `os.scandir` per date folder
+    - Images are re-stat'ed from the listing; JSON sidecars are parsed only when their mtime changed
+    - Images that disappeared are dropped; Selected follows the current final filter list
+    - Stages call it before reading the catalog, so changes made on disk outside the stages
+    (maintenance renames/deletions, images copied in from another root, manual deletions) are picked up
+    - Return {"Images": n, "Updated": n, "Sidecars": n, "Removed": n}
+    """
+    AD_PATH = Folder_Path + f"{YEAR}_AD/"
+    Filter = Filter_Set(YEAR, Folder_Path, Log_File_Path)
+    start_date, end_date = Create_Date(YEAR, Begin_date), Create_Date(YEAR, End_date)
+    Now = datetime.now().isoformat(timespec="seconds")
+    Summary = {"Images": 0, "Updated": 0, "Sidecars": 0, "Removed": 0}
+    with INDEX_LOCK:
+        connection = Catalog_Connect(Folder_Path, Log_File_Path)
+        Rows = {row["Path"]: row for row in connection.execute(
+            "SELECT Path, Size, Mtime_NS, Selected, Sidecar_Mtime_NS FROM Images WHERE Year = ? AND Date BETWEEN ? AND ?",
+            (YEAR, start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")))}
+        Seen = set()
+        current_date = start_date
+        while current_date <= end_date:
+            DATE = current_date.strftime("%Y%m%d")
+            AD_Folder_PATH = AD_PATH + f"{DATE}/"
+            current_date += timedelta(days=1)
+            if not os.path.isdir(AD_Folder_PATH): continue
+            with os.scandir(AD_Folder_PATH) as entries: entries = [entry for entry in entries if entry.is_file()]
+            Sidecars = {entry.name.rsplit(".", 1)[0]: entry.stat().st_mtime_ns for entry in entries if entry.name.endswith(".json")}
+            for entry in entries:
+                Parsed = Parse_Image_Name(entry.name) if entry.name.endswith(AD_IMAGE_SUFFIXES) else None
+                if not Parsed: continue
+                Image_Path = AD_Folder_PATH + entry.name
+                Seen.add(Image_Path)
+                stat = entry.stat()
+                Selected = int(Parsed[2] == "FAD" or (Parsed[2] == "Block" and entry.name in Filter))
+                row = Rows.get(Image_Path)
+                if not row or (row["Size"], row["Mtime_NS"], row["Selected"]) != (stat.st_size, stat.st_mtime_ns, Selected):
+                    connection.execute(
+                        "INSERT INTO Images VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, ?) ON CONFLICT(Path) DO UPDATE SET "
+                        "Size = excluded.Size, Mtime_NS = excluded.Mtime_NS, Selected = excluded.Selected, Updated = excluded.Updated",
+                        (Image_Path, entry.name, YEAR, DATE, Parsed[1], Parsed[2], stat.st_size, stat.st_mtime_ns, Selected, Now))
+                    Summary["Updated"] += 1
+                Sidecar_Mtime_NS = Sidecars.get(entry.name.rsplit(".", 1)[0], 0)
+                if (row["Sidecar_Mtime_NS"] if row else 0) != Sidecar_Mtime_NS:
+                    Record_Sidecar(connection, Image_Path, Sidecar_Mtime_NS)
+                    Summary["Sidecars"] += 1
+        Removed = [(path,) for path in Rows if path not in Seen]
+        connection.executemany("DELETE FROM Images WHERE Path = ?", Removed)
+        connection.executemany("DELETE FROM OCR_Results WHERE Path = ?", Removed)
+        if (Begin_date, End_date) == ("0101", "1231"): connection.execute("INSERT OR REPLACE INTO Catalog_Years VALUES (?, ?)", (YEAR, Now))
+        connection.commit()
+    Summary["Images"], Summary["Removed"] = len(Seen), len(Removed)
+    THREAD_SAFE_PRINT("Catalog Sync", f"{YEAR}{Begin_date}-{YEAR}{End_date}: {Summary}", Log_File_Path)
+    return Summary
+
+def Catalog_Record_Sidecar(Folder_Path, Image_Path, Log_File_Path=""):
+    """
+    - Refresh the OCR/summary status of one image after its JSON sidecar was written
+    """
+    Sidecar_Path = Image_Path.rsplit(".", 1)[0] + ".json"
+    Sidecar_Mtime_NS = os.stat(Sidecar_Path).st_mtime_ns if os.path.isfile(Sidecar_Path) else 0
+    with INDEX_LOCK:
+        connection = Catalog_Connect(Folder_Path, Log_File_Path)
+        Record_Sidecar(connection, Image_Path, Sidecar_Mtime_NS)
+        connection.commit()
+
+def Catalog_Set_Filter(YEAR, Folder_Path, Final_Filter, Log_File_Path=""):
+    """
+    - Selected = FAD images and the blocks of the final filter list (after `Check_Duplicated_Images`)
+    """
+    with INDEX_LOCK:
+        connection = Catalog_Connect(Folder_Path, Log_File_Path)
+        connection.execute("UPDATE Images SET Selected = (Kind = 'FAD') WHERE Year = ?", (YEAR,))
+        connection.executemany("UPDATE Images SET Selected = 1 WHERE Year = ? AND Name = ? AND Kind = 'Block'", [(YEAR, name) for name in Final_Filter])
+        connection.commit()
+
+def Catalog_Images(YEAR, Folder_Path, Begin_date="0101", End_date="1231", Kinds=None, Selected=None, Log_File_Path=""):
+    """
+    - Catalog rows of {YEAR}_AD/ in the date range, ordered by date and name
+    - Kinds: e.g. ["CV", "HAD"]; Selected: True/False to filter on OCR/summary targets
+    """
+    Query = "SELECT * FROM Images WHERE Year = ? AND Date BETWEEN ? AND ?"
+    Params = [YEAR, YEAR + Begin_date, YEAR + End_date]
+    if Kinds:
+        Query += f" AND Kind IN ({', '.join('?' * len(Kinds))})"
+        Params += list(Kinds)
+    if Selected is not None:
+        Query += " AND Selected = ?"
+        Params.append(int(Selected))
+    with INDEX_LOCK:
+        return [dict(row) for row in Catalog_Connect(Folder_Path, Log_File_Path).execute(Query + " ORDER BY Date, Name", Params)]
+
+def Catalog_OCR_Status(YEAR, Folder_Path, OCR_Model, Begin_date="0101", End_date="1231", Log_File_Path=""):
+    """
+    - Selected images of the range with OCR status: [{"Path", "Date", "Kind", "Summary_Num", "OCR_Len"}, ...]
+    - OCR_Len is None when there is no OCR text of OCR_Model yet
+    """
+    with INDEX_LOCK:
+        return [dict(row) for row in Catalog_Connect(Folder_Path, Log_File_Path).execute(
+            "SELECT Images.Path, Images.Date, Images.Kind, Images.Summary_Num, OCR_Results.Length AS OCR_Len FROM Images "
+            "LEFT JOIN OCR_Results ON OCR_Results.Path = Images.Path AND OCR_Results.OCR_Model = ? "
+            "WHERE Images.Year = ? AND Images.Date BETWEEN ? AND ? AND Images.Selected = 1 ORDER BY Images.Date, Images.Name",
+            (OCR_Model, YEAR, YEAR + Begin_date, YEAR + End_date))]
@@ -1,59 +1,178 @@
-from PyPDF2 import PdfReader, PdfWriter
 import requests
 from datetime import datetime, timedelta
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from io import BytesIO
+import itertools
+import queue
+import threading
 import time
+import re
 import os
-from Config.Config import WEEKDAY_DICT
-from RMRBCore.RMRB_PDF_v6 import PDF_Split_All
-from Utils.main import PrintUtils, FileUtils, TextUtils
+from Config.Config import WEEKDAY_DICT, RMRB_OFFICIAL_URL, RMRB_JOJO_URL, DOWNLOAD_MAX_WORKERS, JOJO_KEEP_ORIGINAL
+from RMRBCore.RMRB_PDF_v6 import PDF_Split_To, Count_PDF_Pages, Fast_PDF_Page_Count
+from RMRBCore.RMRB_HTTP_v6 import Limited_Get, Stream_To_File
+from RMRBCore.RMRB_Index_v6 import Index_Verify, Index_Record, Index_Record_Edition, Index_Missing_Versions, Index_Range
+from RMRBCore.RMRB_Roots_v6 import Fill_From_Roots
+from Utils.main import PrintUtils, FileUtils, TextUtils, JsonUtils
 THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
 Check_Folder = FileUtils.Check_Folder
+Check_File = FileUtils.Check_File
+JsonFile_to_Dict = JsonUtils.JsonFile_to_Dict
+Dict_to_JsonFile = JsonUtils.Dict_to_JsonFile
 Format_Num = TextUtils.Format_Num
 
-def Extract_Version_Num(YEAR, MONTH, DAY, Log_File_Path=""):
+# Base urls of both channels, read at call time: point them at a mirror (or a local stand-in server) by setting these attributes
+OFFICIAL_URL = RMRB_OFFICIAL_URL
+JOJO_URL = RMRB_JOJO_URL
+
+def Official_Page_URL(YEAR, MONTH, DAY, Version_str="01"):
+    """
+    - Page url of the official channel, like .../layout/202501/02/node_01.html
+    """
+    return f"{OFFICIAL_URL}{YEAR}{MONTH}/{DAY}/node_{Version_str}.html"
+
+def JOJO_PDF_URL(YEAR, MONTH, DAY):
+    """
+    - Whole-day PDF url of the JOJO (Tencent SCF) channel
+    """
+    return f"{JOJO_URL}{YEAR}/{YEAR}{MONTH}{DAY}.pdf"
+
+# Targeted tokenizer for the official pages: only <div>/<a> tags are looked at
+TAG_PATTERN = re.compile(r"<(/?)(div|a)\b([^>]*)>", re.IGNORECASE)
+CLASS_PATTERN = re.compile(r"""class\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+HREF_PATTERN = re.compile(r"""href\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+PDF_LINK_PATTERN = re.compile(r"<a\b([^>]*)>\s*PDF下载\s*</a>", re.IGNORECASE)
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w-]+)""", re.IGNORECASE)
+
+def Decode_HTML(content, Content_Type=""):
+    """
+    - Decode page bytes with an explicit charset: Content-Type header, then <meta charset>, then utf-8
+    - Avoids `apparent_encoding`, which runs chardet over the whole body
+    """
+    charset = ""
+    if "charset=" in Content_Type.lower():
+        charset = Content_Type.lower().split("charset=")[-1].split(";")[0].strip(" \"'")
+    if not charset:
+        match = META_CHARSET_PATTERN.search(content[:2048])
+        if match: charset = match.group(1).decode("ascii")
+    try: return content.decode(charset or "utf-8", errors="replace")
+    except LookupError: return content.decode("utf-8", errors="replace")
+
+def Has_Class(attrs, name):
+    match = CLASS_PATTERN.search(attrs)
+    return bool(match) and name in match.group(1).split()
+
+def Fast_Version_Num(text):
+    """
+    - Count swiper slides with a link inside the swiper-container of the swiper-box
+    - Single pass over the <div>/<a> tags, tracking div depth; return None if the layout is missing
+    """
+    depth = 0
+    box_depth = container_depth = slide_depth = None
+    slide_linked = False
+    versions = 0
+    for match in TAG_PATTERN.finditer(text):
+        closing, tag, attrs = match.group(1), match.group(2).lower(), match.group(3)
+        if tag == "a":
+            if slide_depth is not None and not closing: slide_linked = True
+            continue
+        if closing:
+            if depth == slide_depth:
+                versions += slide_linked
+                slide_depth = None
+            elif depth == container_depth: return versions
+            elif depth == box_depth: return None # swiper-box without swiper-container
+            depth -= 1
+            continue
+        depth += 1
+        if box_depth is None:
+            if Has_Class(attrs, "swiper-box"): box_depth = depth
+        elif container_depth is None:
+            if Has_Class(attrs, "swiper-container"): container_depth = depth
+        elif slide_depth is None and Has_Class(attrs, "swiper-slide"):
+            slide_depth, slide_linked = depth, False
+    return versions if container_depth is not None else None
+
+def Fast_PDF_Link(text, url):
+    """
+    - Absolute url of the <a> tag whose text is "PDF下载", found with a single regex search
+    """
+    match = PDF_LINK_PATTERN.search(text)
+    if not match: return None
+    href = HREF_PATTERN.search(match.group(1))
+    return urljoin(url, href.group(1)) if href else None
+
+def Soup_Version_Num(text):
+    """
+    - BeautifulSoup version of `Fast_Version_Num` (fallback)
+    """
+    from bs4 import BeautifulSoup # Only needed by the fallback
+    # Parse the HTML content
+    soup = BeautifulSoup(text, 'html.parser')
+    # Find the swiper-box container
+    swiper_box = soup.find('div', class_='swiper-box')
+    if not swiper_box: return None
+    # Find the swiper-container within the swiper-box
+    swiper_container = swiper_box.find('div', class_='swiper-container')
+    if not swiper_container: return None
+    # Find all the 'a' tags within the swiper-slide divs
+    versions = 0
+    for slide in swiper_container.find_all('div', class_='swiper-slide'):
+        if slide.find('a'): versions += 1 # Find the <a> tag
+    return versions
+
+def Soup_PDF_Link(text, url):
+    """
+    - BeautifulSoup version of `Fast_PDF_Link` (fallback)
+    """
+    from bs4 import BeautifulSoup # Only needed by the fallback
+    # Parse the HTML content
+    soup = BeautifulSoup(text, 'html.parser')
+    # Locate the <a> tag with the "PDF下载" text
+    pdf_tag = soup.find('a', string='PDF下载')
+    # Construct the absolute URL for the PDF link
+    if pdf_tag: return urljoin(url, pdf_tag['href'])
+    return None
+
+def Parse_Version_Num(text):
+    """
+    - Count versions (swiper slides with a link) in the node_01.html text
+    - Fast tokenizer first, BeautifulSoup if it finds nothing
+    - Return None if the swiper box/container is missing
+    """
+    versions = Fast_Version_Num(text)
+    return versions if versions else Soup_Version_Num(text)
+
+def Parse_PDF_Link(text, url):
+    """
+    - Absolute url of the <a> tag with the "PDF下载" text in a node_XX.html page, or None
+    - Fast regex first, BeautifulSoup if it finds nothing
+    """
+    return Fast_PDF_Link(text, url) or Soup_PDF_Link(text, url)
+
+def Extract_Version_Num(YEAR, MONTH, DAY, Interactive=False, Log_File_Path=""):
     """
     - Get versions by visiting original website
+    - Return None if there is no swiper box; only with Interactive=True (manual use) is the version number asked for by hand
     - Exclusively designed for http://paper.people.com.cn/rmrb
     """
     # Use web scraping to obtain
     THREAD_SAFE_PRINT("Extract Version Num", f"YEAR: {YEAR}, MONTH: {MONTH}, DAY: {DAY}", Log_File_Path)
-    RMRB_url = f"http://paper.people.com.cn/rmrb/pc/layout/{YEAR}{MONTH}/{DAY}/node_01.html"
+    RMRB_url = Official_Page_URL(YEAR, MONTH, DAY)
     # RMRB_url_old = "http://paper.people.com.cn/rmrb/html/2024-11/18/nbs.D110000renmrb_01.htm"
-    versions = 0
     try:
         # Send a GET request to the URL
-        response = requests.get(RMRB_url)
+        response = Limited_Get(RMRB_url)
         response.raise_for_status()  # Raise an exception for HTTP errors
-
-        # Parse the HTML content
-        soup = BeautifulSoup(response.content, 'html.parser')
-        # Find the swiper-box container
-        swiper_box = soup.find('div', class_='swiper-box')
-        
-        if swiper_box:
-            # Find the swiper-container within the swiper-box
-            swiper_container = swiper_box.find('div', class_='swiper-container')
-            if swiper_container:
-                # Find all the 'a' tags within the swiper-slide divs
-                swiper_slides = swiper_container.find_all('div', class_='swiper-slide')
-                for slide in swiper_slides:
-                    link = slide.find('a')  # Find the <a> tag
-                    if link: versions += 1
-                return versions
-            else:
-                THREAD_SAFE_PRINT("Extract Version Num", "❗❗❗No swiper-container found", Log_File_Path)
-                return None
-        else:
-            THREAD_SAFE_PRINT("Extract Version Num", "❗❗❗No swiper-box found", Log_File_Path)
-            THREAD_SAFE_PRINT("Extract Version Num", f"URL: {RMRB_url}", Log_File_Path)
-            Version_Num = input("Please input version number by hand: ")
-            return int(Version_Num)
     except requests.exceptions.RequestException as e:
         THREAD_SAFE_PRINT("Extract Version Num", f"Error fetching the page: {e}", Log_File_Path)
         return None
+    versions = Parse_Version_Num(Decode_HTML(response.content, response.headers.get("Content-Type", "")))
+    if versions is not None: return versions
+    THREAD_SAFE_PRINT("Extract Version Num", "❗❗❗No swiper box found", Log_File_Path)
+    THREAD_SAFE_PRINT("Extract Version Num", f"URL: {RMRB_url}", Log_File_Path)
+    if not Interactive: return None
+    Version_Num = input("Please input version number by hand: ")
+    return int(Version_Num)
 
 # Function to extract the PDF link from the HTML
 def Get_PDF_Link(url):
@@ -63,133 +182,231 @@ def Get_PDF_Link(url):
     """
     try:
         # Fetch the webpage content
-        response = requests.get(url)
+        response = Limited_Get(url)
         response.raise_for_status()  # Check for HTTP request errors
 
-        # Properly decode the response content
-        # Use response.apparent_encoding to handle Chinese characters if needed
-        response.encoding = response.apparent_encoding or response.encoding
-
-        # Parse the HTML content
-        soup = BeautifulSoup(response.text, 'html.parser')
-        # print(soup.prettify())
-        
-        # Locate the <a> tag with the "PDF下载" text
-        pdf_tag = soup.find('a', string='PDF下载')
-        if pdf_tag:
-            # Construct the absolute URL for the PDF link
-            pdf_url = urljoin(url, pdf_tag['href'])
-            return pdf_url
-        else: return "PDF link not found❌"
+        # Properly decode the response content (explicit charset, no chardet)
+        pdf_url = Parse_PDF_Link(Decode_HTML(response.content, response.headers.get("Content-Type", "")), url)
+        return pdf_url if pdf_url else "PDF link not found❌"
     except requests.exceptions.RequestException as e:
         return f"Error occurred: {e}❌"
 
-def PDF_Link_Downloader_Official(PDF_Link, Store_Path, Max_Retries=3, Log_File_Path=""):
+def Manifest_Path(Download_Path, DATE):
+    """
+    - Edition manifest path of one date: {Download_Path}Manifest/YYYY/YYYYMMDD.json
+    """
+    return f"{Download_Path}Manifest/{DATE[:4]}/{DATE}.json"
+
+def Conditional_Headers(Entry):
+    """
+    - If-None-Match/If-Modified-Since headers from the ETag/Last-Modified stored in a manifest entry
+    """
+    headers = {}
+    if Entry.get("ETag"): headers["If-None-Match"] = Entry["ETag"]
+    if Entry.get("Last_Modified"): headers["If-Modified-Since"] = Entry["Last_Modified"]
+    return headers
+
+def Update_Validators(Entry, response):
+    Entry["ETag"] = response.headers.get("ETag", "")
+    Entry["Last_Modified"] = response.headers.get("Last-Modified", "")
+
+def Get_Edition_Manifest(YEAR, MONTH, DAY, Download_Path, Refresh=False, Log_File_Path=""):
+    """
+    - Persistent edition manifest of one date (official channel), stored at `Manifest_Path`
+    - Format: {"Date", "Version_Num", "URL", "ETag", "Last_Modified",
+    "Pages": {"01": {"Page_URL", "PDF_URL", "ETag", "Last_Modified"}, ...}}
+    - A complete manifest is reused without any HTML fetch
+    - Refresh: revalidate node_01.html and every page with conditional GETs (304 keeps the stored values)
+    - Never asks for input; return None if the version number or a PDF link cannot be found
+    """
+    DATE = f"{YEAR}{MONTH}{DAY}"
+    Path = Manifest_Path(Download_Path, DATE)
+    Manifest = JsonFile_to_Dict(Path, Log_File_Path=Log_File_Path) if os.path.exists(Path) else {}
+    Pages = Manifest.get("Pages", {})
+    Complete = bool(Manifest.get("Version_Num")) and all(
+        Pages.get(Format_Num(Version), {}).get("PDF_URL") for Version in range(1, Manifest["Version_Num"] + 1))
+    if Complete and not Refresh: return Manifest
+    THREAD_SAFE_PRINT("Edition Manifest", f"Fetching edition of {DATE}", Log_File_Path)
+    Changed = False
+    try:
+        # Version number from node_01.html
+        RMRB_url = Official_Page_URL(YEAR, MONTH, DAY)
+        headers = Conditional_Headers(Manifest) if Manifest.get("Version_Num") else {}
+        response = Limited_Get(RMRB_url, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+            Version_Num = Parse_Version_Num(Decode_HTML(response.content, response.headers.get("Content-Type", "")))
+            if not Version_Num:
+                THREAD_SAFE_PRINT("Edition Manifest", f"❗❗❗No swiper box found ({RMRB_url})", Log_File_Path)
+                return None
+            Manifest.update({"Date": DATE, "Version_Num": Version_Num, "URL": RMRB_url})
+            Update_Validators(Manifest, response)
+            Changed = True
+        # PDF link of each page
+        for Version in range(1, Manifest["Version_Num"] + 1):
+            Version_str = Format_Num(Version)
+            Entry = Pages.get(Version_str, {})
+            if Entry.get("PDF_URL") and not Refresh: continue
+            Page_URL = Official_Page_URL(YEAR, MONTH, DAY, Version_str)
+            headers = Conditional_Headers(Entry) if Entry.get("PDF_URL") else {}
+            response = Limited_Get(Page_URL, headers=headers)
+            if response.status_code == 304: continue
+            response.raise_for_status()
+            PDF_URL = Parse_PDF_Link(Decode_HTML(response.content, response.headers.get("Content-Type", "")), Page_URL)
+            if not PDF_URL:
+                THREAD_SAFE_PRINT("Edition Manifest", f"❌PDF link not found ({Page_URL})", Log_File_Path)
+                return None
+            Entry.update({"Page_URL": Page_URL, "PDF_URL": PDF_URL})
+            Update_Validators(Entry, response)
+            Pages[Version_str] = Entry
+            Changed = True
+    except requests.exceptions.RequestException as e:
+        THREAD_SAFE_PRINT("Edition Manifest", f"Error fetching the page: {e}", Log_File_Path)
+        return None
+    # Drop pages beyond the current version number
+    Manifest["Pages"] = {Version_str: Pages[Version_str] for Version_str in sorted(Pages) if int(Version_str) <= Manifest["Version_Num"]}
+    if Changed:
+        Check_File(Path)
+        Dict_to_JsonFile(Manifest, Path + ".tmp")
+        os.replace(Path + ".tmp", Path) # Atomic rename
+    return Manifest
+
+def PDF_Link_Downloader_Official(PDF_Link, Store_Path, Log_File_Path=""):
     """
     - The output can only accept valid  PDF link
     - Store_Path should be full PDF absolute local non-version path D:/RMRB/2025/20250102/20250102.pdf
     - Note that official website can only download single version PDF, not complete daily PDF (so it doesn't contain Custom_Versions)
+    - Retries and backoff are handled by the shared session (`HTTP_MAX_RETRIES`)
+    - The PDF is streamed to disk and its pages are counted on the file before the atomic rename
+    - Return {"Size", "SHA256", "Pages"} on success, otherwise False
     - Exclusively designed for http://paper.people.com.cn/rmrb
     """
-    for attempt in range(Max_Retries):
-        try:
-            # Send a GET request to the URL
-            response = requests.get(PDF_Link)
-            # Raise an exception if the request was unsuccessful
-            response.raise_for_status()
-            
-            pdf_reader = PdfReader(BytesIO(response.content))
-            THREAD_SAFE_PRINT("PDF Link Downloader Official", f"Number of pages: {len(pdf_reader.pages)}", Log_File_Path)
-            
-            # Open the file in binary write mode and write the contents to it
-            with open(Store_Path, 'wb') as pdf_file:
-                pdf_file.write(response.content)
-            THREAD_SAFE_PRINT("PDF Link Downloader Official", f"✅Successfully Downloaded to {Store_Path}", Log_File_Path)
-            time.sleep(2)
-            return True
-        except requests.exceptions.RequestException as e:
-            flag = "❗" if attempt >= 1 else ""
-            THREAD_SAFE_PRINT("PDF Link Downloader Official", f"Attempt {attempt + 1}{flag} failed: due to {e}", Log_File_Path)
-            if attempt == Max_Retries - 1:
-                THREAD_SAFE_PRINT("PDF Link Downloader Official", f"❌Error downloading {Store_Path} ({e})", Log_File_Path)
-                return False
-        time.sleep(10)
-    return False
-
-def PDF_Link_Downloader_JOJO(PDF_Link, Store_Path, Custom_Versions=[], Max_Retries=3, Log_File_Path=""):
+    try:
+        Info = Stream_To_File(PDF_Link, Store_Path, Validate=Count_PDF_Pages, Log_File_Path=Log_File_Path)
+        THREAD_SAFE_PRINT("PDF Link Downloader Official", f"Number of pages: {Info['Check']}", Log_File_Path)
+        THREAD_SAFE_PRINT("PDF Link Downloader Official", f"✅Successfully Downloaded to {Store_Path}", Log_File_Path)
+        return {"Size": Info["Size"], "SHA256": Info["SHA256"], "Pages": Info["Check"]}
+    except Exception as e:
+        THREAD_SAFE_PRINT("PDF Link Downloader Official", f"❌Error downloading {Store_Path} ({e})", Log_File_Path)
+        return False
+
+# Browser-like headers to avoid being blocked
+JOJO_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+}
+
+def PDF_Link_Downloader_JOJO(PDF_Link, Store_Path, Custom_Versions=[], Split=False, Keep_Original=True, Version_Prefix="", Log_File_Path=""):
     """
     - Download PDF from a URL that redirects to SharePoint
     - Custom_Versions should begin with 1
     - Store_Path should be full PDF absolute local non-version path like D:/RMRB/2025/20250102/20250102.pdf
+    - Version_Prefix: split versions are written to {Version_Prefix}VV.pdf (default: next to Store_Path, like D:/RMRB/2025/20250102/20250102)
+    - Retries and backoff are handled by the shared session (`HTTP_MAX_RETRIES`)
+    - The PDF is streamed to disk and its pages are counted on the file before the atomic rename
+    - Split (all versions) or Custom_Versions: the versions are split straight from the `.part` file in the same pass,
+    so the whole-day PDF is never re-read; it is only kept (renamed to Store_Path) with Keep_Original
+    - Return {"Size", "SHA256", "Pages", "Outputs"} of the whole-day PDF on success, otherwise False
     - Exclusively designed for https://reader.jojokanbao.cn/rmrb/
     """
-    # Browser-like headers to avoid being blocked
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Sec-Fetch-Dest': 'document',
-        'Sec-Fetch-Mode': 'navigate',
-        'Sec-Fetch-Site': 'none',
-        'Sec-Fetch-User': '?1',
-    }
-    for attempt in range(Max_Retries):
-        try:
-            THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"Requesting PDF from: {PDF_Link} ...", Log_File_Path)
-            # Set a longer timeout for large files
-            response = requests.get(
-                PDF_Link, 
-                headers=headers, 
-                timeout=30,
-                allow_redirects=True  # This is True by default
-            )
-            response.raise_for_status()  # Raise exception for 4xx/5xx responses
-            pdf_reader = PdfReader(BytesIO(response.content))
-            num_of_pages = len(pdf_reader.pages)
-            pages_list = [str(num + 1) for num in range(num_of_pages)]
-            THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"Number of pages: {num_of_pages}", Log_File_Path)
-            if Custom_Versions:
-                pdf_base_name = os.path.basename(Store_Path)
-                pdf_name = pdf_base_name.split(".")[0] 
-                pdf_folder = os.path.dirname(Store_Path) + "/"
-                for custom_version in Custom_Versions:
-                    if str(custom_version) in pages_list:
-                        pdf_writer = PdfWriter()
-                        pdf_writer.add_page(pdf_reader.pages[int(custom_version) - 1]) # The index starts with 0
-                        pdf_path = f"{pdf_folder}{pdf_name}{custom_version}.pdf"
-                        with open(pdf_path, 'wb') as f:
-                            pdf_writer.write(f)
-                            THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"✅Successfully Downloaded to {Store_Path}", Log_File_Path)
-                    else: THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"❌Version {custom_version} does not exist", Log_File_Path)
-            else:
-                with open(Store_Path, 'wb') as f:
-                    f.write(response.content)
-                    THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"✅Successfully Downloaded to {Store_Path}", Log_File_Path)
-            return True
-        # except requests.exceptions.Timeout:
-        #     THREAD_SAFE_PRINT("PDF Link Downloader JOJO", "❌Request timed out. The server might be slow or the file is large.", Log_File_Path)
-        # except requests.exceptions.HTTPError as e:
-        #     THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"❌HTTP Error: {e}", Log_File_Path)
-        #     THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"❌Response: {response.text[:500]}...", Log_File_Path)
-        # except requests.exceptions.RequestException as e:
-        #     THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"❌Request failed: {e}", Log_File_Path)
-        except Exception as e:
-            flag = "❗" if attempt >= 1 else ""
-            THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"Attempt {attempt + 1}{flag} failed: due to {e} ({response.text})", Log_File_Path)
-            if attempt == Max_Retries - 1:
-                THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"❌Error downloading {Store_Path} ({e})", Log_File_Path)
-                return False
-        time.sleep(10)
-
-def RMRB_PDF_Downloader(Begin_date: str, End_date: str, Download_Path, Custom_Versions=[], Log_File_Path=""):
+    Version_Prefix = Version_Prefix or os.path.splitext(Store_Path)[0]
+    Outputs = []
+
+    def Validate_And_Split(Part_Path):
+        num_of_pages = Fast_PDF_Page_Count(Part_Path) or Count_PDF_Pages(Part_Path)
+        if not (Split or Custom_Versions): return num_of_pages
+        Versions = [int(Version) for Version in Custom_Versions] or list(range(1, num_of_pages + 1))
+        for Version in Versions:
+            if not 1 <= Version <= num_of_pages: THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"❌Version {Format_Num(Version)} does not exist", Log_File_Path)
+        Versions = [Version for Version in Versions if 1 <= Version <= num_of_pages]
+        Outputs.extend(PDF_Split_To(Part_Path, Version_Prefix, Versions=Versions, Log_File_Path=Log_File_Path))
+        return num_of_pages
+
+    try:
+        THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"Requesting PDF from: {PDF_Link} ...", Log_File_Path)
+        Keep = Keep_Original or not (Split or Custom_Versions)
+        Info = Stream_To_File(PDF_Link, Store_Path, Validate=Validate_And_Split, Keep=Keep, headers=JOJO_HEADERS, Log_File_Path=Log_File_Path)
+        num_of_pages = Info["Check"]
+        THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"Number of pages: {num_of_pages}", Log_File_Path)
+        for pdf_path in Outputs: THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"✅Successfully Downloaded to {pdf_path}", Log_File_Path)
+        if Keep: THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"✅Successfully Downloaded to {Store_Path}", Log_File_Path)
+        return {"Size": Info["Size"], "SHA256": Info["SHA256"], "Pages": num_of_pages, "Outputs": Outputs}
+    except Exception as e:
+        THREAD_SAFE_PRINT("PDF Link Downloader JOJO", f"❌Error downloading {Store_Path} ({e})", Log_File_Path)
+        return False
+
+def Download_Official_Version(DATE, Version, Download_Path, PDF_URL="", Log_File_Path=""):
+    """
+    - Download one version (page) of one date from the official channel
+    - DATE: formatted string date like "20250102"
+    - PDF_URL: known PDF link (from the edition manifest); scraped from node_XX.html if empty
+    - Verified files in the download index are skipped; new downloads are recorded in it
+    """
+    YEAR, MONTH, DAY = DATE[:4], DATE[4:6], DATE[6:8]
+    Version_str = Format_Num(Version)
+    File_Name = Download_Path + f"{YEAR}/{DATE}/{DATE}{Version_str}.pdf"
+    if Index_Verify(Download_Path, DATE, Version_str, File_Name, Log_File_Path=Log_File_Path):
+        THREAD_SAFE_PRINT("RMRB PDF Downloader", f"Verified, skip {File_Name}", Log_File_Path)
+        return True
+    THREAD_SAFE_PRINT("RMRB PDF Downloader", f"Version num: {Version_str}", Log_File_Path)
+    # pdf_url_old = f"http://paper.people.com.cn/rmrb/images/{YEAR}-{MONTH}/{DAY}/{Version_str}/rmrb{DATE}{Version_str}.pdf"
+    pdf_url = PDF_URL or Get_PDF_Link(Official_Page_URL(YEAR, MONTH, DAY, Version_str)) # it can only download after 2023
+    THREAD_SAFE_PRINT("RMRB PDF Downloader", f"Online link: {pdf_url}", Log_File_Path)
+    Info = PDF_Link_Downloader_Official(PDF_Link=pdf_url, Store_Path=File_Name, Log_File_Path=Log_File_Path)
+    if Info: Index_Record(Download_Path, DATE, Version_str, File_Name, Info["Pages"], "Official", SHA256=Info["SHA256"], Log_File_Path=Log_File_Path)
+    return bool(Info)
+
+def Archive_Path(Download_Path, DATE):
+    """
+    - Kept whole-day JOJO PDF of one date: {Download_Path}Archive/YYYY/YYYYMMDD.pdf
+    - Outside the date folders, so the stages only ever see {DATE}VV.pdf versions there
+    """
+    return f"{Download_Path}Archive/{DATE[:4]}/{DATE}.pdf"
+
+def Download_JOJO_Date(DATE, Download_Path, Keep_Original=JOJO_KEEP_ORIGINAL, Log_File_Path=""):
+    """
+    - Download the whole-day PDF of one date from the JOJO channel and split it into versions
+    - DATE: formatted string date like "20150102"
+    - The versions are split from the downloaded temp file (see `PDF_Link_Downloader_JOJO`);
+    Keep_Original also keeps the whole-day PDF for archiving, at `Archive_Path`
+    - Skipped if the download index already verifies every version of the date
+    """
+    # Currently this link can only download complete daily PDF
+    # Therefore, split it during the download. Make sure each PDF contains only 1 version
+    YEAR, MONTH, DAY = DATE[:4], DATE[4:6], DATE[6:8]
+    Download_Date_Path = Download_Path + f"{YEAR}/{DATE}/"
+    if Index_Missing_Versions(Download_Path, DATE, Download_Date_Path, Log_File_Path) == []:
+        THREAD_SAFE_PRINT("RMRB PDF Downloader", f"Verified, skip {Download_Date_Path}", Log_File_Path)
+        return True
+    pdf_url = JOJO_PDF_URL(YEAR, MONTH, DAY)
+    File_Name = Archive_Path(Download_Path, DATE) if Keep_Original else Download_Date_Path + f"{DATE}.pdf" # Temp file only without Keep_Original
+    Check_Folder(Download_Date_Path, Log_File_Path)
+    Check_Folder(os.path.dirname(File_Name) + "/", Log_File_Path)
+    Info = PDF_Link_Downloader_JOJO(
+        PDF_Link=pdf_url, Store_Path=File_Name, Split=True, Keep_Original=Keep_Original,
+        Version_Prefix=Download_Date_Path + DATE, Log_File_Path=Log_File_Path)
+    if not Info: return False
+    Index_Record_Edition(Download_Path, DATE, Info["Pages"], "JOJO", SHA256=Info["SHA256"], Log_File_Path=Log_File_Path)
+    for Version_File in Info["Outputs"]:
+        Index_Record(Download_Path, DATE, Version_File[-6:-4], Version_File, 1, "JOJO", Log_File_Path=Log_File_Path)
+    return True
+
+def RMRB_PDF_Downloader(Begin_date: str, End_date: str, Download_Path, Custom_Versions=[], Refresh=False, Log_File_Path=""):
     """
     - Core function of RMRB downloader
     - Begin_date, End_date: formatted string date like "19491001"
     - Custom_Version: This is custom download feature, only supported for single day
+    - Refresh: revalidate cached edition manifests (see `Get_Edition_Manifest`)
+    - Requests are paced by the shared per-host rate limit (`HOST_LIMITER`)
     """
     start_date = datetime(int(Begin_date[:4]), int(Begin_date[4:6]), int(Begin_date[6:8]))
     end_date = datetime(int(End_date[:4]), int(End_date[4:6]), int(End_date[6:8]))
@@ -208,33 +425,174 @@ def RMRB_PDF_Downloader(Begin_date: str, End_date: str, Download_Path, Custom_Ve
         Download_Date_Path = Download_Path + f"{YEAR}/{YEAR}{MONTH}{DAY}/"
         Check_Folder(Download_Date_Path, Log_File_Path)
         if int(YEAR) >= 2023: # use official channel
-            Version_num = Extract_Version_Num(YEAR, MONTH, DAY, Log_File_Path)
-            if not Version_num: 
+            Manifest = Get_Edition_Manifest(YEAR, MONTH, DAY, Download_Path, Refresh=Refresh, Log_File_Path=Log_File_Path)
+            if not Manifest: 
                 THREAD_SAFE_PRINT("RMRB PDF Downloader", f"❌No Version Info", Log_File_Path)
                 return
+            Version_num = Manifest["Version_Num"]
+            Index_Record_Edition(Download_Path, DATE, Version_num, "Official", Log_File_Path=Log_File_Path)
             THREAD_SAFE_PRINT("RMRB PDF Downloader", f"All version: {Version_num}", Log_File_Path)
-            if not Custom_Versions: Custom_Versions = [Format_Num(Version) for Version in range(1, Version_num + 1)]
-            for Version in Custom_Versions:
-                Version_str = Format_Num(Version)
-                THREAD_SAFE_PRINT("RMRB PDF Downloader", f"Version num: {Version_str}", Log_File_Path)
-                # pdf_url_old = f"http://paper.people.com.cn/rmrb/images/{YEAR}-{MONTH}/{DAY}/{Version_str}/rmrb{DATE}{Version_str}.pdf"
-                RMRB_url = f"http://paper.people.com.cn/rmrb/pc/layout/{YEAR}{MONTH}/{DAY}/node_{Version_str}.html" # it can only download after 2023
-                pdf_url = Get_PDF_Link(RMRB_url)
-                File_Name = Download_Date_Path + f"{DATE}{Version_str}.pdf"
-                THREAD_SAFE_PRINT("RMRB PDF Downloader", f"Online link: {pdf_url}", Log_File_Path)
-                PDF_Link_Downloader_Official(PDF_Link=pdf_url, Store_Path=File_Name, Log_File_Path=Log_File_Path)
+            Versions = Custom_Versions or [Format_Num(Version) for Version in range(1, Version_num + 1)]
+            for Version in Versions:
+                PDF_URL = Manifest["Pages"].get(Format_Num(Version), {}).get("PDF_URL", "")
+                Download_Official_Version(DATE, Version, Download_Path, PDF_URL=PDF_URL, Log_File_Path=Log_File_Path)
         else: # use other channle
-            # Currently this link can only download complete daily PDF
-            # Therefore, use `PDF_Split_All` to split PDF. Make sure each PDF contains only 1 version
-            pdf_url = f"https://1314955862-79a3hvoqxc-bj.scf.tencentcs.com/RMRB/{YEAR}/{YEAR}{MONTH}{DAY}.pdf"
-            File_Name = Download_Date_Path + f"{DATE}.pdf"
-            Success = PDF_Link_Downloader_JOJO(PDF_Link=pdf_url, Store_Path=File_Name, Log_File_Path=Log_File_Path)
-            if Success: PDF_Split_All(pdf_path=File_Name, delete_original=True, Log_File_Path=Log_File_Path)
-            time.sleep(5)
+            Download_JOJO_Date(DATE, Download_Path, Log_File_Path=Log_File_Path)
         current_date += timedelta(days=1)
     THREAD_SAFE_PRINT("RMRB PDF Downloader", "Stript End...", Log_File_Path)
     THREAD_SAFE_PRINT("RMRB PDF Downloader", "*" * 80, Log_File_Path)
 
+def Run_Download_Jobs(Jobs, Download_Path, Max_Workers=DOWNLOAD_MAX_WORKERS, Recent_First=False, Refresh=False, Log_File_Path=""):
+    """
+    - Bounded worker pool over download jobs, shared by the concurrent downloader and the gap-fill engine
+    - Jobs: {DATE: Versions}, Versions like ["03", "07"] or None for every version of the date
+    - Official dates first resolve their edition manifest, then feed one job per version back into the queue
+    - Recent_First: most recent dates are served first (priority queue), otherwise oldest first
+    - Per-host concurrency and rate are capped by `HOST_LIMITER` (see `Config.HOST_*`), no fixed sleeps
+    - Progress and ETA are logged after every finished job
+    - Max_Workers must be at least 1 (ValueError otherwise, as no worker would drain the queue)
+    - Return {"Success": [...], "Failed": [...]} with items like "2025010201" (or "20150102" for whole days)
+    """
+    if Max_Workers < 1: raise ValueError(f"Max_Workers must be at least 1, got {Max_Workers}")
+    Jobs_Queue = queue.PriorityQueue()
+    Sequence = itertools.count()
+    Result = {"Success": [], "Failed": []}
+    Progress = {"Total": len(Jobs), "Done": 0}
+    Progress_Lock = threading.Lock()
+    Begin_Time = time.monotonic()
+
+    def Put(DATE, Kind, Payload):
+        Priority = -int(DATE) if Recent_First else int(DATE)
+        Jobs_Queue.put((Priority, next(Sequence), Kind, DATE, Payload))
+
+    def Finish(Name, Success, Expand=0):
+        with Progress_Lock:
+            if Name: Result["Success" if Success else "Failed"].append(Name)
+            Progress["Total"] += Expand
+            Progress["Done"] += 1
+            Done, Total = Progress["Done"], Progress["Total"]
+        Elapsed = time.monotonic() - Begin_Time
+        ETA = Elapsed / Done * (Total - Done)
+        THREAD_SAFE_PRINT("Download Jobs", f"Progress: {Done}/{Total} ({100 * Done / Total:.1f}%), ETA: {timedelta(seconds=int(ETA))}", Log_File_Path)
+
+    def Run(Kind, DATE, Payload):
+        YEAR, MONTH, DAY = DATE[:4], DATE[4:6], DATE[6:8]
+        if Kind == "Official":
+            Version_str, PDF_URL = Payload
+            Finish(DATE + Version_str, Download_Official_Version(DATE, Version_str, Download_Path, PDF_URL=PDF_URL, Log_File_Path=Log_File_Path))
+            return
+        Check_Folder(Download_Path + f"{YEAR}/{DATE}/", Log_File_Path)
+        if int(YEAR) < 2023: # use other channle
+            Finish(DATE, Download_JOJO_Date(DATE, Download_Path, Log_File_Path=Log_File_Path))
+            return
+        # use official channel
+        Manifest = Get_Edition_Manifest(YEAR, MONTH, DAY, Download_Path, Refresh=Refresh, Log_File_Path=Log_File_Path)
+        if not Manifest:
+            THREAD_SAFE_PRINT("Download Jobs", f"❌No Version Info ({DATE})", Log_File_Path)
+            Finish(DATE, False)
+            return
+        Index_Record_Edition(Download_Path, DATE, Manifest["Version_Num"], "Official", Log_File_Path=Log_File_Path)
+        Versions = [Version_str for Version_str in Manifest["Pages"] if Payload is None or Version_str in Payload]
+        THREAD_SAFE_PRINT("Download Jobs", f"{DATE} all version: {Manifest['Version_Num']}, to download: {len(Versions)}", Log_File_Path)
+        # Feed the version jobs of this date back into the queue (before this job is marked done)
+        for Version_str in Versions: Put(DATE, "Official", (Version_str, Manifest["Pages"][Version_str]["PDF_URL"]))
+        Finish("", True, Expand=len(Versions))
+
+    def Worker():
+        while True:
+            _, _, Kind, DATE, Payload = Jobs_Queue.get()
+            try:
+                if Kind is None: return
+                Run(Kind, DATE, Payload)
+            except Exception as e:
+                THREAD_SAFE_PRINT("Download Jobs", f"❌{DATE} {Kind} failed: {e}", Log_File_Path)
+                Finish(DATE, False)
+            finally: Jobs_Queue.task_done()
+
+    if not Jobs: return Result
+    for DATE, Versions in Jobs.items(): Put(DATE, "Date", Versions)
+    Workers = [threading.Thread(target=Worker, daemon=True) for _ in range(Max_Workers)]
+    for worker in Workers: worker.start()
+    Jobs_Queue.join()
+    for _ in Workers: Jobs_Queue.put((float("inf"), next(Sequence), None, None, None)) # Stop the workers
+    for worker in Workers: worker.join()
+    Result["Success"].sort()
+    Result["Failed"].sort()
+    THREAD_SAFE_PRINT("Download Jobs", f"Success: {len(Result['Success'])}, Failed: {len(Result['Failed'])} {Result['Failed']}", Log_File_Path)
+    return Result
+
+def RMRB_PDF_Downloader_Concurrent(Begin_date: str, End_date: str, Download_Path, Max_Workers=DOWNLOAD_MAX_WORKERS, Refresh=False, Log_File_Path=""):
+    """
+    - Concurrent version of `RMRB_PDF_Downloader` with a bounded thread pool over (date, version) jobs
+    - Begin_date, End_date: formatted string date like "19491001"
+    - Refresh: revalidate cached edition manifests
+    - Same on-disk layout: {Download_Path}YYYY/YYYYMMDD/YYYYMMDDVV.pdf
+    - Verified files in the download index are skipped, so an incremental run only fetches what is missing or corrupt
+    - Return {"Success": [...], "Failed": [...]} (see `Run_Download_Jobs`)
+    """
+    start_date = datetime(int(Begin_date[:4]), int(Begin_date[4:6]), int(Begin_date[6:8]))
+    end_date = datetime(int(End_date[:4]), int(End_date[4:6]), int(End_date[6:8]))
+    THREAD_SAFE_PRINT("RMRB PDF Downloader Concurrent", f"Begin date: {Begin_date}, End date: {End_date}, Workers: {Max_Workers}", Log_File_Path)
+    Jobs = {}
+    current_date = start_date
+    while current_date <= end_date:
+        Jobs[current_date.strftime("%Y%m%d")] = None
+        current_date += timedelta(days=1)
+    return Run_Download_Jobs(Jobs, Download_Path, Max_Workers=Max_Workers, Refresh=Refresh, Log_File_Path=Log_File_Path)
+
+def Scan_Missing(Begin_date: str, End_date: str, Download_Path, Log_File_Path=""):
+    """
+    - Missing (date, version) pairs of a date range from one directory scan and one index query
+    - No date folder is created; only PDFs on disk without an index entry are opened (once, then recorded as "Local")
+    - A version is missing if its file is absent, corrupt or differs (size/mtime) from the download index;
+    a date without a known edition is missing if its first version is absent
+    - Return {DATE: Versions}, Versions like ["03", "07"] or None for the whole date
+    """
+    start_date = datetime(int(Begin_date[:4]), int(Begin_date[4:6]), int(Begin_date[6:8]))
+    end_date = datetime(int(End_date[:4]), int(End_date[4:6]), int(End_date[6:8]))
+    # One scan over the year and date folders
+    Files = {}
+    for YEAR in range(start_date.year, end_date.year + 1):
+        Year_Path = Download_Path + f"{YEAR}/"
+        if not os.path.isdir(Year_Path): continue
+        with os.scandir(Year_Path) as Date_Entries:
+            for Date_Entry in Date_Entries:
+                if not (Date_Entry.is_dir() and len(Date_Entry.name) == 8 and Begin_date <= Date_Entry.name <= End_date): continue
+                with os.scandir(Date_Entry.path) as File_Entries:
+                    Files[Date_Entry.name] = {
+                        File_Entry.name: (File_Entry.stat().st_size, File_Entry.stat().st_mtime_ns)
+                        for File_Entry in File_Entries if File_Entry.is_file()}
+    Editions, Downloads = Index_Range(Download_Path, Begin_date, End_date, Log_File_Path)
+    Missing = {}
+    current_date = start_date
+    while current_date <= end_date:
+        DATE = current_date.strftime("%Y%m%d")
+        Names = Files.get(DATE, {})
+        if DATE in Editions:
+            Versions = [Format_Num(Version) for Version in range(1, Editions[DATE] + 1)]
+            Versions = [Version for Version in Versions if f"{DATE}{Version}.pdf" not in Names or Downloads.get((DATE, Version)) != Names[f"{DATE}{Version}.pdf"]]
+            # Files on disk the index has never seen (copied in, older runs): stat and record them instead of downloading again
+            Versions = [Version for Version in Versions if (DATE, Version) in Downloads or f"{DATE}{Version}.pdf" not in Names
+                        or not Index_Verify(Download_Path, DATE, Version, Download_Path + f"{DATE[:4]}/{DATE}/{DATE}{Version}.pdf", Log_File_Path=Log_File_Path)]
+            if Versions: Missing[DATE] = Versions
+        elif f"{DATE}01.pdf" not in Names: Missing[DATE] = None
+        current_date += timedelta(days=1)
+    THREAD_SAFE_PRINT("Scan Missing", f"{len(Missing)} dates with gaps between {Begin_date} and {End_date}", Log_File_Path)
+    return Missing
+
+def RMRB_Gap_Fill(Begin_date: str, End_date: str, Download_Path, Max_Workers=DOWNLOAD_MAX_WORKERS, Refresh=False, From_Roots=True, Log_File_Path=""):
+    """
+    - Fill every missing (date, version) pair of a date range (see `Scan_Missing`)
+    - From_Roots: copy PDFs that another data root already holds (cross-root index, see `Fill_From_Roots`) before downloading
+    - Jobs run on the download worker pool, most recent dates first, with progress and ETA
+    - Non-interactive (no `input()`), suitable for cron
+    - Return {"Success": [...], "Failed": [...]} (see `Run_Download_Jobs`)
+    """
+    THREAD_SAFE_PRINT("RMRB Gap Fill", f"Begin date: {Begin_date}, End date: {End_date}, Workers: {Max_Workers}", Log_File_Path)
+    Missing = Scan_Missing(Begin_date, End_date, Download_Path, Log_File_Path)
+    if From_Roots: Missing = Fill_From_Roots(Missing, Download_Path, Log_File_Path)
+    return Run_Download_Jobs(Missing, Download_Path, Max_Workers=Max_Workers, Recent_First=True, Refresh=Refresh, Log_File_Path=Log_File_Path)
+
 # def RMRB_PDF_Specific_Version(DATE: str, Version: str, Download_Path, Log_File_Path=""):
 #     """
 #     - DATE: formatted string date like "19491001"
@@ -265,24 +623,11 @@ def RMRB_PDF_Downloader(Begin_date: str, End_date: str, Download_Path, Custom_Ve
 
 def Check_RMRB_Exist(Begin_date: str, End_date: str, Download_Path, Log_File_Path=""):
     """
-    Begin_date, End_date: formatted string date like "19491001"
+    - Begin_date, End_date: formatted string date like "19491001"
+    - A date is missing if any version is absent or changed since it was verified (see `Scan_Missing`)
+    - No date folder is created
     """
-    start_date = datetime(int(Begin_date[:4]), int(Begin_date[4:6]), int(Begin_date[-2:]))
-    end_date = datetime(int(End_date[:4]), int(End_date[4:6]), int(End_date[-2:]))
-    current_date = start_date
-    missing_dates = []
-    while current_date <= end_date:
-        date_str = current_date.strftime("%Y%m%d")
-        year = current_date.strftime("%Y")
-        month = current_date.strftime("%m")
-        day = current_date.strftime("%d")
-        Download_Date_Path = Download_Path + f"{year}/{year}{month}{day}/"
-        Check_Folder(Download_Date_Path, Log_File_Path)
-        file_name = date_str + "01" + ".pdf"
-        file_path = Download_Date_Path + file_name
-        if not os.path.exists(file_path):
-            missing_dates.append(date_str)
-        current_date += timedelta(days=1)
-    return missing_dates
+    return sorted(Scan_Missing(Begin_date, End_date, Download_Path, Log_File_Path))
+
 # Example usage
 # RMRB_PDF_Download(Today_Bool=True)
\ No newline at end of file
@@ -0,0 +1,234 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import threading
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from Config.Config import HOST_MAX_CONCURRENCY, HOST_RATE_LIMIT, HOST_RATE_BURST
+from Config.Config import HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_TIMEOUT, HTTP_CHUNK_SIZE
+from Config.Config import HTTP_MAX_RESUMES, HTTP_CHECKPOINT_SIZE
+from Utils.main import PrintUtils
+THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
+
+class TokenBucket:
+    """
+    - Thread-safe token bucket
+    - Rate: tokens refilled per second; Capacity: max burst size
+    """
+    def __init__(self, Rate=HOST_RATE_LIMIT, Capacity=HOST_RATE_BURST):
+        self.Rate = float(Rate)
+        self.Capacity = float(Capacity)
+        self.Tokens = float(Capacity)
+        self.Last = time.monotonic()
+        self.Lock = threading.Lock()
+
+    def Acquire(self, Tokens=1.0):
+        # Block until enough tokens are available
+        while True:
+            with self.Lock:
+                now = time.monotonic()
+                self.Tokens = min(self.Capacity, self.Tokens + (now - self.Last) * self.Rate)
+                self.Last = now
+                if self.Tokens >= Tokens:
+                    self.Tokens -= Tokens
+                    return
+                wait = (Tokens - self.Tokens) / self.Rate
+            time.sleep(wait)
+
+class HostLimiter:
+    """
+    - Per-host concurrency cap (semaphore) and rate limit (token bucket)
+    - Replaces the fixed `time.sleep` pauses between requests
+    """
+    def __init__(self, Max_Concurrency=HOST_MAX_CONCURRENCY, Rate=HOST_RATE_LIMIT, Burst=HOST_RATE_BURST):
+        self.Max_Concurrency = Max_Concurrency
+        self.Rate = Rate
+        self.Burst = Burst
+        self.Hosts = {}
+        self.Lock = threading.Lock()
+
+    def Get_Host(self, url):
+        host = urlsplit(url).netloc
+        with self.Lock:
+            if host not in self.Hosts:
+                self.Hosts[host] = (
+                    threading.BoundedSemaphore(self.Max_Concurrency),
+                    TokenBucket(Rate=self.Rate, Capacity=self.Burst))
+            return self.Hosts[host]
+
+    @contextmanager
+    def Slot(self, url):
+        semaphore, bucket = self.Get_Host(url)
+        with semaphore:
+            bucket.Acquire()
+            yield
+
+# Shared by every downloader request in this process
+HOST_LIMITER = HostLimiter()
+SESSION = None
+SESSION_LOCK = threading.Lock()
+
+def Build_Session(Pool_Size=HTTP_POOL_SIZE, Max_Retries=HTTP_MAX_RETRIES, Backoff_Factor=HTTP_BACKOFF_FACTOR):
+    """
+    - Session with a keep-alive connection pool and retry/backoff on the adapter
+    - Retries connect/read errors and 429/5xx responses (honouring Retry-After)
+    """
+    retry = Retry(
+        total=Max_Retries,
+        backoff_factor=Backoff_Factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False, # Let the caller `raise_for_status()`
+    )
+    adapter = HTTPAdapter(pool_connections=Pool_Size, pool_maxsize=Pool_Size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def Get_Session():
+    """
+    - Process-wide shared session (created on first use)
+    - The connection pool is thread-safe, so every worker thread reuses the same keep-alive connections
+    """
+    global SESSION
+    if SESSION is None:
+        with SESSION_LOCK:
+            if SESSION is None: SESSION = Build_Session()
+    return SESSION
+
+def Limited_Get(url, Limiter=None, Session=None, **kwargs):
+    """
+    - GET through the shared session, behind the per-host concurrency cap and rate limit
+    - Extra keyword arguments are passed through to `Session.get` (default timeout: `HTTP_TIMEOUT`)
+    """
+    Limiter = Limiter or HOST_LIMITER
+    Session = Session or Get_Session()
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    with Limiter.Slot(url):
+        return Session.get(url, **kwargs)
+
+def Read_Checkpoint(url, Part_Path, Sidecar_Path):
+    """
+    - Resume offset and validator (ETag/Last-Modified) of a `.part` file
+    - The offset never exceeds the bytes actually on disk; a sidecar of another url is ignored
+    """
+    if not (os.path.exists(Part_Path) and os.path.exists(Sidecar_Path)): return 0, ""
+    try:
+        with open(Sidecar_Path, "r", encoding="utf-8") as file: Checkpoint = json.load(file)
+    except (OSError, ValueError): return 0, ""
+    if Checkpoint.get("URL") != url: return 0, ""
+    return min(int(Checkpoint.get("Offset", 0)), os.path.getsize(Part_Path)), Checkpoint.get("Validator", "")
+
+def Write_Checkpoint(url, Sidecar_Path, Offset, Validator):
+    with open(Sidecar_Path, "w", encoding="utf-8") as file:
+        json.dump({"URL": url, "Offset": Offset, "Validator": Validator}, file)
+
+def Clear_Checkpoint(Part_Path, Sidecar_Path):
+    for path in (Part_Path, Sidecar_Path):
+        if os.path.exists(path): os.remove(path)
+
+def Hash_File(File_Path, Length, Chunk_Size=HTTP_CHUNK_SIZE):
+    """
+    - SHA-256 object over the first `Length` bytes of a file (to continue hashing a resumed `.part`)
+    """
+    sha256 = hashlib.sha256()
+    with open(File_Path, "rb") as file:
+        while Length > 0:
+            chunk = file.read(min(Chunk_Size, Length))
+            if not chunk: break
+            sha256.update(chunk)
+            Length -= len(chunk)
+    return sha256
+
+def Stream_To_File(
+    url, Store_Path, Validate=None, Resume=True, Keep=True,
+    Max_Resumes=HTTP_MAX_RESUMES, Chunk_Size=HTTP_CHUNK_SIZE, Checkpoint_Size=HTTP_CHECKPOINT_SIZE, 
+    Limiter=None, Session=None, Log_File_Path="", **kwargs
+):
+    """
+    - Stream a response body to `{Store_Path}.part` chunk by chunk, computing SHA-256 in the same pass
+    - Validate: optional callable run on the `.part` file before the atomic rename (raise or return falsy to reject)
+    - Keep: rename `.part` to Store_Path; if False the body is dropped after Validate (which consumed it, e.g. a split)
+    - Resume: keep `.part` with a sidecar offset (`.part.json`) and continue with a `Range` request
+    after a mid-transfer failure (also across runs). Servers that ignore `Range` or whose
+    ETag/Last-Modified changed (`If-Range`) send the whole body, which restarts from byte zero.
+    - Memory use stays at one chunk regardless of file size
+    - The host slot is held until the body is fully read
+    - Return {"Size": bytes, "SHA256": hex digest, "Check": result of Validate}
+    """
+    Limiter = Limiter or HOST_LIMITER
+    Session = Session or Get_Session()
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    Headers = dict(kwargs.pop("headers", None) or {})
+    Headers["Accept-Encoding"] = "identity" # Range offsets must match the bytes written to disk
+    Part_Path = Store_Path + ".part"
+    Sidecar_Path = Part_Path + ".json"
+    if not Resume: Clear_Checkpoint(Part_Path, Sidecar_Path)
+    for attempt in range(Max_Resumes + 1):
+        Offset, Validator = Read_Checkpoint(url, Part_Path, Sidecar_Path) if Resume else (0, "")
+        Request_Headers = dict(Headers)
+        if Offset:
+            Request_Headers["Range"] = f"bytes={Offset}-"
+            if Validator: Request_Headers["If-Range"] = Validator
+        size = Offset
+        try:
+            with Limiter.Slot(url):
+                with Session.get(url, stream=True, headers=Request_Headers, **kwargs) as response:
+                    if response.status_code == 416: # Stale checkpoint
+                        Clear_Checkpoint(Part_Path, Sidecar_Path)
+                        continue
+                    response.raise_for_status()
+                    Content_Range = response.headers.get("Content-Range", "")
+                    if not (response.status_code == 206 and Content_Range.startswith(f"bytes {Offset}-")): 
+                        Offset = 0 # Full restart
+                    if Offset: THREAD_SAFE_PRINT("Stream To File", f"Resuming {url} from byte {Offset}", Log_File_Path)
+                    Validator = response.headers.get("ETag") or response.headers.get("Last-Modified", "")
+                    sha256 = Hash_File(Part_Path, Offset) if Offset else hashlib.sha256()
+                    size = Offset
+                    Since_Checkpoint = 0
+                    with open(Part_Path, "r+b" if Offset else "wb") as file:
+                        file.seek(Offset)
+                        file.truncate()
+                        for chunk in response.iter_content(chunk_size=Chunk_Size):
+                            if not chunk: continue
+                            file.write(chunk)
+                            sha256.update(chunk)
+                            size += len(chunk)
+                            Since_Checkpoint += len(chunk)
+                            if Resume and Since_Checkpoint >= Checkpoint_Size:
+                                file.flush()
+                                Write_Checkpoint(url, Sidecar_Path, size, Validator)
+                                Since_Checkpoint = 0
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError, requests.exceptions.Timeout) as e:
+            if not Resume:
+                Clear_Checkpoint(Part_Path, Sidecar_Path)
+                raise
+            if os.path.exists(Part_Path): Write_Checkpoint(url, Sidecar_Path, size, Validator)
+            if attempt == Max_Resumes: raise # Keep `.part` for the next run
+            THREAD_SAFE_PRINT("Stream To File", f"Transfer interrupted at byte {size} ({e}), resume {attempt + 1}/{Max_Resumes}", Log_File_Path)
+            continue
+        except BaseException:
+            if not Resume: Clear_Checkpoint(Part_Path, Sidecar_Path)
+            raise
+        break
+    else: raise requests.exceptions.RetryError(f"Could not resume {url} after {Max_Resumes} attempts")
+    try:
+        Check = Validate(Part_Path) if Validate else True
+        if not Check: raise ValueError(f"Validation failed for {url}")
+    except BaseException:
+        Clear_Checkpoint(Part_Path, Sidecar_Path) # Corrupt body: never resume from it
+        raise
+    if Keep: os.replace(Part_Path, Store_Path) # Atomic rename
+    else: os.remove(Part_Path)
+    if os.path.exists(Sidecar_Path): os.remove(Sidecar_Path)
+    return {"Size": size, "SHA256": sha256.hexdigest(), "Check": Check}
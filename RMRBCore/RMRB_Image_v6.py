@@ -5,6 +5,7 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 import cv2
 import numpy as np
+from Config.Config import AD_CV_NMS_IOU, AD_CV_ASPECT, AD_IMAGE_FORMAT, AD_PNG_COMPRESSION
 from Utils.main import PrintUtils, FileUtils, JsonUtils, TimeUtils, TextUtils
 THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
 Check_Folder = FileUtils.Check_Folder
@@ -17,6 +18,103 @@ Dict_to_JsonFile = JsonUtils.Dict_to_JsonFile
 Create_Date = TimeUtils.Create_Date
 Format_Num = TextUtils.Format_Num
 
+def Save_Image(image, Path_No_Suffix, Stage="Block", Format="", RGB=False, Level=None):
+    """
+    - Write a BGR numpy image (RGB with RGB=True) in the format of `AD_IMAGE_FORMAT[Stage]` (or Format)
+    - "png": zlib level `AD_PNG_COMPRESSION` (or Level); "webp": lossless; "npy": raw array (`Load_Image` maps it, no decoding)
+    - Return the written path, suffix included
+    """
+    Format = Format or AD_IMAGE_FORMAT[Stage]
+    if RGB: image = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+    Path = f"{Path_No_Suffix}.{Format}"
+    if Format == "npy": np.save(Path, np.ascontiguousarray(image))
+    elif Format == "webp": cv2.imwrite(Path, image, [cv2.IMWRITE_WEBP_QUALITY, 101]) # Quality above 100: lossless
+    else: cv2.imwrite(Path, image, [cv2.IMWRITE_PNG_COMPRESSION, AD_PNG_COMPRESSION if Level is None else Level])
+    return Path
+
+def Load_Image(Path):
+    # BGR numpy image of `Save_Image` (a read-only memmap for .npy), None if it cannot be read
+    if Path.endswith(".npy"):
+        try: return np.load(Path, mmap_mode="r")
+        except (OSError, ValueError): return None
+    return cv2.imread(Path)
+
+BOX_DTYPE = np.dtype([("x", np.int32), ("y", np.int32), ("w", np.int32), ("h", np.int32)]) # Boxes of `CV_Detect_Boxes`
+
+def Contour_Boxes(contours):
+    """
+    - Bounding boxes of all contours at once (same as `cv2.boundingRect` per contour): structured BOX_DTYPE array
+    """
+    if not len(contours): return np.empty(0, dtype=BOX_DTYPE)
+    Lengths = np.fromiter((len(contour) for contour in contours), dtype=np.int64, count=len(contours))
+    Points = np.concatenate(contours).reshape(-1, 2)
+    Starts = np.concatenate(([0], np.cumsum(Lengths)[:-1]))
+    Mins = np.minimum.reduceat(Points, Starts)
+    Maxs = np.maximum.reduceat(Points, Starts)
+    Boxes = np.empty(len(contours), dtype=BOX_DTYPE)
+    Boxes["x"], Boxes["y"] = Mins[:, 0], Mins[:, 1]
+    Boxes["w"], Boxes["h"] = Maxs[:, 0] - Mins[:, 0] + 1, Maxs[:, 1] - Mins[:, 1] + 1
+    return Boxes
+
+def NMS_Boxes(Boxes, IoU):
+    """
+    - Non-max suppression: drop every box overlapping a larger kept box by more than IoU
+    - Survivors keep their original order
+    """
+    x0, y0 = Boxes["x"].astype(np.int64), Boxes["y"].astype(np.int64)
+    x1, y1 = x0 + Boxes["w"], y0 + Boxes["h"]
+    Areas = (x1 - x0) * (y1 - y0)
+    Order = np.argsort(-Areas, kind="stable")
+    Keep = []
+    while Order.size:
+        First, Rest = Order[0], Order[1:]
+        Keep.append(First)
+        W = np.clip(np.minimum(x1[First], x1[Rest]) - np.maximum(x0[First], x0[Rest]), 0, None)
+        H = np.clip(np.minimum(y1[First], y1[Rest]) - np.maximum(y0[First], y0[Rest]), 0, None)
+        Inter = W * H
+        Order = Rest[Inter / (Areas[First] + Areas[Rest] - Inter) <= IoU]
+    return Boxes[np.sort(np.array(Keep, dtype=np.int64))]
+
+def CV_Detect_Boxes(image, Threshold: list=[0.4, 0.6], NMS_IoU: float=AD_CV_NMS_IOU, Aspect=AD_CV_ASPECT):
+    """
+    - Contour detection of `CV_Detect_Ads` on a BGR image: blur, Canny, external contours
+    - All boxes are filtered at once in NumPy: area in [min * whole_area, max * whole_area],
+    then the optional aspect range (min, max) of w / h and non-max suppression above NMS_IoU (0: off)
+    - Return a structured BOX_DTYPE array (x, y, w, h) in pixels, in contour order; nothing is written
+    """
+    # Get the dimensions of the image
+    height, width = image.shape[:2]
+    # Calculate the area of the entire image
+    image_area = height * width
+    Ad_Block_Threshold_Min = Threshold[0] * image_area
+    Ad_Block_Threshold_Max = Threshold[1] * image_area
+
+    # Convert to grayscale
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # Apply Gaussian blur to reduce noise
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    # Apply edge detection
+    edges = cv2.Canny(blurred, 50, 150)
+
+    # Find contours
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    Boxes = Contour_Boxes(contours)
+    # Filter based on area (w is length, h is height)
+    Areas = Boxes["w"].astype(np.int64) * Boxes["h"]
+    Mask = (Areas >= Ad_Block_Threshold_Min) & (Areas <= Ad_Block_Threshold_Max)
+    if Aspect: Mask &= (Boxes["w"] >= Aspect[0] * Boxes["h"]) & (Boxes["w"] <= Aspect[1] * Boxes["h"])
+    Boxes = Boxes[Mask]
+    if NMS_IoU and len(Boxes) > 1: Boxes = NMS_Boxes(Boxes, NMS_IoU)
+    return Boxes
+
+def CV_Page_Boxes(image_element, Zoom, Threshold: list=[0.4, 0.6]):
+    """
+    - `CV_Detect_Boxes` on a page rendered at Zoom (RGB numpy array)
+    - Return the boxes in page coordinates [(x0, y0, x1, y1), ...], like `Vector_Detect_Ads`
+    """
+    image = cv2.cvtColor(np.array(image_element), cv2.COLOR_RGB2BGR)
+    return [(x / Zoom, y / Zoom, (x + w) / Zoom, (y + h) / Zoom) for x, y, w, h in CV_Detect_Boxes(image, Threshold).tolist()]
+
 def CV_Detect_Ads(
     root_path: str,
     image_type: str="CV",
@@ -44,8 +142,9 @@ def CV_Detect_Ads(
     - Whole_Image_Bool: Whether save the marked image
     """
     if Image_Path_Bool:
-        # Load the image
-        image = cv2.imread(image_path)
+        # Load the image (writable copy: the marks are drawn on it)
+        image = Load_Image(image_path)
+        if image is not None: image = np.array(image)
         if image is None:
             THREAD_SAFE_PRINT("CV Detect Ads", f"Failed to load image: {image_path}", Log_File_Path)
             return False
@@ -58,64 +157,130 @@ def CV_Detect_Ads(
     if AD_SHAPE_ANALYSIS: SHAPE_Dict = {}
     pdf_name = pdf_name[:8] # keep only date, not version
 
-    # Get the dimensions of the image
-    height, width = image.shape[:2]
-    # Calculate the area of the entire image
-    image_area = height * width
-    Ad_Block_Threshold_Min = Threshold[0] * image_area
-    Ad_Block_Threshold_Max = Threshold[1] * image_area
-
-    # Convert to grayscale
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    # Apply Gaussian blur to reduce noise
-    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-    # Apply edge detection
-    edges = cv2.Canny(blurred, 50, 150)
-
-    # Find contours
-    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     ad_found = False  # Flag to indicate if an ad is detected
-
     i = 1
-    # Iterate through contours
-    for contour in contours:
-        # print(contour)
-        # Get the bounding box of the contour
-        x, y, w, h = cv2.boundingRect(contour)
-        # Calculate the area of the bounding rectangle
-        area_rect = w * h # w is length, h is height
-
-        # Filter based on area and aspect ratio (adjust thresholds as needed)
-        if (area_rect >= Ad_Block_Threshold_Min) and (area_rect <= Ad_Block_Threshold_Max):
-            ad_found = True
-
-            if Whole_Image_Bool:
-                # Draw a rectangle around the detected ad block
-                cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
-            if Image_Clip_Bool: 
-                # Save the ad block image to local
-                Check_Folder(Folder_Path=root_path, Log_File_Path=Log_File_Path)
-                ad_block = image[y:y + h, x:x + w] # Clip the ad block
-                output_block_path = f"{root_path}{pdf_name}_{pdf_version}_{image_type}_Block_{i}.png"
-                cv2.imwrite(output_block_path, ad_block)
-                if AD_SHAPE_ANALYSIS: 
-                    pdf_name_version = f"{pdf_name}_{pdf_version}_{i}"
-                    Result = {}
-                    Result["output_block_path"] = os.path.basename(output_block_path) # relative path
-                    Result["w"] = f"{w}"
-                    Result["h"] = f"{h}"
-                    Result["w_divide_h"] = f"{w / h :.3f}"
-                    Text = f"{pdf_version}_{i} of {output_block_path} with (w = {w}, h = {h}) (w / h = {w / h :.3f})"
-                    THREAD_SAFE_PRINT("CV Detect Ads", Text, Log_File_Path)
-                    SHAPE_Dict[pdf_name_version] = Result
-                else: THREAD_SAFE_PRINT("CV Detect Ads", f"Version {pdf_version}_{i} Saved ad block to {output_block_path}", Log_File_Path)
-                i += 1
+    # Iterate through the detected boxes
+    for x, y, w, h in CV_Detect_Boxes(image, Threshold).tolist():
+        ad_found = True
+
+        if Whole_Image_Bool:
+            # Draw a rectangle around the detected ad block
+            cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        if Image_Clip_Bool: 
+            # Save the ad block image to local
+            Check_Folder(Folder_Path=root_path, Log_File_Path=Log_File_Path)
+            ad_block = image[y:y + h, x:x + w] # Clip the ad block
+            output_block_path = Save_Image(ad_block, f"{root_path}{pdf_name}_{pdf_version}_{image_type}_Block_{i}", "Block")
+            if AD_SHAPE_ANALYSIS: 
+                pdf_name_version = f"{pdf_name}_{pdf_version}_{i}"
+                Result = {}
+                Result["output_block_path"] = os.path.basename(output_block_path) # relative path
+                Result["w"] = f"{w}"
+                Result["h"] = f"{h}"
+                Result["w_divide_h"] = f"{w / h :.3f}"
+                Text = f"{pdf_version}_{i} of {output_block_path} with (w = {w}, h = {h}) (w / h = {w / h :.3f})"
+                THREAD_SAFE_PRINT("CV Detect Ads", Text, Log_File_Path)
+                SHAPE_Dict[pdf_name_version] = Result
+            else: THREAD_SAFE_PRINT("CV Detect Ads", f"Version {pdf_version}_{i} Saved ad block to {output_block_path}", Log_File_Path)
+            i += 1
     # Display the result or save it for later review
     if ad_found and Whole_Image_Bool:
         Check_Folder(Folder_Path=root_path, Log_File_Path=Log_File_Path)
-        output_path = f"{root_path}{pdf_name}_{pdf_version}_CV.png"
-        cv2.imwrite(output_path, image)  # Save image with detected ads
+        output_path = Save_Image(image, f"{root_path}{pdf_name}_{pdf_version}_CV", "Marked")  # Save image with detected ads
         THREAD_SAFE_PRINT("CV Detect Ads", f"Version {pdf_version} Saved whole image to {output_path}", Log_File_Path)
     if AD_SHAPE_ANALYSIS: return SHAPE_Dict
     else: return None
-# CV_Detect_Ads("D:/AI_data_analysis/RMRB/", "D:/AI_data_analysis/RMRB/20200117.pdf", "12", IMAGE_TEST[11])
\ No newline at end of file
+# CV_Detect_Ads("D:/AI_data_analysis/RMRB/", "D:/AI_data_analysis/RMRB/20200117.pdf", "12", IMAGE_TEST[11])
+
+def Merge_Strokes(Rects, Gap=2):
+    """
+    - Union boxes of the strokes that touch or overlap (within Gap points), e.g. a frame drawn as four separate lines
+    - Rects: [(x0, y0, x1, y1), ...]; return the merged boxes as [[x0, y0, x1, y1], ...]
+    """
+    Groups = []
+    for rect in Rects:
+        box = list(rect)
+        Merged = True
+        while Merged: # A grown box can reach groups it missed before
+            Merged, Rest = False, []
+            for group in Groups:
+                if group[0] - Gap <= box[2] and box[0] - Gap <= group[2] and group[1] - Gap <= box[3] and box[1] - Gap <= group[3]:
+                    box = [min(box[0], group[0]), min(box[1], group[1]), max(box[2], group[2]), max(box[3], group[3])]
+                    Merged = True
+                else: Rest.append(group)
+            Groups = Rest
+        Groups.append(box)
+    return Groups
+
+def Page_Has_Vector_Box(page, Threshold: list=[0.4, 0.6], Gap=2):
+    """
+    - Cheap prefilter of `CV_Detect_Ads` on a PyMuPDF page, without rasterizing it
+    - True if a vector path (or one of its rectangles) has an area in [min * page_area, max * page_area]
+    - Thin strokes (lines, hairline rectangles) are merged first (`Merge_Strokes`), so a frame drawn as separate lines counts
+    - Embedded images of at least min * page_area also count (a scanned page can only be checked by CV)
+    """
+    page_area = abs(page.rect)
+    Ad_Block_Threshold_Min = Threshold[0] * page_area
+    Ad_Block_Threshold_Max = Threshold[1] * page_area
+    Strokes = []
+    for drawing in page.get_drawings():
+        Rects = [drawing["rect"]] + [item[1] for item in drawing["items"] if item[0] == "re"]
+        if any(Ad_Block_Threshold_Min <= abs(rect) <= Ad_Block_Threshold_Max for rect in Rects): return True
+        Strokes += [tuple(rect) for rect in Rects if min(rect.width, rect.height) <= Gap]
+    if any(Ad_Block_Threshold_Min <= (box[2] - box[0]) * (box[3] - box[1]) <= Ad_Block_Threshold_Max for box in Merge_Strokes(Strokes, Gap)): return True
+    return any(abs(page.rect & info["bbox"]) >= Ad_Block_Threshold_Min for info in page.get_image_info())
+
+def AD_Shape_Filter(W, H, W_Divide_H):
+    """
+    - Aspect filter of the ad blocks (also used by `AD_Shape_Analysis`)
+    - Output is True means the picture is correct: non-empty and 1.4 <= w / h <= 1.5
+    """
+    if int(W) and int(H) and 1.4 <= float(W_Divide_H) <= 1.5: return True
+    return False
+
+def Vector_Detect_Ads(page, Threshold: list=[0.4, 0.6], Shape_Filter: bool=True):
+    """
+    - Vector engine of ad detection: read the rectangles and paths of a PyMuPDF page (`get_drawings`), no rendering
+    - Same area rule as `CV_Detect_Ads`: [min * page_area, max * page_area]
+    - Shape_Filter: keep only the boxes passing `AD_Shape_Filter`
+    - Return the block bounding boxes in page coordinates [(x0, y0, x1, y1), ...], top to bottom, left to right
+    """
+    page_area = abs(page.rect)
+    Ad_Block_Threshold_Min = Threshold[0] * page_area
+    Ad_Block_Threshold_Max = Threshold[1] * page_area
+    Boxes = set()
+    for drawing in page.get_drawings():
+        for rect in [drawing["rect"]] + [item[1] for item in drawing["items"] if item[0] == "re"]:
+            if not Ad_Block_Threshold_Min <= abs(rect) <= Ad_Block_Threshold_Max: continue
+            if Shape_Filter and not AD_Shape_Filter(rect.width, rect.height, rect.width / rect.height): continue
+            Boxes.add(tuple(round(value, 1) for value in rect)) # Frames drawn as a path and a rectangle count once
+    return sorted(Boxes, key=lambda box: (box[1], box[0]))
+
+def Mark_Ads(image_element, Boxes, Zoom, output_path, Log_File_Path=""):
+    """
+    - Save a rendered page (RGB numpy array) with the page-coordinate Boxes drawn like `CV_Detect_Ads` does
+    - output_path: without suffix (see `Save_Image`, stage "Marked")
+    """
+    image = cv2.cvtColor(np.array(image_element), cv2.COLOR_RGB2BGR)
+    for x0, y0, x1, y1 in Boxes:
+        cv2.rectangle(image, (int(x0 * Zoom), int(y0 * Zoom)), (int(x1 * Zoom), int(y1 * Zoom)), (0, 255, 0), 2)
+    output_path = Save_Image(image, output_path, "Marked")
+    THREAD_SAFE_PRINT("Mark Ads", f"Saved whole image to {output_path} ({len(Boxes)} blocks)", Log_File_Path)
+
+def Clip_Ads(image_element, Boxes, Zoom, root_path, image_type="CV", pdf_name="", pdf_version="1", Log_File_Path=""):
+    """
+    - Clip the page-coordinate Boxes out of a page rendered at Zoom (RGB numpy array), named like `CV_Detect_Ads` blocks
+    - Return the shape dict of `CV_Detect_Ads` with AD_SHAPE_ANALYSIS: {"{pdf_name}_{pdf_version}_{i}": {...}}
+    """
+    image = cv2.cvtColor(np.array(image_element), cv2.COLOR_RGB2BGR)
+    Check_Folder(Folder_Path=root_path, Log_File_Path=Log_File_Path)
+    SHAPE_Dict = {}
+    for i, (x0, y0, x1, y1) in enumerate(Boxes, 1):
+        x, y = int(x0 * Zoom), int(y0 * Zoom)
+        w, h = int(x1 * Zoom) - x, int(y1 * Zoom) - y
+        output_block_path = Save_Image(image[y:y + h, x:x + w], f"{root_path}{pdf_name}_{pdf_version}_{image_type}_Block_{i}", "Block")
+        SHAPE_Dict[f"{pdf_name}_{pdf_version}_{i}"] = {
+            "output_block_path": os.path.basename(output_block_path), # relative path
+            "w": f"{w}", "h": f"{h}", "w_divide_h": f"{w / h :.3f}"}
+        THREAD_SAFE_PRINT("Clip Ads", f"{pdf_version}_{i} of {output_block_path} with (w = {w}, h = {h}) (w / h = {w / h :.3f})", Log_File_Path)
+    return SHAPE_Dict
@@ -0,0 +1,184 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import sqlite3
+import threading
+from datetime import datetime
+from Config.Config import INDEX_FOLDER
+from Utils.main import PrintUtils, FileUtils
+THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
+Check_Folder = FileUtils.Check_Folder
+File_SHA256 = FileUtils.File_SHA256
+
+# One connection per data root, shared by all threads behind `INDEX_LOCK`
+INDEX_LOCK = threading.RLock()
+CONNECTIONS = {}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS Downloads (
+    Date TEXT NOT NULL,         -- YYYYMMDD
+    Version TEXT NOT NULL,      -- VV
+    Path TEXT NOT NULL,
+    Size INTEGER NOT NULL,
+    Mtime_NS INTEGER NOT NULL,
+    SHA256 TEXT NOT NULL,
+    Pages INTEGER NOT NULL,
+    Channel TEXT NOT NULL,      -- Official / JOJO / Local
+    Updated TEXT NOT NULL,
+    PRIMARY KEY (Date, Version)
+);
+CREATE TABLE IF NOT EXISTS Editions (
+    Date TEXT PRIMARY KEY,      -- YYYYMMDD
+    Version_Num INTEGER NOT NULL,
+    Channel TEXT NOT NULL,
+    SHA256 TEXT NOT NULL DEFAULT '', -- Whole-day PDF (JOJO)
+    Updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS Page_Counts (
+    Path TEXT PRIMARY KEY,
+    Size INTEGER NOT NULL,
+    Mtime_NS INTEGER NOT NULL,
+    Pages INTEGER NOT NULL,     -- 0: unreadable PDF
+    Updated TEXT NOT NULL
+);
+"""
+
+def Index_Path(Folder_Path):
+    """
+    - Index database of a data root: {Folder_Path}Index/RMRB_Index.sqlite
+    """
+    return f"{Folder_Path}{INDEX_FOLDER}RMRB_Index.sqlite"
+
+def Index_Connect(Folder_Path, Log_File_Path=""):
+    """
+    - Open (and create) the index database of a data root, cached per path
+    """
+    Path = Index_Path(Folder_Path)
+    with INDEX_LOCK:
+        if Path not in CONNECTIONS:
+            Check_Folder(os.path.dirname(Path) + "/", Log_File_Path)
+            connection = sqlite3.connect(Path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            CONNECTIONS[Path] = connection
+        return CONNECTIONS[Path]
+
+def Index_Record(Folder_Path, DATE, Version, File_Path, Pages, Channel, SHA256="", Log_File_Path=""):
+    """
+    - Record a verified PDF: size and mtime of the file on disk, hash, page count and source channel
+    - SHA256 is computed from the file if it is not given
+    """
+    stat = os.stat(File_Path)
+    SHA256 = SHA256 or File_SHA256(File_Path)
+    with INDEX_LOCK:
+        connection = Index_Connect(Folder_Path, Log_File_Path)
+        connection.execute(
+            "INSERT OR REPLACE INTO Downloads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (DATE, Version, File_Path, stat.st_size, stat.st_mtime_ns, SHA256, Pages, Channel, datetime.now().isoformat(timespec="seconds")))
+        connection.execute(
+            "INSERT OR REPLACE INTO Page_Counts VALUES (?, ?, ?, ?, ?)",
+            (File_Path, stat.st_size, stat.st_mtime_ns, Pages, datetime.now().isoformat(timespec="seconds")))
+        connection.commit()
+
+def Index_Record_Edition(Folder_Path, DATE, Version_Num, Channel, SHA256="", Log_File_Path=""):
+    """
+    - Record how many versions a date has (from the manifest or the whole-day PDF)
+    """
+    with INDEX_LOCK:
+        connection = Index_Connect(Folder_Path, Log_File_Path)
+        connection.execute(
+            "INSERT OR REPLACE INTO Editions VALUES (?, ?, ?, ?, ?)",
+            (DATE, Version_Num, Channel, SHA256, datetime.now().isoformat(timespec="seconds")))
+        connection.commit()
+
+def Index_Get(Folder_Path, DATE, Version=None, Log_File_Path=""):
+    """
+    - Download entry of (DATE, Version), or the edition entry of DATE if Version is None
+    - Return a dict or None
+    """
+    with INDEX_LOCK:
+        connection = Index_Connect(Folder_Path, Log_File_Path)
+        if Version is None: row = connection.execute("SELECT * FROM Editions WHERE Date = ?", (DATE,)).fetchone()
+        else: row = connection.execute("SELECT * FROM Downloads WHERE Date = ? AND Version = ?", (DATE, Version)).fetchone()
+    return dict(row) if row else None
+
+def Index_Verify(Folder_Path, DATE, Version, File_Path, Deep=False, Log_File_Path=""):
+    """
+    - Whether the PDF of (DATE, Version) on disk is present and verified
+    - Fast path: the indexed size and mtime match the file (Deep: the SHA-256 must match too)
+    - A file without a matching entry is parsed once; if it opens, it is recorded as "Local"
+    """
+    from RMRBCore.RMRB_PDF_v6 import Count_PDF_Pages
+    if not os.path.isfile(File_Path): return False
+    stat = os.stat(File_Path)
+    Entry = Index_Get(Folder_Path, DATE, Version, Log_File_Path)
+    if Entry and Entry["Size"] == stat.st_size and Entry["Mtime_NS"] == stat.st_mtime_ns:
+        if not Deep or File_SHA256(File_Path) == Entry["SHA256"]: return True
+    try: Pages = Count_PDF_Pages(File_Path)
+    except Exception as e:
+        THREAD_SAFE_PRINT("Index Verify", f"❌Corrupt PDF {File_Path} ({e})", Log_File_Path)
+        return False
+    if not Pages: return False
+    Index_Record(Folder_Path, DATE, Version, File_Path, Pages, Entry["Channel"] if Entry else "Local", Log_File_Path=Log_File_Path)
+    return True
+
+def Index_Missing_Versions(Folder_Path, DATE, Download_Date_Path, Log_File_Path=""):
+    """
+    - Versions of DATE that are missing or corrupt on disk, like ["03", "07"]
+    - Return None if the edition (number of versions) of DATE is unknown
+    """
+    Edition = Index_Get(Folder_Path, DATE, Log_File_Path=Log_File_Path)
+    if not Edition: return None
+    Missing = []
+    for Version in range(1, Edition["Version_Num"] + 1):
+        Version_str = f"{Version:02d}"
+        File_Path = f"{Download_Date_Path}{DATE}{Version_str}.pdf"
+        if not Index_Verify(Folder_Path, DATE, Version_str, File_Path, Log_File_Path=Log_File_Path): Missing.append(Version_str)
+    return Missing
+
+def Index_Range(Folder_Path, Begin_date, End_date, Log_File_Path=""):
+    """
+    - Bulk read of the index for a date range (Begin_date, End_date like "20250101")
+    - Return (Editions, Downloads): {DATE: Version_Num}, {(DATE, Version): (Size, Mtime_NS)}
+    """
+    with INDEX_LOCK:
+        connection = Index_Connect(Folder_Path, Log_File_Path)
+        Editions = {row["Date"]: row["Version_Num"] for row in connection.execute(
+            "SELECT Date, Version_Num FROM Editions WHERE Date BETWEEN ? AND ?", (Begin_date, End_date))}
+        Downloads = {(row["Date"], row["Version"]): (row["Size"], row["Mtime_NS"]) for row in connection.execute(
+            "SELECT Date, Version, Size, Mtime_NS FROM Downloads WHERE Date BETWEEN ? AND ?", (Begin_date, End_date))}
+    return Editions, Downloads
+
+def Index_Downloads(Folder_Path, Begin_date, End_date, Log_File_Path=""):
+    """
+    - Download entries of a date range: {(DATE, Version): {"Path", "Size", "Mtime_NS", "SHA256", "Pages", "Channel", ...}}
+    """
+    with INDEX_LOCK:
+        connection = Index_Connect(Folder_Path, Log_File_Path)
+        return {(row["Date"], row["Version"]): dict(row) for row in connection.execute(
+            "SELECT * FROM Downloads WHERE Date BETWEEN ? AND ?", (Begin_date, End_date))}
+
+def Index_Get_Page_Counts(Folder_Path, Prefix, Log_File_Path=""):
+    """
+    - Cached page counts of the PDFs whose path starts with Prefix (e.g. a year folder)
+    - Return {Path: (Size, Mtime_NS, Pages)}
+    """
+    with INDEX_LOCK:
+        connection = Index_Connect(Folder_Path, Log_File_Path)
+        return {row["Path"]: (row["Size"], row["Mtime_NS"], row["Pages"]) for row in connection.execute(
+            "SELECT Path, Size, Mtime_NS, Pages FROM Page_Counts WHERE substr(Path, 1, ?) = ?", (len(Prefix), Prefix))}
+
+def Index_Record_Page_Counts(Folder_Path, Rows, Log_File_Path=""):
+    """
+    - Rows: [(Path, Size, Mtime_NS, Pages), ...] in one transaction
+    """
+    if not Rows: return
+    Updated = datetime.now().isoformat(timespec="seconds")
+    with INDEX_LOCK:
+        connection = Index_Connect(Folder_Path, Log_File_Path)
+        connection.executemany("INSERT OR REPLACE INTO Page_Counts VALUES (?, ?, ?, ?, ?)", [Row + (Updated,) for Row in Rows])
+        connection.commit()
@@ -8,8 +8,7 @@ import re
 import ast
 import glob
 from collections import defaultdict
-from google import genai
-from datetime import datetime, timedelta
+from datetime import datetime
 import random
 # from requests.exceptions import RequestException
 import requests
@@ -18,6 +17,7 @@ from Config.API import MODEL
 from Config.Prompt import Industry_Text, System_Prompt
 from Utils.main import PrintUtils, FileUtils, JsonUtils, TextUtils
 from RMRBCore.RMRB_Error_v6 import Exit_Error_Detector
+from RMRBCore.RMRB_Catalog_v6 import Catalog_Sync, Catalog_OCR_Status, Catalog_Record_Sidecar
 THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
 Check_Folder = FileUtils.Check_Folder
 Check_File = FileUtils.Check_File
@@ -186,6 +186,7 @@ def API_Online_Gemini(Prompt, URL, Model, API_KEY, API_Name, Max_Retries=2, Time
     """
     if URL: URL = "" # URL is not applicable in this function
     if Timeout: Timeout = "" # Timeout is not applicable in this function
+    from google import genai # Deferred: heavy, only needed by Gemini
     # The client gets the API key from the environment variable `GEMINI_API_KEY`.
     client = genai.Client(api_key=API_KEY)
     # Define keys that to extract
@@ -486,48 +487,20 @@ def Check_Summary_Completion(
     Filter_Path = f"{AD_PATH}{YEAR}_Shape_Dict_Final_Filter_Outlier.json"
     Filter_File_Bool = Check_File(File_Path=Filter_Path, Create_New=False)
     if not Filter_File_Bool: THREAD_SAFE_PRINT("Check Summary Completion", f"{Filter_Path} does not exist! Please run 'Check_Duplicated_Images'", Log_File_Path)
-    Filter_List = JsonFile_to_Dict(filename=Filter_Path, Log_File_Path=Log_File_Path).get("Final_Filter", [])
-    if not Filter_List: THREAD_SAFE_PRINT("Check Summary Completion", f"{Filter_Path} is empty! Please run 'Check_Duplicated_Images'", Log_File_Path)
-    start_date = datetime(int(YEAR), int(Begin_date[:2]), int(Begin_date[2:]))
-    end_date = datetime(int(YEAR), int(End_date[:2]), int(End_date[2:]))
     THREAD_SAFE_PRINT("Check Summary Completion", f"Checking {YEAR} completion...", Log_File_Path)
-    current_date = start_date
     Exist_All_Num = 0
     All_Num = 0
-    while current_date <= end_date:
-        MONTH = Format_Num(str(current_date.month))
-        DAY = Format_Num(str(current_date.day))
-        AD_Folder_PATH = AD_PATH + f"{YEAR}{MONTH}{DAY}/"
-        if os.path.exists(AD_Folder_PATH): # Note that the path may not exist
-            for filename in os.listdir(AD_Folder_PATH):
-                file_path = AD_Folder_PATH + filename
-                name = filename.split(".")[0]
-                suffix = filename.split(".")[1]
-                # Check if it is a file (not a directory)
-                if os.path.isfile(file_path) and (suffix == "png"):
-                    name_split_list = name.split('_')
-                    # Ensure the image is an ad block or full ad
-                    FAD_BOOL = "FAD" in name_split_list
-                    BLOCK_BOOL = "Block" in name_split_list
-                    FILTER_BOOL = filename in Filter_List
-                    if FAD_BOOL or (BLOCK_BOOL and FILTER_BOOL):
-                        All_Num += Threshold_Num
-                        Text_Dict_Path = f"{AD_Folder_PATH}{name}.json"
-                        Check_File(File_Path=Text_Dict_Path)
-                        Text_Dict = JsonFile_to_Dict(Text_Dict_Path, Log_File_Path=Log_File_Path)
-                        OCR_Content = Text_Dict.get(f"OCR_{OCR_Model}", "")
-                        Exist_Num = 0
-                        if OCR_Content:
-                            for name in Text_Dict:
-                                name_split = name.split("~")
-                                if "Summary" in name_split: 
-                                    # summary_name = "~".join(name_split[:-1]) # exclude timestamp
-                                    Exist_Num += 1
-                                    Exist_All_Num += 1
-                        else: THREAD_SAFE_PRINT("Text Summary", f"❌{name} OCR_{OCR_Model} is empty", Log_File_Path)
-                        if Exist_Num >= Threshold_Num: Complete_Date_List.update({f"{MONTH}{DAY}"})
-                        else: Incomplete_Date_List.update({f"{MONTH}{DAY}"})
-        current_date += timedelta(days=1)
+    # Ad blocks in the final filter list and full ads with their OCR/summary status, from the catalog
+    Catalog_Sync(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path)
+    for Image in Catalog_OCR_Status(YEAR, Folder_Path, OCR_Model, Begin_date, End_date, Log_File_Path):
+        All_Num += Threshold_Num
+        Exist_Num = 0
+        if Image["OCR_Len"]:
+            Exist_Num = Image["Summary_Num"]
+            Exist_All_Num += Exist_Num
+        else: THREAD_SAFE_PRINT("Text Summary", f"❌{os.path.basename(Image['Path']).split('.')[0]} OCR_{OCR_Model} is empty", Log_File_Path)
+        if Exist_Num >= Threshold_Num: Complete_Date_List.update({Image["Date"][4:]})
+        else: Incomplete_Date_List.update({Image["Date"][4:]})
     # Convert to sorted list
     Complete_Date_List_Sort = sorted(Complete_Date_List)
     Incomplete_Date_List_Sort = sorted(Incomplete_Date_List)
@@ -630,76 +603,60 @@ def Text_Summary(
     Filter_Path = f"{AD_PATH}{YEAR}_Shape_Dict_Final_Filter_Outlier.json"
     Filter_File_Bool = Check_File(File_Path=Filter_Path, Create_New=False)
     if not Filter_File_Bool: THREAD_SAFE_PRINT("Text Summary", f"{Filter_Path} does not exist! Please run 'Check_Duplicated_Images'", Log_File_Path)
-    Filter_List = JsonFile_to_Dict(filename=Filter_Path, Log_File_Path=Log_File_Path).get("Final_Filter", [])
-    if not Filter_List: THREAD_SAFE_PRINT("Text Summary", f"{Filter_Path} is empty! Please run 'Check_Duplicated_Images'", Log_File_Path)
-    start_date = datetime(int(YEAR), int(Begin_date[:2]), int(Begin_date[2:]))
-    end_date = datetime(int(YEAR), int(End_date[:2]), int(End_date[2:]))
     THREAD_SAFE_PRINT("Text Summary", f"Begin date: {YEAR + Begin_date}, End date: {YEAR + End_date}", Log_File_Path)
     
-    current_date = start_date
-    while current_date <= end_date:
-        MONTH = Format_Num(str(current_date.month))
-        DAY = Format_Num(str(current_date.day))
-        Date = f"{YEAR}{MONTH}{DAY}"
+    # Ad blocks in the final filter list and full ads that still need summaries, from the catalog
+    Catalog_Sync(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path)
+    for Image in Catalog_OCR_Status(YEAR, Folder_Path, OCR_Model, Begin_date, End_date, Log_File_Path):
+        if Image["OCR_Len"] and Image["Summary_Num"] >= Threshold_Num: continue
+        Date = Image["Date"]
         Weekday = datetime.strptime(Date, '%Y%m%d').weekday() # Monday == 0, Sunday == 6
         Weekday_Chinese = WEEKDAY_CHINESE_DICT[str(Weekday + 1)]
-        AD_Folder_PATH = AD_PATH + f"{Date}/"
-        if os.path.exists(AD_Folder_PATH): # Note that the path may not exist
-            for filename in os.listdir(AD_Folder_PATH):
-                file_path = AD_Folder_PATH + filename
-                name = filename.split(".")[0]
-                suffix = filename.split(".")[1]
-                # Check if it is a file (not a directory)
-                if os.path.isfile(file_path) and (suffix == "png"):  # Ensure it is a file
-                    name_split_list = name.split('_')
-                    # Ensure the image is an ad block or full ad
-                    FAD_BOOL = "FAD" in name_split_list
-                    BLOCK_BOOL = "Block" in name_split_list
-                    FILTER_BOOL = filename in Filter_List
-                    if FAD_BOOL or (BLOCK_BOOL and FILTER_BOOL):
-                        Text_Dict_Path = f"{AD_Folder_PATH}{name}.json"
-                        Check_File(Text_Dict_Path)
-                        while True:
-                            Text_Dict = JsonFile_to_Dict(Text_Dict_Path, Log_File_Path=Log_File_Path)
-                            OCR_Content = Text_Dict.get(f"OCR_{OCR_Model}", "")
-                            if OCR_Content:
-                                # store exist summary text
-                                Exist_Models = []
-                                Exist_Num = 0
-                                for name_model in Text_Dict:
-                                    name_split = name_model.split("~")
-                                    if "Summary" in name_split: 
-                                        summary_name = "~".join(name_split[:-1]) # exclude timestamp
-                                        Exist_Models.append(summary_name)
-                                        Exist_Num += 1
-                                if Exist_Num < Threshold_Num:
-                                    THREAD_SAFE_PRINT("Text Summary", f"{Text_Dict_Path} (Exist: {Exist_Num})", Log_File_Path)
-                                    Size = "整版" if FAD_BOOL else "半版"
-                                    Prompt = System_Prompt.format(
-                                        Industry_Text=Industry_Text, DATE=Date, Weekday=Weekday_Chinese, 
-                                        Size=Size, AD=OCR_Content)
-                                    # Shuffle the model list to ensure each model can fairly be selected
-                                    API_Usage_Path = os.path.dirname(API_Usage_File_Path) + "/"
-                                    All_Models = Update_All_Models_API_Usage(All_Models=All_Models, API_Usage_Path=API_Usage_Path, Log_File_Path=Log_File_Path)
-                                    AD_Display = OCR_Content[:50].replace("\n", "")
-                                    THREAD_SAFE_PRINT(f"Text Summary-{name}", f"AD Content: {AD_Display}...", Log_File_Path)
-                                    Success, Info = Chatbot(
-                                        Prompt=Prompt, Text_Dict_Path=Text_Dict_Path, 
-                                        All_Models=All_Models, OCR_Model=OCR_Model, 
-                                        Threshold_Num=Threshold_Num, API_Usage_File_Path=API_Usage_File_Path,
-                                        Exist_Model_List=Exist_Models, Log_File_Path=Log_File_Path)
-                                    if Success: 
-                                        Exist_All_Num += (Threshold_Num - Exist_Num)
-                                        Progress = f"{100 * Exist_All_Num / All_Num:.2f}%"
-                                        THREAD_SAFE_PRINT("Text Summary", f"🔥Progress: {Progress} ({Exist_All_Num}/{All_Num})", Log_File_Path)
-                                        THREAD_SAFE_PRINT("Text Summary", f"✅Summary text is stored in {Text_Dict_Path}", Log_File_Path)
-                                        break
-                                    else: 
-                                        THREAD_SAFE_PRINT("Text Summary", f"{Info}", Log_File_Path)
-                                        time.sleep(2) # avoid too frequent requests
-                                else: break
-                            else: 
-                                THREAD_SAFE_PRINT("Text Summary", f"❌{Text_Dict} OCR_{OCR_Model} is empty", Log_File_Path)
-                                THREAD_SAFE_PRINT("Text Summary", f"Waiting 240s for OCR to complete for {Text_Dict_Path}...", Log_File_Path)
-                                time.sleep(240) # wait for OCR to complete
-        current_date += timedelta(days=1)
\ No newline at end of file
+        FAD_BOOL = Image["Kind"] == "FAD"
+        name = os.path.basename(Image["Path"]).split(".")[0]
+        Text_Dict_Path = Image["Path"].rsplit(".", 1)[0] + ".json"
+        Check_File(Text_Dict_Path)
+        while True:
+            Text_Dict = JsonFile_to_Dict(Text_Dict_Path, Log_File_Path=Log_File_Path)
+            OCR_Content = Text_Dict.get(f"OCR_{OCR_Model}", "")
+            if OCR_Content:
+                # store exist summary text
+                Exist_Models = []
+                Exist_Num = 0
+                for name_model in Text_Dict:
+                    name_split = name_model.split("~")
+                    if "Summary" in name_split: 
+                        summary_name = "~".join(name_split[:-1]) # exclude timestamp
+                        Exist_Models.append(summary_name)
+                        Exist_Num += 1
+                if Exist_Num < Threshold_Num:
+                    THREAD_SAFE_PRINT("Text Summary", f"{Text_Dict_Path} (Exist: {Exist_Num})", Log_File_Path)
+                    Size = "整版" if FAD_BOOL else "半版"
+                    Prompt = System_Prompt.format(
+                        Industry_Text=Industry_Text, DATE=Date, Weekday=Weekday_Chinese, 
+                        Size=Size, AD=OCR_Content)
+                    # Shuffle the model list to ensure each model can fairly be selected
+                    API_Usage_Path = os.path.dirname(API_Usage_File_Path) + "/"
+                    All_Models = Update_All_Models_API_Usage(All_Models=All_Models, API_Usage_Path=API_Usage_Path, Log_File_Path=Log_File_Path)
+                    AD_Display = OCR_Content[:50].replace("\n", "")
+                    THREAD_SAFE_PRINT(f"Text Summary-{name}", f"AD Content: {AD_Display}...", Log_File_Path)
+                    Success, Info = Chatbot(
+                        Prompt=Prompt, Text_Dict_Path=Text_Dict_Path, 
+                        All_Models=All_Models, OCR_Model=OCR_Model, 
+                        Threshold_Num=Threshold_Num, API_Usage_File_Path=API_Usage_File_Path,
+                        Exist_Model_List=Exist_Models, Log_File_Path=Log_File_Path)
+                    if Success: 
+                        Exist_All_Num += (Threshold_Num - Exist_Num)
+                        Progress = f"{100 * Exist_All_Num / All_Num:.2f}%"
+                        THREAD_SAFE_PRINT("Text Summary", f"🔥Progress: {Progress} ({Exist_All_Num}/{All_Num})", Log_File_Path)
+                        THREAD_SAFE_PRINT("Text Summary", f"✅Summary text is stored in {Text_Dict_Path}", Log_File_Path)
+                        break
+                    else: 
+                        THREAD_SAFE_PRINT("Text Summary", f"{Info}", Log_File_Path)
+                        time.sleep(2) # avoid too frequent requests
+                else: break
+            else: 
+                THREAD_SAFE_PRINT("Text Summary", f"❌{Text_Dict} OCR_{OCR_Model} is empty", Log_File_Path)
+                THREAD_SAFE_PRINT("Text Summary", f"Waiting 240s for OCR to complete for {Text_Dict_Path}...", Log_File_Path)
+                time.sleep(240) # wait for OCR to complete
+        Catalog_Record_Sidecar(Folder_Path, Image["Path"], Log_File_Path)
\ No newline at end of file
@@ -0,0 +1,183 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import json
+from datetime import datetime
+from Config.Config import MAINTENANCE_FOLDER, AD_IMAGE_SUFFIXES
+from Utils.main import PrintUtils
+THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
+
+# Filesystem maintenance in one `os.scandir` pass over a folder tree
+# - File rules look at one file entry and return an action or None
+# - Folder rules run bottom-up with the number of entries left after the planned actions
+# - Deleted files are moved into {Folder_Path}.Maintenance/Trash/{Stamp}/ and every applied action is
+#   appended to {Folder_Path}.Maintenance/{Stamp}_Journal.jsonl, so `Undo_Maintenance` can revert a run
+
+def Rule_Mac(entry):
+    """
+    - Some files are like "20090104-ITCN000793-MAC.pdf", they should be removed
+    """
+    if entry.name.endswith("MAC.pdf"): return {"Op": "Delete"}
+    return None
+
+def Rule_Fix_Name(entry):
+    """
+    - Fix error name like 2024010412_12_FAD.png to 20240104_12_FAD.png
+    """
+    if not entry.name.lower().endswith(AD_IMAGE_SUFFIXES + (".json",)): return None
+    file_split_list = entry.name.split("_")
+    if len(file_split_list) < 2 or len(file_split_list[0]) <= 8: return None
+    return {"Op": "Rename", "Target": file_split_list[0][:8] + "_" + "_".join(file_split_list[1:])}
+
+def Rule_Prune_Empty(Folder_Path, Remaining):
+    """
+    - Remove folders that are empty (or will be, after the planned actions)
+    """
+    if Remaining == 0: return {"Op": "Rmdir"}
+    return None
+
+FILE_RULES = {"mac": Rule_Mac, "name": Rule_Fix_Name}
+FOLDER_RULES = {"prune": Rule_Prune_Empty}
+MAINTENANCE_RULES = list(FILE_RULES) + list(FOLDER_RULES)
+
+def Plan_Maintenance(Folder_Path, Rules=MAINTENANCE_RULES, Log_File_Path=""):
+    """
+    - Walk Folder_Path once with `os.scandir` and collect the actions of the selected rules
+    - The first file rule that matches a file wins; renames onto an existing or already planned name are skipped
+    - Folder_Path itself and the maintenance folder are never touched
+    - Return the plan: [{"Op", "Rule", "Path", "Target"}, ...]
+    """
+    File_Rules = [(name, FILE_RULES[name]) for name in Rules if name in FILE_RULES]
+    Folder_Rules = [(name, FOLDER_RULES[name]) for name in Rules if name in FOLDER_RULES]
+    Plan = []
+    def Scan(Path):
+        # Return the number of entries left in Path after the planned actions
+        Remaining = 0
+        Names = set()
+        Renames = []
+        try: entries = list(os.scandir(Path))
+        except OSError as e:
+            THREAD_SAFE_PRINT("Plan Maintenance", f"❌Cannot scan {Path}: {e}", Log_File_Path)
+            return -1
+        for entry in entries:
+            Names.add(entry.name)
+            entry_path = entry.path.replace("\\", "/")
+            if entry.is_dir(follow_symlinks=False):
+                if Path == Folder_Path and entry.name + "/" == MAINTENANCE_FOLDER:
+                    Remaining += 1
+                    continue
+                Left = Scan(entry_path + "/")
+                Action = None
+                for name, Rule in Folder_Rules if Left >= 0 else []:
+                    Action = Rule(entry_path + "/", Left)
+                    if Action:
+                        Plan.append({"Rule": name, "Path": entry_path, "Target": "", **Action})
+                        break
+                if not Action: Remaining += 1
+                continue
+            Action = None
+            for name, Rule in File_Rules:
+                Action = Rule(entry)
+                if Action:
+                    Action = {"Rule": name, "Path": entry_path, "Target": "", **Action}
+                    break
+            if Action and Action["Op"] == "Delete":
+                Plan.append(Action)
+                continue
+            if Action and Action["Op"] == "Rename": Renames.append(Action)
+            Remaining += 1
+        Targets = set()
+        for Action in Renames:
+            if Action["Target"] in Names or Action["Target"] in Targets:
+                THREAD_SAFE_PRINT("Plan Maintenance", f"❌Skip {Action['Path']}: {Action['Target']} already exists", Log_File_Path)
+                continue
+            Targets.add(Action["Target"])
+            Action["Target"] = Path + Action["Target"]
+            Plan.append(Action)
+        return Remaining
+    # Post-order: the actions inside a folder come before the removal of the folder
+    Scan(Folder_Path)
+    return Plan
+
+def Write_JSONL(Records, File_Path):
+    os.makedirs(os.path.dirname(File_Path), exist_ok=True)
+    with open(File_Path, "a", encoding="utf-8") as file:
+        for Record in Records: file.write(json.dumps(Record, ensure_ascii=False) + "\n")
+
+def Read_JSONL(File_Path):
+    with open(File_Path, "r", encoding="utf-8") as file: return [json.loads(line) for line in file if line.strip()]
+
+def Apply_Maintenance(Plan, Folder_Path, Stamp="", Log_File_Path=""):
+    """
+    - Apply a plan of `Plan_Maintenance`, journaling every action as soon as it is done
+    - Deletes are moves into the trash folder of this run
+    - Return {"Done": n, "Failed": n, "Journal": path}
+    """
+    Stamp = Stamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    Journal_Path = f"{Folder_Path}{MAINTENANCE_FOLDER}{Stamp}_Journal.jsonl"
+    Trash_Path = f"{Folder_Path}{MAINTENANCE_FOLDER}Trash/{Stamp}/"
+    Summary = {"Done": 0, "Failed": 0, "Journal": Journal_Path}
+    for Action in Plan:
+        Record = dict(Action, Time=datetime.now().isoformat(timespec="seconds"))
+        try:
+            if Action["Op"] == "Delete":
+                Record["Target"] = Trash_Path + os.path.relpath(Action["Path"], Folder_Path).replace("\\", "/")
+                os.makedirs(os.path.dirname(Record["Target"]), exist_ok=True)
+                os.rename(Action["Path"], Record["Target"])
+            elif Action["Op"] == "Rename":
+                if os.path.exists(Action["Target"]): raise FileExistsError(Action["Target"])
+                os.rename(Action["Path"], Action["Target"])
+            elif Action["Op"] == "Rmdir": os.rmdir(Action["Path"])
+        except OSError as e:
+            THREAD_SAFE_PRINT("Apply Maintenance", f"❌{Action['Op']} {Action['Path']}: {e}", Log_File_Path)
+            Summary["Failed"] += 1
+            continue
+        Write_JSONL([Record], Journal_Path)
+        THREAD_SAFE_PRINT("Apply Maintenance", f"{Action['Op']}: {Action['Path']}" + (f" -> {Record['Target']}" if Record["Target"] else ""), Log_File_Path)
+        Summary["Done"] += 1
+    return Summary
+
+def Run_Maintenance(Folder_Path, Rules=MAINTENANCE_RULES, Dry_Run=False, Log_File_Path=""):
+    """
+    - Plan and apply the selected rules over Folder_Path in one traversal
+    - Dry_Run: nothing is changed, the plan is written to {Folder_Path}.Maintenance/{Stamp}_Plan.jsonl
+    - Return (Plan, Summary)
+    """
+    Stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    Plan = Plan_Maintenance(Folder_Path, Rules, Log_File_Path)
+    Counts = {Op: sum(Action["Op"] == Op for Action in Plan) for Op in ("Delete", "Rename", "Rmdir")}
+    THREAD_SAFE_PRINT("Run Maintenance", f"{Folder_Path} ({','.join(Rules)}): {Counts}", Log_File_Path)
+    if Dry_Run:
+        Plan_Path = f"{Folder_Path}{MAINTENANCE_FOLDER}{Stamp}_Plan.jsonl"
+        if Plan: Write_JSONL(Plan, Plan_Path)
+        for Action in Plan:
+            THREAD_SAFE_PRINT("Run Maintenance", f"[Dry run] {Action['Op']}: {Action['Path']}" + (f" -> {Action['Target']}" if Action["Target"] else ""), Log_File_Path)
+        return Plan, {"Done": 0, "Failed": 0, "Plan": Plan_Path if Plan else ""}
+    Summary = Apply_Maintenance(Plan, Folder_Path, Stamp, Log_File_Path)
+    THREAD_SAFE_PRINT("Run Maintenance", f"Done: {Summary['Done']}, Failed: {Summary['Failed']}, Journal: {Summary['Journal']}", Log_File_Path)
+    return Plan, Summary
+
+def Undo_Maintenance(Journal_Path, Log_File_Path=""):
+    """
+    - Revert the actions of a journal in reverse order (trash -> original path, new name -> old name, recreate folders)
+    - The journal is renamed to *_Undone.jsonl afterwards
+    - Return {"Done": n, "Failed": n}
+    """
+    Summary = {"Done": 0, "Failed": 0}
+    for Record in reversed(Read_JSONL(Journal_Path)):
+        try:
+            if Record["Op"] == "Rmdir": os.makedirs(Record["Path"], exist_ok=True)
+            else:
+                if os.path.exists(Record["Path"]): raise FileExistsError(Record["Path"])
+                os.makedirs(os.path.dirname(Record["Path"]), exist_ok=True)
+                os.rename(Record["Target"], Record["Path"])
+        except OSError as e:
+            THREAD_SAFE_PRINT("Undo Maintenance", f"❌{Record['Op']} {Record['Path']}: {e}", Log_File_Path)
+            Summary["Failed"] += 1
+            continue
+        THREAD_SAFE_PRINT("Undo Maintenance", f"Restored: {Record['Path']}", Log_File_Path)
+        Summary["Done"] += 1
+    if not Summary["Failed"]: os.replace(Journal_Path, Journal_Path.replace("_Journal.jsonl", "_Undone.jsonl"))
+    return Summary
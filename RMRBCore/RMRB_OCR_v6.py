@@ -4,9 +4,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
-from datetime import datetime, timedelta
 import time
 import os
+from RMRBCore.RMRB_Catalog_v6 import Catalog_Sync, Catalog_OCR_Status, Catalog_Record_Sidecar
 from Utils.main import PrintUtils, FileUtils, JsonUtils, TimeUtils, TextUtils
 THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
 Check_Folder = FileUtils.Check_Folder
@@ -24,7 +24,10 @@ def OCR(Pipeline, Image_Path, OCR_Model="Paddeocr_V3", Log_File_Path=""):
     """
     try:
         THREAD_SAFE_PRINT(f"OCR-{OCR_Model}", f"{Image_Path} Generating...", Log_File_Path)
-        result = Pipeline.predict(input=Image_Path) # format like [{}]
+        if Image_Path.endswith(".npy"): # Raw BGR array of `Save_Image`: give the pipeline the array itself
+            import numpy as np # Deferred: only for .npy blocks
+            result = Pipeline.predict(input=np.load(Image_Path)) # format like [{}]
+        else: result = Pipeline.predict(input=Image_Path) # format like [{}]
         time.sleep(2) # have a rest
         result_dict = result[0]
         Content = []
@@ -41,7 +44,7 @@ def OCR(Pipeline, Image_Path, OCR_Model="Paddeocr_V3", Log_File_Path=""):
 
 def Check_OCR_Completion(YEAR, Folder_Path, OCR_Model="Paddeocr_V3", Begin_date="0101", End_date="1231", Log_File_Path=""):
     """
-    - Check OCR completion by checking json file content
+    - Check OCR completion with one catalog query (OCR status of the json files, see `RMRB_Catalog_v6`)
     """
     Complete_Date_List = set()
     Incomplete_Date_List = set()
@@ -50,35 +53,12 @@ def Check_OCR_Completion(YEAR, Folder_Path, OCR_Model="Paddeocr_V3", Begin_date=
     Filter_Path = f"{AD_PATH}{YEAR}_Shape_Dict_Final_Filter_Outlier.json"
     Filter_File_Bool = Check_File(File_Path=Filter_Path, Create_New=False)
     if not Filter_File_Bool: THREAD_SAFE_PRINT("Check OCR Completion", f"{Filter_Path} does not exist! Please run 'Check_Duplicated_Images'", Log_File_Path)
-    Filter_List = JsonFile_to_Dict(filename=Filter_Path, Log_File_Path=Log_File_Path).get("Final_Filter", [])
-    if not Filter_List: THREAD_SAFE_PRINT("Check OCR Completion", f"{Filter_Path} is empty! Please run 'Check_Duplicated_Images'", Log_File_Path)
-    start_date = datetime(int(YEAR), int(Begin_date[:2]), int(Begin_date[2:]))
-    end_date = datetime(int(YEAR), int(End_date[:2]), int(End_date[2:]))
     THREAD_SAFE_PRINT("Check OCR Completion", f"Checking {YEAR} completion...", Log_File_Path)
-    current_date = start_date
-    while current_date <= end_date:
-        MONTH = Format_Num(str(current_date.month))
-        DAY = Format_Num(str(current_date.day))
-        AD_Folder_PATH = AD_PATH + f"{YEAR}{MONTH}{DAY}/"
-        if os.path.exists(AD_Folder_PATH): # Note that the path may not exist
-            for filename in os.listdir(AD_Folder_PATH):
-                file_path = AD_Folder_PATH + filename
-                name = filename.split(".")[0]
-                suffix = filename.split(".")[1]
-                # Check if it is a file (not a directory)
-                if os.path.isfile(file_path) and suffix == "png": # Ensure it is a png file
-                    name_split_list = name.split('_')
-                    # Ensure the image is an ad block or full ad
-                    FAD_BOOL = "FAD" in name_split_list
-                    BLOCK_BOOL = "Block" in name_split_list
-                    FILTER_BOOL = filename in Filter_List
-                    if FAD_BOOL or (BLOCK_BOOL and FILTER_BOOL):
-                        Text_Dict_Path = f"{AD_Folder_PATH}{name}.json"
-                        Check_File(Text_Dict_Path)
-                        Text_Dict = JsonFile_to_Dict(Text_Dict_Path, Log_File_Path=Log_File_Path)
-                        if Text_Dict.get(f"OCR_{OCR_Model}", ""): Complete_Date_List.update({f"{MONTH}{DAY}"})
-                        else: Incomplete_Date_List.update({f"{MONTH}{DAY}"})
-        current_date += timedelta(days=1)
+    # Ad blocks in the final filter list and full ads, from the catalog
+    Catalog_Sync(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path)
+    for Image in Catalog_OCR_Status(YEAR, Folder_Path, OCR_Model, Begin_date, End_date, Log_File_Path):
+        if Image["OCR_Len"]: Complete_Date_List.update({Image["Date"][4:]})
+        else: Incomplete_Date_List.update({Image["Date"][4:]})
     # Convert to sorted list
     Complete_Date_List_Sort = sorted(Complete_Date_List)
     Incomplete_Date_List_Sort = sorted(Incomplete_Date_List)
@@ -98,44 +78,26 @@ def Text_Recognition(YEAR, Folder_Path, Pipeline, OCR_Model="Paddeocr_V3", Begin
     Filter_Path = f"{AD_PATH}{YEAR}_Shape_Dict_Final_Filter_Outlier.json"
     Filter_File_Bool = Check_File(File_Path=Filter_Path, Create_New=False)
     if not Filter_File_Bool: THREAD_SAFE_PRINT("Text Recognition", f"{Filter_Path} does not exist! Please run 'Check_Duplicated_Images'", Log_File_Path)
-    Filter_List = JsonFile_to_Dict(filename=Filter_Path, Log_File_Path=Log_File_Path).get("Final_Filter", [])
-    if not Filter_List: THREAD_SAFE_PRINT("Text Recognition", f"{Filter_Path} is empty! Please run 'Check_Duplicated_Images'", Log_File_Path)
-    start_date = datetime(int(YEAR), int(Begin_date[:2]), int(Begin_date[2:]))
-    end_date = datetime(int(YEAR), int(End_date[:2]), int(End_date[2:]))
     THREAD_SAFE_PRINT("Text Recognition", f"Begin date: {YEAR + Begin_date}, End date: {YEAR + End_date}", Log_File_Path)
-    current_date = start_date
-    while current_date <= end_date:
-        MONTH = Format_Num(str(current_date.month))
-        DAY = Format_Num(str(current_date.day))
-        AD_Folder_PATH = AD_PATH + f"{YEAR}{MONTH}{DAY}/"
-        if os.path.exists(AD_Folder_PATH): # Note that the path may not exist
-            for filename in os.listdir(AD_Folder_PATH):
-                file_path = AD_Folder_PATH + filename
-                name = filename.split(".")[0]
-                suffix = filename.split(".")[1]
-                # Check if it is a file (not a directory)
-                if os.path.isfile(file_path): # Ensure it is a file
-                    if suffix == "png":
-                        name_split_list = name.split('_')
-                        # Ensure the image is an ad block or full ad
-                        FAD_BOOL = "FAD" in name_split_list
-                        BLOCK_BOOL = "Block" in name_split_list
-                        FILTER_BOOL = filename in Filter_List
-                        if FAD_BOOL or (BLOCK_BOOL and FILTER_BOOL):
-                            Text_Dict_Path = f"{AD_Folder_PATH}{name}.json"
-                            Check_File(Text_Dict_Path)
-                            Text_Dict = JsonFile_to_Dict(Text_Dict_Path, Log_File_Path=Log_File_Path)
-                            if not Text_Dict.get(f"OCR_{OCR_Model}", ""): # Avoid repeat generation if it exists.
-                                Success, Content = OCR(
-                                    Pipeline=Pipeline, OCR_Model=OCR_Model, 
-                                    Image_Path=file_path, Log_File_Path=Log_File_Path)
-                                if Success:
-                                    Text_Dict[f"OCR_{OCR_Model}"] = Content
-                                    Text_Dict[f"OCR_{OCR_Model}_Len"] = len(Content)
-                                    Dict_to_JsonFile(Text_Dict, Text_Dict_Path)
-                                    THREAD_SAFE_PRINT("Text Recognition", f"OCR text is stored in {Text_Dict_Path}", Log_File_Path)
-                                else: continue
-        current_date += timedelta(days=1)
+    # Ad blocks in the final filter list and full ads without OCR text, from the catalog
+    Catalog_Sync(YEAR, Folder_Path, Begin_date, End_date, Log_File_Path)
+    for Image in Catalog_OCR_Status(YEAR, Folder_Path, OCR_Model, Begin_date, End_date, Log_File_Path):
+        if Image["OCR_Len"]: continue
+        file_path = Image["Path"]
+        Text_Dict_Path = file_path.rsplit(".", 1)[0] + ".json"
+        Check_File(Text_Dict_Path)
+        Text_Dict = JsonFile_to_Dict(Text_Dict_Path, Log_File_Path=Log_File_Path)
+        if not Text_Dict.get(f"OCR_{OCR_Model}", ""): # Avoid repeat generation if it exists.
+            Success, Content = OCR(
+                Pipeline=Pipeline, OCR_Model=OCR_Model, 
+                Image_Path=file_path, Log_File_Path=Log_File_Path)
+            if Success:
+                Text_Dict[f"OCR_{OCR_Model}"] = Content
+                Text_Dict[f"OCR_{OCR_Model}_Len"] = len(Content)
+                Dict_to_JsonFile(Text_Dict, Text_Dict_Path)
+                THREAD_SAFE_PRINT("Text Recognition", f"OCR text is stored in {Text_Dict_Path}", Log_File_Path)
+            else: continue
+        Catalog_Record_Sidecar(Folder_Path, file_path, Log_File_Path)
 
 if __name__ == "__main__":
     from Config.Config import MAIN_PATH
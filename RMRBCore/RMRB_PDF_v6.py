@@ -4,9 +4,18 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 from PyPDF2 import PdfReader, PdfWriter
-from datetime import timedelta
+from datetime import datetime, timedelta
 import os
+import re
+import csv
+import json
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 # from Config.Config import EXTERNAL_PATH
+from Config.Config import INDEX_FOLDER, PDF_EXPECTED_PAGES, PDF_SPECIAL_DATES, PDF_VALIDATION_WORKERS, PDF_VALIDATION_MIN_JOBS
+from Config.Config import PDF_SPLIT_ENGINE, PDF_SPLIT_WRITERS
+from RMRBCore.RMRB_Index_v6 import Index_Get_Page_Counts, Index_Record_Page_Counts
+from RMRBCore.RMRB_Maintenance_v6 import Run_Maintenance, Plan_Maintenance
 from Utils.main import PrintUtils, FileUtils, JsonUtils, TimeUtils, TextUtils
 THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
 Check_Folder = FileUtils.Check_Folder
@@ -25,29 +34,20 @@ Format_Num = TextUtils.Format_Num
 def Check_Mac(Folder_Path, Delete=False, Log_File_Path=""):
     """
     - Some files are like "20090104-ITCN000793-MAC.pdf", it should be removed
-    - Delete all PDF files ending with "MAC" in the specified folder and all subfolders.
-    """
-    deleted_count = 0
-    error_count = 0
-    # Walk through all directories and files
-    for foldername, _, filenames in os.walk(Folder_Path):
-        for filename in filenames:
-            # Check if file ends with "MAC.pdf" (case-sensitive)
-            if filename.endswith("MAC.pdf"):
-                file_path = os.path.join(foldername, filename).replace("""\\""", "/")
-                try:
-                    if Delete: 
-                        os.remove(file_path)
-                        THREAD_SAFE_PRINT("Check Mac", f"Deleted: {file_path}", Log_File_Path)
-                    else: THREAD_SAFE_PRINT("Check Mac", f"Abnormal: {file_path}", Log_File_Path)
-                    deleted_count += 1
-                except Exception as e:
-                    THREAD_SAFE_PRINT("Check Mac", f"Error deleting {file_path}: {e}", Log_File_Path)
-                    error_count += 1
+    - Delete all PDF files ending with "MAC" in the specified folder and all subfolders (moved to the maintenance trash, see `Run_Maintenance`)
+    - Delete=False: only list them and their count, nothing is written
+    """
+    if not Delete:
+        Plan = Plan_Maintenance(Folder_Path, Rules=["mac"], Log_File_Path=Log_File_Path)
+        for Action in Plan: THREAD_SAFE_PRINT("Check Mac", f"Abnormal: {Action['Path']}", Log_File_Path)
+        THREAD_SAFE_PRINT("Check Mac", f"\nSummary:", Log_File_Path)
+        THREAD_SAFE_PRINT("Check Mac", f"Abnormal: {len(Plan)} files", Log_File_Path)
+        return
+    _, Summary = Run_Maintenance(Folder_Path, Rules=["mac"], Log_File_Path=Log_File_Path)
     # Print summary
     THREAD_SAFE_PRINT("Check Mac", f"\nSummary:", Log_File_Path)
-    THREAD_SAFE_PRINT("Check Mac", f"Successfully deleted: {deleted_count} files", Log_File_Path)
-    THREAD_SAFE_PRINT("Check Mac", f"Errors: {error_count} files", Log_File_Path)
+    THREAD_SAFE_PRINT("Check Mac", f"Successfully deleted: {Summary['Done']} files", Log_File_Path)
+    THREAD_SAFE_PRINT("Check Mac", f"Errors: {Summary['Failed']} files", Log_File_Path)
 
 def Check_PDF_Exist(YEAR, Folder_Path, Begin_date="0101", End_date="1231", Log_File_Path=""):
     """
@@ -55,95 +55,301 @@ def Check_PDF_Exist(YEAR, Folder_Path, Begin_date="0101", End_date="1231", Log_F
     - the PDF pages are 4 (before 2013), 8, 20, 16 (infrequent), 12 (early times), 24, 32 (seldom, 20241216),
     28 (seldom, 20150624), 17 (rare and special, 2016018, version 17 to 20 are in single page; Extreme official missing case: 20200528)
     27 (seldom, 20150717)
+    - Wrapper of `Validate_PDF_Year` (the structured report is also written to {Folder_Path}Index/)
+    - Return the folders of missing, incomplete or corrupt dates
     """
+    Report = Validate_PDF_Year(YEAR, Folder_Path, Begin_date=Begin_date, End_date=End_date, Log_File_Path=Log_File_Path)
     MISSING_PDF = []
-    Special = ["20160128", "20200528", "20150911"] + [str(num) for num in range(20140101, 20140111)]
+    for Entry in Report["Dates"]:
+        if Entry["Status"] == "Missing": THREAD_SAFE_PRINT("Check PDF Exist", f"{Entry['Path']} is not exist.", Log_File_Path)
+        elif Entry["Status"] in ("Incomplete", "Corrupt"):
+            if Entry["Corrupt"]: THREAD_SAFE_PRINT("Check PDF Exist", f"{Entry['Path']} has unreadable PDFs ({Entry['Corrupt']})", Log_File_Path)
+            THREAD_SAFE_PRINT("Check PDF Exist", f"{Entry['Path']} is incomplete ({Entry['Pages']} pages)", Log_File_Path)
+        else: continue
+        MISSING_PDF.append(Entry["Path"])
+    return MISSING_PDF
+
+def Count_PDF_Pages(pdf_path):
+    """
+    - Page count of a PDF on disk
+    - PdfReader seeks in the open file instead of loading the whole file into memory
+    """
+    with open(pdf_path, "rb") as file:
+        return len(PdfReader(file).pages)
+
+STARTXREF_PATTERN = re.compile(rb"startxref\s+(\d+)")
+ROOT_PATTERN = re.compile(rb"/Root\s+(\d+)\s+\d+\s+R")
+PREV_PATTERN = re.compile(rb"/Prev\s+(\d+)")
+PAGES_PATTERN = re.compile(rb"/Pages\s+(\d+)\s+\d+\s+R")
+COUNT_PATTERN = re.compile(rb"/Count\s+(\d+)(\s+\d+\s+R)?")
+OBJECT_PATTERN = re.compile(rb"\s*(\d+)\s+\d+\s+obj")
+PDF_BLOCK_SIZE = 64 * 1024
+
+def Read_XRef_Section(file, Offset):
+    # Classic xref table and trailer at Offset (None for an xref stream)
+    file.seek(Offset)
+    Chunk = b""
+    while b"startxref" not in Chunk:
+        Block = file.read(PDF_BLOCK_SIZE)
+        if not Block: break
+        Chunk += Block
+    if not Chunk.lstrip().startswith(b"xref"): return None
+    Table, _, Trailer = Chunk.partition(b"trailer")
+    Trailer = Trailer.split(b"startxref")[0]
+    Offsets = {}
+    tokens = Table.split()[1:]
+    index = 0
+    while index + 1 < len(tokens):
+        start, count = int(tokens[index]), int(tokens[index + 1])
+        index += 2
+        for number in range(start, start + count):
+            if tokens[index + 2] == b"n": Offsets[number] = int(tokens[index])
+            index += 3
+    return Offsets, Trailer
+
+def Read_Object(file, Offsets, Number):
+    # Body of object `Number` (up to `endobj`), None if it is not in a classic xref table
+    if Number not in Offsets: return None
+    file.seek(Offsets[Number])
+    Chunk = file.read(PDF_BLOCK_SIZE)
+    Header = OBJECT_PATTERN.match(Chunk)
+    if not Header or int(Header.group(1)) != Number: return None
+    return Chunk[Header.end():].split(b"endobj")[0]
+
+def Fast_PDF_Page_Count(pdf_path):
+    """
+    - Page count from metadata only: startxref -> xref table -> /Root -> /Pages -> /Count
+    - Follows the /Prev chain (incremental updates, linearized files); no page object is parsed
+    - Return None when the file needs a full parse (xref streams, indirect /Count, damaged tail)
+    """
+    try:
+        with open(pdf_path, "rb") as file:
+            file.seek(0, os.SEEK_END)
+            Size = file.tell()
+            file.seek(max(0, Size - 1024))
+            Matches = STARTXREF_PATTERN.findall(file.read())
+            if not Matches: return None
+            Offsets, Root, XRef, Seen = {}, None, int(Matches[-1]), set()
+            while XRef is not None and XRef not in Seen and XRef < Size:
+                Seen.add(XRef)
+                Section = Read_XRef_Section(file, XRef)
+                if Section is None: return None
+                for number, offset in Section[0].items(): Offsets.setdefault(number, offset) # Newest section wins
+                Root_Match = ROOT_PATTERN.search(Section[1])
+                if Root is None and Root_Match: Root = int(Root_Match.group(1))
+                Prev = PREV_PATTERN.search(Section[1])
+                XRef = int(Prev.group(1)) if Prev else None
+            if Root is None: return None
+            Catalog = Read_Object(file, Offsets, Root)
+            Pages = PAGES_PATTERN.search(Catalog) if Catalog else None
+            Pages_Tree = Read_Object(file, Offsets, int(Pages.group(1))) if Pages else None
+            Count = COUNT_PATTERN.search(Pages_Tree) if Pages_Tree else None
+            if not Count or Count.group(2) or not int(Count.group(1)): return None
+            return int(Count.group(1))
+    except (OSError, ValueError, IndexError): return None
+
+def Count_Pages_Safe(pdf_path):
+    """
+    - `Fast_PDF_Page_Count`, falling back to `Count_PDF_Pages`
+    - Return (pages, error), pages is 0 for an unreadable PDF
+    """
+    Pages = Fast_PDF_Page_Count(pdf_path)
+    if Pages is not None: return Pages, ""
+    try: return Count_PDF_Pages(pdf_path), ""
+    except Exception as e: return 0, str(e)
+
+def Validate_Date(DATE, PATH, Files, Cached):
+    """
+    - Validation of one date (runs in a worker process for dates with uncached files)
+    - Files: {path: (size, mtime_ns)} of the date's PDFs, None if the folder does not exist
+    - Cached: {path: (size, mtime_ns, pages)} from the page-count index
+    - Return (report entry, new page-count rows, errors)
+    """
+    Entry = {
+        "Date": DATE, "Path": PATH, "Status": "", "Pages": 0, "Files": 0,
+        "Layout_Match": False, "Corrupt": [], "Special": DATE in PDF_SPECIAL_DATES}
+    Rows, Errors = [], {}
+    if Files is None:
+        Entry["Status"] = "Special" if Entry["Special"] else "Missing"
+        return Entry, Rows, Errors
+    for path, (size, mtime_ns) in sorted(Files.items()):
+        Cached_Entry = Cached.get(path)
+        if Cached_Entry and Cached_Entry[:2] == (size, mtime_ns): Pages = Cached_Entry[2]
+        else:
+            Pages, error = Count_Pages_Safe(path)
+            Rows.append((path, size, mtime_ns, Pages))
+            if error: Errors[path] = error
+        if not Pages: Entry["Corrupt"].append(os.path.basename(path))
+        Entry["Pages"] += Pages
+    Entry["Files"] = len(Files)
+    Entry["Layout_Match"] = Entry["Pages"] in PDF_EXPECTED_PAGES
+    if Entry["Special"]: Entry["Status"] = "Special"
+    elif Entry["Corrupt"]: Entry["Status"] = "Corrupt"
+    elif not Entry["Layout_Match"]: Entry["Status"] = "Incomplete"
+    else: Entry["Status"] = "OK"
+    return Entry, Rows, Errors
+
+def Validate_PDF_Year(YEAR, Folder_Path, Begin_date="0101", End_date="1231", Max_Workers=PDF_VALIDATION_WORKERS, Write_Report=True, Log_File_Path=""):
+    """
+    - Year-wide PDF validation with a structured per-date report
+    - One scandir pass lists the PDFs; page counts come from the page-count index (keyed by path, size, mtime)
+    - Dates with new or changed PDFs are validated in a process pool (in-process below `PDF_VALIDATION_MIN_JOBS` files),
+    the parent merges the new page counts into the index
+    - Status per date: OK / Incomplete (pages not in `PDF_EXPECTED_PAGES`) / Corrupt / Missing / Special (`PDF_SPECIAL_DATES`)
+    - Write_Report: write (merge) {Folder_Path}Index/{YEAR}_PDF_Validation.json and .csv
+    - Return {"Year", "Begin_date", "End_date", "Generated", "Summary": {status: count}, "Dates": [entry, ...]}
+    """
     start_date, end_date = Create_Date(YEAR, Begin_date), Create_Date(YEAR, End_date)
+    THREAD_SAFE_PRINT("Validate PDF Year", f"Checking {YEAR} PDF Exist ({Folder_Path})", Log_File_Path)
+    Date_Files = {}
     current_date = start_date
-    THREAD_SAFE_PRINT("Check PDF Exist", f"Checking {YEAR} PDF Exist ({Folder_Path})", Log_File_Path)
     while current_date <= end_date:
-        MONTH = Format_Num(str(current_date.month))
-        DAY = Format_Num(str(current_date.day))
-        DATE = f"{YEAR}{MONTH}{DAY}"
-        PATH = Folder_Path + f"{YEAR}/{YEAR}{MONTH}{DAY}/"
-        if DATE in Special: 
-            current_date += timedelta(days=1)
-            continue
-        if not os.path.exists(PATH): 
-            THREAD_SAFE_PRINT("Check PDF Exist", f"{PATH} is not exist.", Log_File_Path)
-            MISSING_PDF.append(PATH)
-            current_date += timedelta(days=1)
-            continue
-        All_Pages_No = 0
-        # List all files in the folder
-        for filename in os.listdir(PATH):
-            if filename.endswith("pdf"):
-                file_path = PATH + filename
-                with open(file_path, "rb") as file:
-                    PDF = PdfReader(file)
-                    All_Pages_No += len(PDF.pages)
-        if All_Pages_No not in {4, 8, 12, 20, 16, 24, 32, 28}: 
-            THREAD_SAFE_PRINT("Check PDF Exist", f"{PATH} is incomplete ({All_Pages_No} pages)", Log_File_Path)
-            MISSING_PDF.append(PATH)
+        DATE = current_date.strftime("%Y%m%d")
+        PATH = Folder_Path + f"{YEAR}/{DATE}/"
+        Date_Files[DATE] = None
+        if os.path.isdir(PATH):
+            with os.scandir(PATH) as entries:
+                Date_Files[DATE] = {
+                    PATH + entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns)
+                    for entry in entries if entry.name.endswith("pdf")}
         current_date += timedelta(days=1)
-    return MISSING_PDF
+    Cached = Index_Get_Page_Counts(Folder_Path, Folder_Path + f"{YEAR}/", Log_File_Path)
+    Uncached = {
+        DATE for DATE, Files in Date_Files.items() if Files and
+        any(Cached.get(path, ())[:2] != stat for path, stat in Files.items())}
+    Uncached_Files = sum(len(Date_Files[DATE]) for DATE in Uncached)
+    Results = {}
+    if Max_Workers > 1 and Uncached_Files >= PDF_VALIDATION_MIN_JOBS:
+        THREAD_SAFE_PRINT("Validate PDF Year", f"Counting pages of {len(Uncached)} dates in {Max_Workers} processes", Log_File_Path)
+        with ProcessPoolExecutor(max_workers=Max_Workers) as executor:
+            Futures = {
+                DATE: executor.submit(Validate_Date, DATE, Folder_Path + f"{YEAR}/{DATE}/", Date_Files[DATE],
+                {path: Cached[path] for path in Date_Files[DATE] if path in Cached})
+                for DATE in sorted(Uncached)}
+            for DATE, future in Futures.items(): Results[DATE] = future.result()
+    for DATE, Files in Date_Files.items():
+        if DATE not in Results: Results[DATE] = Validate_Date(DATE, Folder_Path + f"{YEAR}/{DATE}/", Files, Cached)
+    Rows = []
+    for DATE in sorted(Results):
+        for path, error in Results[DATE][2].items(): THREAD_SAFE_PRINT("Validate PDF Year", f"❌Corrupt PDF {path} ({error})", Log_File_Path)
+        Rows += Results[DATE][1]
+    Index_Record_Page_Counts(Folder_Path, Rows, Log_File_Path)
+    Dates = [Results[DATE][0] for DATE in sorted(Results)]
+    Summary = {}
+    for Entry in Dates: Summary[Entry["Status"]] = Summary.get(Entry["Status"], 0) + 1
+    Report = {
+        "Year": YEAR, "Begin_date": Begin_date, "End_date": End_date,
+        "Generated": datetime.now().isoformat(timespec="seconds"), "Summary": Summary, "Dates": Dates}
+    THREAD_SAFE_PRINT("Validate PDF Year", f"{YEAR}: {Summary} ({len(Rows)} PDFs counted, {sum(len(Files or {}) for Files in Date_Files.values()) - len(Rows)} from the index)", Log_File_Path)
+    if Write_Report: Write_Validation_Report(Folder_Path, Report, Log_File_Path)
+    return Report
+
+def Write_Validation_Report(Folder_Path, Report, Log_File_Path=""):
+    """
+    - {Folder_Path}Index/{YEAR}_PDF_Validation.json (whole report) and .csv (one row per date)
+    - A partial-range report is merged into the existing year report: its dates replace the old entries, the others are kept
+    """
+    Report_Path = f"{Folder_Path}{INDEX_FOLDER}{Report['Year']}_PDF_Validation"
+    Check_Folder(f"{Folder_Path}{INDEX_FOLDER}", Log_File_Path)
+    try:
+        with open(Report_Path + ".json", "r", encoding="utf-8") as file: Old_Report = json.load(file)
+    except (OSError, ValueError): Old_Report = None
+    if Old_Report and Old_Report.get("Year") == Report["Year"]:
+        Dates = {Entry["Date"]: Entry for Entry in Old_Report["Dates"]}
+        Dates.update({Entry["Date"]: Entry for Entry in Report["Dates"]})
+        Summary = {}
+        for Entry in Dates.values(): Summary[Entry["Status"]] = Summary.get(Entry["Status"], 0) + 1
+        Report = dict(
+            Report, Begin_date=min(Report["Begin_date"], Old_Report["Begin_date"]), End_date=max(Report["End_date"], Old_Report["End_date"]),
+            Summary=Summary, Dates=[Dates[DATE] for DATE in sorted(Dates)])
+    with open(Report_Path + ".json", "w", encoding="utf-8") as file: json.dump(Report, file, ensure_ascii=False, indent=4)
+    with open(Report_Path + ".csv", "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["Date", "Status", "Pages", "Files", "Layout_Match", "Special", "Corrupt", "Path"])
+        writer.writeheader()
+        for Entry in Report["Dates"]: writer.writerow(dict(Entry, Corrupt=";".join(Entry["Corrupt"])))
+    THREAD_SAFE_PRINT("Validate PDF Year", f"Report: {Report_Path}.json / .csv", Log_File_Path)
 
 # Split PDF
-def PDF_Split_All(pdf_path, delete_original=False, Log_File_Path=""):
+def Write_File_Atomic(File_Path, Data):
+    # Write to a temporary file first so a crash never leaves a truncated output
+    with open(File_Path + ".tmp", "wb") as file: file.write(Data)
+    os.replace(File_Path + ".tmp", File_Path)
+
+def Split_PyMuPDF(pdf_path, Pages=None):
     """
+    - One-page documents as bytes for the 0-based page indices `Pages` (default: all pages), PyMuPDF
+    - `insert_pdf` copies the page objects once; garbage collection drops resources the page does not use
+    """
+    import fitz # Deferred: heavy, only needed by this engine
+    Outputs = []
+    with fitz.open(pdf_path) as PDF:
+        for i in (range(PDF.page_count) if Pages is None else Pages):
+            with fitz.open() as Page_PDF:
+                Page_PDF.insert_pdf(PDF, from_page=i, to_page=i)
+                Outputs.append(Page_PDF.tobytes(garbage=3, deflate=True))
+    return Outputs
+
+def Split_PyPDF2(pdf_path, Pages=None):
+    """
+    - One-page documents as bytes for the 0-based page indices `Pages` (default: all pages), PyPDF2
     - Attention: The pages in PyPDF2 start with 0.
     """
+    Outputs = []
+    with open(pdf_path, "rb") as file:
+        PDF = PdfReader(file)
+        for i in (range(len(PDF.pages)) if Pages is None else Pages):
+            pdf_writer = PdfWriter()
+            pdf_writer.add_page(PDF.pages[i])
+            buffer = BytesIO()
+            pdf_writer.write(buffer)
+            Outputs.append(buffer.getvalue())
+    return Outputs
+
+def PDF_Split_To(pdf_path, Output_Prefix, Suffix="pdf", Versions=None, Engine=PDF_SPLIT_ENGINE, Max_Workers=PDF_SPLIT_WRITERS, Log_File_Path=""):
+    """
+    - Split a PDF into one file per page in one pass: {Output_Prefix}{VV}.{Suffix}
+    - pdf_path can be any readable PDF file, e.g. the `.part` file of a download before its rename
+    - Versions: 1-based pages to extract (default: all pages)
+    - Engine: "pymupdf" (fallback to PyPDF2 if PyMuPDF is missing or fails) or "pypdf2"
+    - Pages are serialized in order and written concurrently (each through a temporary file)
+    - Return the output paths in page order
+    """
+    Pages = None if Versions is None else [int(Version) - 1 for Version in Versions]
+    Outputs = None
+    if Engine == "pymupdf":
+        try: Outputs = Split_PyMuPDF(pdf_path, Pages)
+        except Exception as e: THREAD_SAFE_PRINT("PDF Split To", f"PyMuPDF failed on {pdf_path} ({e}), fallback to PyPDF2", Log_File_Path)
+    if Outputs is None: Outputs = Split_PyPDF2(pdf_path, Pages)
+    Output_Paths = [f"{Output_Prefix}{Format_Num(str(i + 1))}.{Suffix}" for i in (range(len(Outputs)) if Pages is None else Pages)]
+    with ThreadPoolExecutor(max_workers=Max_Workers) as executor:
+        list(executor.map(Write_File_Atomic, Output_Paths, Outputs))
+    for PDF_Output in Output_Paths: THREAD_SAFE_PRINT("PDF Split To", f"Output path: {PDF_Output}", Log_File_Path)
+    return Output_Paths
+
+def PDF_Split_All(pdf_path, delete_original=False, Engine=PDF_SPLIT_ENGINE, Log_File_Path=""):
+    """
+    - Split a multi-page PDF next to itself: {YYYYMMDD}.pdf -> {YYYYMMDD}{VV}.pdf (see `PDF_Split_To`)
+    - Single-page PDFs are left unchanged
+    - Return the output paths ([] if nothing was split)
+    """
     base_path = os.path.dirname(pdf_path) + "/"
     filename = os.path.basename(pdf_path)
     file = filename.split(".")[0]
     suffix = filename.split(".")[1]
-    PDF = PdfReader(pdf_path)
-    num_of_pages = len(PDF.pages)
+    num_of_pages = Fast_PDF_Page_Count(pdf_path) or Count_PDF_Pages(pdf_path)
     THREAD_SAFE_PRINT("PDF Split All", f"{pdf_path} with {num_of_pages} pages", Log_File_Path)
-    if num_of_pages > 1:
-        Success = True
-        for i in range(num_of_pages):
-            pdf_writer = PdfWriter()
-            pdf_writer.add_page(PDF.pages[i])
-            version = Format_Num(str(i + 1))
-            PDF_Output = base_path + f"{file}{version}.{suffix}"
-            with open(PDF_Output, "wb") as pdf_output:
-                pdf_writer.write(pdf_output)
-                Success &= True
-                THREAD_SAFE_PRINT("PDF Split All", f"Output path: {PDF_Output}", Log_File_Path)
-        if Success and delete_original: 
-            os.remove(pdf_path)
-            THREAD_SAFE_PRINT("PDF Split All", f"Successfully deleted {pdf_path}", Log_File_Path)
+    if num_of_pages <= 1: return []
+    Output_Paths = PDF_Split_To(pdf_path, base_path + file, Suffix=suffix, Engine=Engine, Log_File_Path=Log_File_Path)
+    if delete_original:
+        os.remove(pdf_path)
+        THREAD_SAFE_PRINT("PDF Split All", f"Successfully deleted {pdf_path}", Log_File_Path)
+    return Output_Paths
 
 def Fix_PDF_Name(Folder_Path, Log_File_Path=""):
     """
-    - Fix error name like 2024010412_12_FAD.png to 20240104_12_FAD.png
-    """
-    for root, _, files in os.walk(Folder_Path):
-        for file in files:
-            if file.lower().endswith('.png') or file.lower().endswith('.json'):
-                file_split_list = file.split("_")
-                filename = file_split_list[0]
-                if len(filename) != 8:
-                    # Extract parts from the matched groups
-                    date_part = filename[:8]  # First 8 digits (YYYYMMDD)
-                    file_split_list.remove(file_split_list[0])
-                    rest = "_".join(file_split_list)       # Everything between the date and extension (e.g., _1_1)
-                    
-                    # Construct the new filename
-                    new_name = f"{date_part}_{rest}"
-                    
-                    # Full paths for the old and new names
-                    old_path = root.replace("\\", "/") + f"/{file}"
-                    new_path = root.replace("\\", "/") + f"/{new_name}"
-                    
-                    # Rename the file if the new name is different
-                    if old_path != new_path:
-                        try:
-                            os.rename(old_path, new_path)
-                            THREAD_SAFE_PRINT("Fix PDF Name", f"Renamed: {old_path} -> {new_path}", Log_File_Path)
-                        except OSError as e:
-                            THREAD_SAFE_PRINT("Fix PDF Name", f"Error renaming {old_path}: {e}", Log_File_Path)
+    - Fix error name like 2024010412_12_FAD.png to 20240104_12_FAD.png (see `Run_Maintenance`)
+    """
+    Run_Maintenance(Folder_Path, Rules=["name"], Log_File_Path=Log_File_Path)
 
 if __name__ == "__main__":
     Check_PDF_Exist(YEAR="2012", Folder_Path="H:/AI_Data/RMRB/")
\ No newline at end of file
@@ -0,0 +1,249 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import shutil
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from Config.Config import EXTERNAL_PATH_LIST, ROOTS_INDEX_ROOT
+from RMRBCore.RMRB_Index_v6 import (
+    INDEX_LOCK, Index_Connect, Index_Path, Index_Downloads, Index_Range, Index_Record, Index_Record_Edition)
+from Utils.main import PrintUtils, FileUtils, TextUtils
+THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
+File_SHA256 = FileUtils.File_SHA256
+Format_Num = TextUtils.Format_Num
+
+# Cross-root content index: every PDF copy of every data root in `EXTERNAL_PATH_LIST`, keyed by SHA-256,
+# kept in the index database of `ROOTS_INDEX_ROOT`; one canonical root per date for the pipeline stages
+ROOTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Root_Copies (
+    Date TEXT NOT NULL,
+    Version TEXT NOT NULL,
+    Root TEXT NOT NULL,
+    Path TEXT NOT NULL,
+    Size INTEGER NOT NULL,
+    Mtime_NS INTEGER NOT NULL,
+    SHA256 TEXT NOT NULL,
+    Pages INTEGER NOT NULL,
+    Updated TEXT NOT NULL,
+    PRIMARY KEY (Date, Version, Root)
+);
+CREATE INDEX IF NOT EXISTS Root_Copies_SHA256 ON Root_Copies (SHA256);
+CREATE TABLE IF NOT EXISTS Canonical_Roots (
+    Date TEXT PRIMARY KEY,
+    Root TEXT NOT NULL,
+    Version_Num INTEGER NOT NULL,  -- versions of the canonical copy
+    Complete INTEGER NOT NULL,     -- 1: every version of the known edition
+    Updated TEXT NOT NULL
+);
+"""
+ROOTS_READY = set()
+
+def Roots_Connect(Log_File_Path=""):
+    with INDEX_LOCK:
+        connection = Index_Connect(ROOTS_INDEX_ROOT, Log_File_Path)
+        if Index_Path(ROOTS_INDEX_ROOT) not in ROOTS_READY:
+            connection.executescript(ROOTS_SCHEMA)
+            ROOTS_READY.add(Index_Path(ROOTS_INDEX_ROOT))
+        return connection
+
+def Available_Roots(Roots=EXTERNAL_PATH_LIST):
+    # Unique roots in priority order, only the mounted ones
+    return [Root for Root in dict.fromkeys(Roots) if os.path.isdir(Root)]
+
+def Scan_Root(Root, Begin_date, End_date, Log_File_Path=""):
+    """
+    - Every {DATE}{VV}.pdf of a root in the date range with its SHA-256 and page count
+    - Hashes come from the root's own download index when size and mtime match; other files are hashed,
+    counted and recorded there as "Local" (unreadable PDFs are skipped)
+    - Return [(DATE, Version, Path, Size, Mtime_NS, SHA256, Pages), ...]
+    """
+    from RMRBCore.RMRB_PDF_v6 import Count_PDF_Pages, Fast_PDF_Page_Count
+    Downloads = Index_Downloads(Root, Begin_date, End_date, Log_File_Path)
+    Rows = []
+    Hashed = 0
+    for YEAR in range(int(Begin_date[:4]), int(End_date[:4]) + 1):
+        Year_Path = Root + f"{YEAR}/"
+        if not os.path.isdir(Year_Path): continue
+        with os.scandir(Year_Path) as Date_Entries:
+            Dates = sorted(entry.name for entry in Date_Entries if entry.is_dir() and len(entry.name) == 8 and Begin_date <= entry.name <= End_date)
+        for DATE in Dates:
+            with os.scandir(Year_Path + DATE) as File_Entries:
+                for entry in File_Entries:
+                    if not (entry.is_file() and len(entry.name) == 14 and entry.name.startswith(DATE) and entry.name.endswith(".pdf")): continue
+                    Version, path, stat = entry.name[8:10], f"{Year_Path}{DATE}/{entry.name}", entry.stat()
+                    Entry = Downloads.get((DATE, Version))
+                    if Entry and (Entry["Size"], Entry["Mtime_NS"]) == (stat.st_size, stat.st_mtime_ns):
+                        Rows.append((DATE, Version, path, stat.st_size, stat.st_mtime_ns, Entry["SHA256"], Entry["Pages"]))
+                        continue
+                    try: Pages = Fast_PDF_Page_Count(path) or Count_PDF_Pages(path)
+                    except Exception as e:
+                        THREAD_SAFE_PRINT("Scan Root", f"❌Corrupt PDF {path} ({e})", Log_File_Path)
+                        continue
+                    SHA256 = File_SHA256(path)
+                    Index_Record(Root, DATE, Version, path, Pages, Entry["Channel"] if Entry else "Local", SHA256=SHA256, Log_File_Path=Log_File_Path)
+                    Rows.append((DATE, Version, path, stat.st_size, stat.st_mtime_ns, SHA256, Pages))
+                    Hashed += 1
+    THREAD_SAFE_PRINT("Scan Root", f"{Root}: {len(Rows)} PDFs ({Hashed} hashed)", Log_File_Path)
+    return Rows
+
+def Build_Roots_Index(Begin_date, End_date, Roots=EXTERNAL_PATH_LIST, Log_File_Path=""):
+    """
+    - Scan every mounted root (one thread per drive) into the cross-root index and choose the canonical root of each date
+    - Canonical: a complete edition first, then a root that already has AD work for the date ({YEAR}_AD/{DATE}/),
+    then the most versions, then the root order of `Roots`
+    - Return {"Roots": [...], "Dates": n, "Duplicated": n, "Conflicts": [(DATE, Version), ...]}
+    """
+    Roots = Available_Roots(Roots)
+    THREAD_SAFE_PRINT("Build Roots Index", f"{Begin_date}-{End_date} over {Roots}", Log_File_Path)
+    with ThreadPoolExecutor(max_workers=max(1, len(Roots))) as executor:
+        Root_Rows = dict(zip(Roots, executor.map(lambda Root: Scan_Root(Root, Begin_date, End_date, Log_File_Path), Roots)))
+    Editions = {}
+    for Root in Roots:
+        for DATE, Version_Num in Index_Range(Root, Begin_date, End_date, Log_File_Path)[0].items():
+            Editions[DATE] = max(Editions.get(DATE, 0), Version_Num)
+    Now = datetime.now().isoformat(timespec="seconds")
+    Copies = {}
+    with INDEX_LOCK:
+        connection = Roots_Connect(Log_File_Path)
+        for Root, Rows in Root_Rows.items():
+            connection.execute("DELETE FROM Root_Copies WHERE Root = ? AND Date BETWEEN ? AND ?", (Root, Begin_date, End_date))
+            connection.executemany("INSERT INTO Root_Copies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [(Row[0], Row[1], Root) + Row[2:] + (Now,) for Row in Rows])
+            for Row in Rows: Copies.setdefault(Row[0], {}).setdefault(Root, {})[Row[1]] = Row[5]
+        Report = {"Roots": Roots, "Dates": len(Copies), "Duplicated": 0, "Conflicts": []}
+        Canonical = []
+        for DATE, Root_Versions in sorted(Copies.items()):
+            if len(Root_Versions) > 1: Report["Duplicated"] += 1
+            for Version in sorted(set().union(*Root_Versions.values())):
+                if len({Versions[Version] for Versions in Root_Versions.values() if Version in Versions}) > 1: Report["Conflicts"].append((DATE, Version))
+            def Rank(Root):
+                Versions = Root_Versions[Root]
+                Complete = DATE in Editions and all(Format_Num(Version) in Versions for Version in range(1, Editions[DATE] + 1))
+                return (Complete, os.path.isdir(f"{Root}{DATE[:4]}_AD/{DATE}/"), len(Versions), -Roots.index(Root))
+            Best = max(Root_Versions, key=Rank)
+            Canonical.append((DATE, Best, len(Root_Versions[Best]), int(Rank(Best)[0]), Now))
+        connection.execute("DELETE FROM Canonical_Roots WHERE Date BETWEEN ? AND ?", (Begin_date, End_date))
+        connection.executemany("INSERT INTO Canonical_Roots VALUES (?, ?, ?, ?, ?)", Canonical)
+        connection.commit()
+    for DATE, Version in Report["Conflicts"]: THREAD_SAFE_PRINT("Build Roots Index", f"❌Conflict: {DATE}{Version} differs between roots", Log_File_Path)
+    THREAD_SAFE_PRINT("Build Roots Index", f"{Report['Dates']} dates, {Report['Duplicated']} on several roots, {len(Report['Conflicts'])} conflicts", Log_File_Path)
+    return Report
+
+def Resolve_Date(DATE, Log_File_Path=""):
+    """
+    - Canonical root of DATE, or None if the date is not in the cross-root index
+    """
+    if not os.path.isfile(Index_Path(ROOTS_INDEX_ROOT)): return None
+    with INDEX_LOCK:
+        row = Roots_Connect(Log_File_Path).execute("SELECT Root FROM Canonical_Roots WHERE Date = ?", (DATE,)).fetchone()
+    return row["Root"] if row else None
+
+def Canonical_Dates(YEAR, Root, Begin_date="0101", End_date="1231", Log_File_Path=""):
+    """
+    - Dates of the range whose canonical copy is on Root, sorted ([] before the first `Build_Roots_Index`)
+    """
+    if not os.path.isfile(Index_Path(ROOTS_INDEX_ROOT)):
+        THREAD_SAFE_PRINT("Canonical Dates", f"❌No cross-root index in {ROOTS_INDEX_ROOT}, run `RMRB_CLI.py roots index` first", Log_File_Path)
+        return []
+    with INDEX_LOCK:
+        return [row["Date"] for row in Roots_Connect(Log_File_Path).execute(
+            "SELECT Date FROM Canonical_Roots WHERE Root = ? AND Date BETWEEN ? AND ? ORDER BY Date", (Root, YEAR + Begin_date, YEAR + End_date))]
+
+def Date_Runs(Dates):
+    """
+    - Consecutive dates as (Begin_date, End_date) runs of MMDD, e.g. ["20240101", "20240102", "20240105"] -> [("0101", "0102"), ("0105", "0105")]
+    """
+    Runs = []
+    for DATE in Dates:
+        if Runs and datetime.strptime(DATE, "%Y%m%d") - datetime.strptime(DATE[:4] + Runs[-1][1], "%Y%m%d") == timedelta(days=1): Runs[-1][1] = DATE[4:]
+        else: Runs.append([DATE[4:], DATE[4:]])
+    return [tuple(Run) for Run in Runs]
+
+def Copy_PDF(Source, Target_Root, DATE, Version, SHA256, Pages, Log_File_Path=""):
+    """
+    - Copy one verified PDF into {Target_Root}{YEAR}/{DATE}/ (through a .part file, SHA-256 checked) and index it there
+    """
+    Target = f"{Target_Root}{DATE[:4]}/{DATE}/{DATE}{Version}.pdf"
+    os.makedirs(os.path.dirname(Target), exist_ok=True)
+    shutil.copy2(Source, Target + ".part")
+    if File_SHA256(Target + ".part") != SHA256:
+        os.remove(Target + ".part")
+        THREAD_SAFE_PRINT("Copy PDF", f"❌{Source} changed since it was indexed, skipped", Log_File_Path)
+        return False
+    os.replace(Target + ".part", Target)
+    Index_Record(Target_Root, DATE, Version, Target, Pages, "Local", SHA256=SHA256, Log_File_Path=Log_File_Path)
+    stat = os.stat(Target)
+    with INDEX_LOCK:
+        connection = Roots_Connect(Log_File_Path)
+        connection.execute(
+            "INSERT OR REPLACE INTO Root_Copies VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (DATE, Version, Target_Root, Target, stat.st_size, stat.st_mtime_ns, SHA256, Pages, datetime.now().isoformat(timespec="seconds")))
+        connection.commit()
+    THREAD_SAFE_PRINT("Copy PDF", f"✅{Source} -> {Target}", Log_File_Path)
+    return True
+
+def Fill_From_Roots(Missing, Target_Root, Log_File_Path=""):
+    """
+    - Fill missing PDFs of Target_Root (see `Scan_Missing`) from copies on other mounted roots instead of downloading them
+    - A whole missing date (None) is only taken from a complete canonical copy
+    - Return the part of Missing that is still missing
+    """
+    if not Missing or not os.path.isfile(Index_Path(ROOTS_INDEX_ROOT)): return Missing # No cross-root index built yet
+    with INDEX_LOCK:
+        connection = Roots_Connect(Log_File_Path)
+        Rows = connection.execute(
+            "SELECT Root_Copies.*, Canonical_Roots.Root = Root_Copies.Root AND Canonical_Roots.Complete AS Complete FROM Root_Copies "
+            "LEFT JOIN Canonical_Roots ON Canonical_Roots.Date = Root_Copies.Date WHERE Root_Copies.Date BETWEEN ? AND ? AND Root_Copies.Root != ?",
+            (min(Missing), max(Missing), Target_Root)).fetchall()
+    Sources = {}
+    for row in Rows:
+        if row["Date"] in Missing and os.path.isfile(row["Path"]) and os.path.getsize(row["Path"]) == row["Size"]:
+            Sources.setdefault(row["Date"], {}).setdefault(row["Version"], dict(row))
+            if row["Complete"]: Sources[row["Date"]][row["Version"]] = dict(row)
+    Remaining = {}
+    Copied = 0
+    for DATE, Versions in Missing.items():
+        Available = Sources.get(DATE, {})
+        if Versions is None:
+            Complete = [Copy for Copy in Available.values() if Copy["Complete"]]
+            if not Complete:
+                Remaining[DATE] = None
+                continue
+            Root = Complete[0]["Root"]
+            Versions = sorted(Version for Version, Copy in Available.items() if Copy["Root"] == Root)
+            Index_Record_Edition(Target_Root, DATE, len(Versions), "Local", Log_File_Path=Log_File_Path)
+        Left = []
+        for Version in Versions:
+            Copy = Available.get(Version)
+            if Copy and Copy_PDF(Copy["Path"], Target_Root, DATE, Version, Copy["SHA256"], Copy["Pages"], Log_File_Path): Copied += 1
+            else: Left.append(Version)
+        if Left: Remaining[DATE] = Left
+    if Copied: THREAD_SAFE_PRINT("Fill From Roots", f"{Copied} PDFs copied from other roots, {len(Remaining)} dates left to download", Log_File_Path)
+    return Remaining
+
+def Merge_Roots(Target_Root, Begin_date, End_date, Dry_Run=False, Log_File_Path=""):
+    """
+    - Merge tool: give Target_Root every PDF of the range that exists on another root (see `Build_Roots_Index`)
+    - Versions whose copy on Target_Root has a different hash are conflicts: reported, never overwritten
+    - Dry_Run: only report what would be copied
+    - Return {"Copied": n, "Planned": [(DATE, Version, Source), ...], "Conflicts": [(DATE, Version), ...]}
+    """
+    with INDEX_LOCK:
+        Rows = Roots_Connect(Log_File_Path).execute(
+            "SELECT * FROM Root_Copies WHERE Date BETWEEN ? AND ? ORDER BY Date, Version", (Begin_date, End_date)).fetchall()
+    Copies = {}
+    for row in Rows: Copies.setdefault((row["Date"], row["Version"]), {})[row["Root"]] = dict(row)
+    Summary = {"Copied": 0, "Planned": [], "Conflicts": []}
+    for (DATE, Version), Root_Copies in Copies.items():
+        Sources = [Copy for Root, Copy in Root_Copies.items() if Root != Target_Root and os.path.isfile(Copy["Path"])]
+        if not Sources: continue
+        if Target_Root in Root_Copies:
+            if any(Copy["SHA256"] != Root_Copies[Target_Root]["SHA256"] for Copy in Sources): Summary["Conflicts"].append((DATE, Version))
+            continue
+        Summary["Planned"].append((DATE, Version, Sources[0]["Path"]))
+        if Dry_Run: THREAD_SAFE_PRINT("Merge Roots", f"[Dry run] {Sources[0]['Path']} -> {Target_Root}", Log_File_Path)
+        elif Copy_PDF(Sources[0]["Path"], Target_Root, DATE, Version, Sources[0]["SHA256"], Sources[0]["Pages"], Log_File_Path): Summary["Copied"] += 1
+    for DATE, Version in Summary["Conflicts"]: THREAD_SAFE_PRINT("Merge Roots", f"❌Conflict: {DATE}{Version} on {Target_Root} differs from other roots", Log_File_Path)
+    THREAD_SAFE_PRINT("Merge Roots", f"{Target_Root}: {len(Summary['Planned'])} planned, {Summary['Copied']} copied, {len(Summary['Conflicts'])} conflicts", Log_File_Path)
+    return Summary
@@ -0,0 +1,108 @@
+import os
+import sys
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import json
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from Config.Config import INDEX_FOLDER, PAGE_TEXT_BACKEND, PAGE_TEXT_WORKERS, PAGE_TEXT_MIN_JOBS
+from Utils.main import PrintUtils, FileUtils, TimeUtils
+THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
+Check_Folder = FileUtils.Check_Folder
+Create_Date = TimeUtils.Create_Date
+
+# Page-level text layer cache: the first-page text of every PDF of a year, extracted once
+# {Folder_Path}Index/{YEAR}_Page_Text.json is columnar: {"Date": [...], "Version": [...], "Size": [...], "Mtime_NS": [...], "Backend": [...], "Text": [...]}
+# Version is the file name after the date ("01", or "" for a whole-day PDF); an entry is valid while size and mtime match the file
+COLUMNS = ["Date", "Version", "Size", "Mtime_NS", "Backend", "Text"]
+
+def Page_Text_Path(Folder_Path, YEAR):
+    return f"{Folder_Path}{INDEX_FOLDER}{YEAR}_Page_Text.json"
+
+def Extract_Page_Text(File_Path, Backend=PAGE_TEXT_BACKEND):
+    """
+    - Text of the first page: pdfplumber `extract_text`, or PyMuPDF `get_text` (reading order) if Backend is "pymupdf"
+    (pdfplumber if PyMuPDF fails)
+    - Return (Text, Backend used)
+    """
+    if Backend == "pymupdf":
+        try:
+            import fitz # Deferred: heavy
+            with fitz.open(File_Path) as PDF: return PDF.load_page(0).get_text(sort=True), "pymupdf"
+        except Exception: pass
+    import pdfplumber # Deferred: slow fallback only
+    with pdfplumber.open(File_Path) as PDF: return PDF.pages[0].extract_text() or "", "pdfplumber"
+
+def Extract_Page_Text_Safe(File_Path, Backend=PAGE_TEXT_BACKEND):
+    # Worker of the process pool: never raises, (Text, Backend) or (None, error)
+    try: return Extract_Page_Text(File_Path, Backend)
+    except Exception as e: return None, str(e)
+
+def Load_Page_Text(Folder_Path, YEAR, Log_File_Path=""):
+    """
+    - Return {(DATE, Version): (Size, Mtime_NS, Backend, Text)} from the year file ({} if there is none)
+    """
+    Path = Page_Text_Path(Folder_Path, YEAR)
+    if not os.path.isfile(Path): return {}
+    try:
+        with open(Path, "r", encoding="utf-8") as file: Columns = json.load(file)
+    except (OSError, ValueError) as e:
+        THREAD_SAFE_PRINT("Page Text", f"❌Unreadable {Path} ({e}), rebuilding", Log_File_Path)
+        return {}
+    return {
+        (DATE, Version): (Size, Mtime_NS, Backend, Text)
+        for DATE, Version, Size, Mtime_NS, Backend, Text in zip(*(Columns[Column] for Column in COLUMNS))}
+
+def Save_Page_Text(Folder_Path, YEAR, Store, Log_File_Path=""):
+    """
+    - Write the store as columns, sorted by date and version (atomic replace)
+    """
+    Path = Page_Text_Path(Folder_Path, YEAR)
+    Check_Folder(os.path.dirname(Path) + "/", Log_File_Path)
+    Keys = sorted(Store)
+    Columns = {"Date": [DATE for DATE, _ in Keys], "Version": [Version for _, Version in Keys]}
+    for index, Column in enumerate(COLUMNS[2:]): Columns[Column] = [Store[Key][index] for Key in Keys]
+    with open(Path + ".tmp", "w", encoding="utf-8") as file: json.dump(Columns, file, ensure_ascii=False)
+    os.replace(Path + ".tmp", Path)
+
+def Page_Texts(YEAR, Folder_Path, Begin_date="0101", End_date="1231", Backend=PAGE_TEXT_BACKEND, Max_Workers=PAGE_TEXT_WORKERS, Log_File_Path=""):
+    """
+    - First-page text of every PDF in {Folder_Path}{YEAR}/{DATE}/ for the date range, served from the year cache
+    - New or changed PDFs (size/mtime) and entries of another backend are extracted (in a process pool
+    from `PAGE_TEXT_MIN_JOBS` files on) and written back once
+    - Return {(DATE, Version): Text}; unreadable PDFs are left out
+    """
+    Store = Load_Page_Text(Folder_Path, YEAR, Log_File_Path)
+    start_date, end_date = Create_Date(YEAR, Begin_date), Create_Date(YEAR, End_date)
+    Files = {}
+    current_date = start_date
+    while current_date <= end_date:
+        DATE = current_date.strftime("%Y%m%d")
+        PATH = Folder_Path + f"{YEAR}/{DATE}/"
+        if os.path.isdir(PATH):
+            with os.scandir(PATH) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".pdf"):
+                        stat = entry.stat()
+                        Files[(DATE, entry.name[8:-4])] = (PATH + entry.name, stat.st_size, stat.st_mtime_ns)
+        current_date += timedelta(days=1)
+    Missing = [
+        Key for Key, (_, Size, Mtime_NS) in Files.items()
+        if Store.get(Key, ())[:2] != (Size, Mtime_NS) or Store[Key][2] not in (Backend, "pdfplumber")]
+    if Missing:
+        Paths = [Files[Key][0] for Key in Missing]
+        if Max_Workers > 1 and len(Missing) >= PAGE_TEXT_MIN_JOBS:
+            THREAD_SAFE_PRINT("Page Text", f"Extracting {len(Missing)} pages in {Max_Workers} processes", Log_File_Path)
+            with ProcessPoolExecutor(max_workers=Max_Workers) as executor:
+                Results = list(executor.map(Extract_Page_Text_Safe, Paths, [Backend] * len(Paths), chunksize=16))
+        else: Results = [Extract_Page_Text_Safe(path, Backend) for path in Paths]
+        for Key, path, (Text, Used) in zip(Missing, Paths, Results):
+            if Text is None:
+                THREAD_SAFE_PRINT("Page Text", f"❌Corrupt PDF {path} ({Used})", Log_File_Path)
+                Store.pop(Key, None)
+                continue
+            Store[Key] = (Files[Key][1], Files[Key][2], Used, Text)
+        Save_Page_Text(Folder_Path, YEAR, Store, Log_File_Path)
+    THREAD_SAFE_PRINT("Page Text", f"{YEAR}{Begin_date}-{YEAR}{End_date}: {len(Files)} pages, {len(Missing)} extracted", Log_File_Path)
+    return {Key: Store[Key][3] for Key in Files if Key in Store}
@@ -22,6 +22,10 @@ Sleeping = InputUtils.Sleeping
 Choose_Date = InputUtils.Choose_Date
 
 if __name__ == "__main__":
+    # Non-interactive: python RMRB_AD_Image_Generator.py [--root PATH|N] {image,block,shape} --years 2024 [--engine new|old] (see RMRB_CLI.py)
+    if len(sys.argv) > 1:
+        from RMRB_CLI import main
+        sys.exit(main(Command="ad"))
     # Choose external path
     EXTERNAL_MSG = "Choose the external path.\n"
     EXTERNAL_PATH_CHOICE_DICT = {}
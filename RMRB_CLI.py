@@ -0,0 +1,336 @@
+"""
+Unified non-interactive command line for the RMRB pipeline (no `input()`, suitable for schedulers)
+
+Usage:
+    python RMRB_CLI.py [--root PATH|N] [--sleep S] <command> [options]
+
+    download  --begin YYYYMMDD --end YYYYMMDD [--workers N] [--refresh]   # Download PDFs of a date range
+    gap-fill  [--begin YYYYMMDD] [--end YYYYMMDD] [--workers N]           # Fill missing PDFs, most recent first
+    check     --begin YYYYMMDD --end YYYYMMDD                             # List dates with missing PDFs
+    tools     {mac,format,exist,split,fix-name} --years 2024[-2025]       # PDF tools (see RMRB_PDFTools.py)
+    maintain  --years 2024 [--rules mac,name,prune] [--dry-run]           # One-pass cleanup of {YEAR}/ and {YEAR}_AD/
+    undo      --journal PATH                                              # Revert a maintenance run from its journal
+    catalog   --years 2024 [--begin MMDD --end MMDD]                      # Rescan {YEAR}_AD/ into the catalog
+    roots     {index,merge} --begin YYYYMMDD --end YYYYMMDD [--dry-run]   # Cross-root copy index / merge into --root
+    ad        {image,block,shape} --years 2024 [--begin MMDD --end MMDD] [--engine new|old] [--detect cv|vector]
+    ocr       --years 2024 [--begin MMDD --end MMDD]
+    llm       --years 2024 --threshold N
+    pipeline  --years 2020-2024 --stages image,block,shape,ocr,llm [--threshold N]
+
+- --root: data root, or its number (1-based) in `EXTERNAL_PATH_LIST` (default: 1)
+- --years: "2024", "2020-2024" or "2020,2022"; with --workers N > 1, years run in N parallel processes
+- --canonical-only (ad/ocr/llm/pipeline): only the dates whose canonical copy is on --root (see `roots index`)
+- Heavy stacks (paddleocr, genai, cv2/fitz) are only imported by the command that needs them
+"""
+import os
+import sys
+# Get the folder where THIS script is running
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Add that folder to the system path
+if script_dir not in sys.path:
+    sys.path.append(script_dir)
+
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from Config.Config import EXTERNAL_PATH_LIST, DOWNLOAD_MAX_WORKERS
+from Utils.main import PrintUtils, FileUtils, TimeUtils
+THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
+Check_Folder = FileUtils.Check_Folder
+Check_File = FileUtils.Check_File
+NowTime = TimeUtils.NowTime
+
+STAGES = ["image", "block", "shape", "ocr", "llm"]
+# Built once per process on first use
+OCR_PIPELINE = None
+ALL_MODELS = None
+
+def Parse_Root(Root):
+    # Data root path, or its number in EXTERNAL_PATH_LIST
+    if Root.isdigit() and 1 <= int(Root) <= len(EXTERNAL_PATH_LIST): return EXTERNAL_PATH_LIST[int(Root) - 1]
+    Root = Root.replace("\\", "/")
+    return Root if Root.endswith("/") else Root + "/"
+
+def Parse_Years(Years):
+    # "2024" / "2020-2024" / "2020,2022" -> ["2020", ...]
+    Result = []
+    for part in Years.split(","):
+        if "-" in part:
+            begin, end = part.split("-")
+            Result += [str(YEAR) for YEAR in range(int(begin), int(end) + 1)]
+        elif part: Result.append(part)
+    for YEAR in Result:
+        if not (len(YEAR) == 4 and YEAR.isdigit()): raise argparse.ArgumentTypeError(f"Incorrect year: {YEAR}")
+    return Result
+
+def Parse_Date(Length):
+    def Parse(DATE):
+        if not (len(DATE) == Length and DATE.isdigit()): raise argparse.ArgumentTypeError(f"Date must have {Length} digits: {DATE}")
+        return DATE
+    return Parse
+
+def Parse_Workers(Workers):
+    # Worker count, at least 1
+    if not Workers.isdigit() or int(Workers) < 1: raise argparse.ArgumentTypeError(f"Workers must be an integer >= 1: {Workers}")
+    return int(Workers)
+
+def Parse_Stages(Stages):
+    # "image,ocr" -> stages in pipeline order; unknown names are rejected
+    Names = [Stage.strip() for Stage in Stages.split(",") if Stage.strip()]
+    Unknown = [Stage for Stage in Names if Stage not in STAGES]
+    if Unknown: raise argparse.ArgumentTypeError(f"Unknown stage: {','.join(Unknown)} (choose from {','.join(STAGES)})")
+    if not Names: raise argparse.ArgumentTypeError("No stage given")
+    return [Stage for Stage in STAGES if Stage in Names]
+
+def Get_OCR_Pipeline():
+    global OCR_PIPELINE
+    if OCR_PIPELINE is None:
+        from RMRB_OCR import PPStructureV3_Pipeline # paddleocr
+        from Config.Config import MODEL_PATH
+        OCR_PIPELINE = PPStructureV3_Pipeline(Model_Path=MODEL_PATH)
+    return OCR_PIPELINE
+
+def Get_LLM_Models(Root, Log_File_Path=""):
+    # (All_Models, API usage file of this process)
+    global ALL_MODELS
+    if ALL_MODELS is None:
+        from RMRBCore.RMRB_LLM_v6 import Get_All_Models # genai
+        API_Usage_Path = Root + "Log/API-Usage/"
+        API_Usage_File = API_Usage_Path + "Success-Fail-Num-" + NowTime(LogFormat=True) + f"-{os.getpid()}.json"
+        Check_File(File_Path=API_Usage_File, Json_Bool=False)
+        ALL_MODELS = (Get_All_Models(API_Usage_Path=API_Usage_Path, Log_File_Path=Log_File_Path), API_Usage_File)
+    return ALL_MODELS
+
+def Year_Exists(Root, YEAR, AD=False, Log_File_Path=""):
+    Path = f"{Root}{YEAR}_AD" if AD else f"{Root}{YEAR}"
+    if os.path.exists(Path): return True
+    THREAD_SAFE_PRINT("RMRB CLI", f"❌❌❌Inexist year ({Path})", Log_File_Path)
+    return False
+
+# Commands over a date range
+def Run_Download(args, Log_File_Path):
+    from RMRBCore.RMRB_Downloader_v2 import RMRB_PDF_Downloader_Concurrent
+    Result = RMRB_PDF_Downloader_Concurrent(args.begin, args.end, args.root, Max_Workers=args.workers, Refresh=args.refresh, Log_File_Path=Log_File_Path)
+    return 1 if Result["Failed"] else 0
+
+def Run_Gap_Fill(args, Log_File_Path):
+    from RMRBCore.RMRB_Downloader_v2 import RMRB_Gap_Fill
+    Result = RMRB_Gap_Fill(args.begin, args.end, args.root, Max_Workers=args.workers, Refresh=args.refresh, Log_File_Path=Log_File_Path)
+    return 1 if Result["Failed"] else 0
+
+def Run_Check(args, Log_File_Path):
+    from RMRBCore.RMRB_Downloader_v2 import Check_RMRB_Exist
+    Missing_Dates = Check_RMRB_Exist(args.begin, args.end, args.root, Log_File_Path=Log_File_Path)
+    for DATE in Missing_Dates: THREAD_SAFE_PRINT("RMRB CLI", DATE, Log_File_Path)
+    return 1 if Missing_Dates else 0
+
+# Commands over years (module-level so they can run in worker processes)
+def Tools_Year(YEAR, args, Log_File_Path):
+    if args.tool == "fix-name":
+        if not Year_Exists(args.root, YEAR, AD=True, Log_File_Path=Log_File_Path): return
+        from RMRBCore.RMRB_PDF_v6 import Fix_PDF_Name
+        Fix_PDF_Name(Folder_Path=f"{args.root}{YEAR}_AD/", Log_File_Path=Log_File_Path)
+        return
+    if not Year_Exists(args.root, YEAR, Log_File_Path=Log_File_Path): return
+    Folder_Path = args.root + YEAR + "/"
+    if args.tool == "mac":
+        from RMRBCore.RMRB_PDF_v6 import Check_Mac
+        Check_Mac(Folder_Path=Folder_Path, Delete=True, Log_File_Path=Log_File_Path)
+    elif args.tool == "format":
+        from RMRB_PDFTools import Folder_Formatter
+        Folder_Formatter(YEAR=YEAR, Folder_Path=args.root, Log_File_Path=Log_File_Path)
+    elif args.tool == "exist":
+        from RMRBCore.RMRB_PDF_v6 import Check_PDF_Exist
+        Check_PDF_Exist(YEAR=YEAR, Folder_Path=args.root, Begin_date=args.begin, End_date=args.end, Log_File_Path=Log_File_Path)
+    elif args.tool == "split":
+        from RMRB_PDFTools import PDF_Splitter
+        PDF_Splitter(Folder_Path=Folder_Path, Delete_Original=True, Log_File_Path=Log_File_Path)
+
+def Maintain_Year(YEAR, args, Log_File_Path):
+    from RMRBCore.RMRB_Maintenance_v6 import Run_Maintenance
+    for Folder_Path in (f"{args.root}{YEAR}/", f"{args.root}{YEAR}_AD/"):
+        if os.path.exists(Folder_Path): Run_Maintenance(Folder_Path, Rules=args.rules, Dry_Run=args.dry_run, Log_File_Path=Log_File_Path)
+
+def Catalog_Year(YEAR, args, Log_File_Path):
+    from RMRBCore.RMRB_Catalog_v6 import Catalog_Sync
+    if Year_Exists(args.root, YEAR, AD=True, Log_File_Path=Log_File_Path): Catalog_Sync(YEAR, args.root, args.begin, args.end, Log_File_Path)
+
+def Stages_Year(YEAR, args, Log_File_Path):
+    # AD image -> AD block -> shape/duplicate filter -> OCR -> LLM, for the selected stages; 1 if AD image days failed
+    if args.canonical_only:
+        # Range stages per run of consecutive dates whose canonical copy is on this root; the year-level shape step once
+        from RMRBCore.RMRB_Roots_v6 import Canonical_Dates, Date_Runs
+        Runs = Date_Runs(Canonical_Dates(YEAR, args.root, args.begin, args.end, Log_File_Path))
+        Status = 0
+        for Stages in ([Stage for Stage in args.stages if Stage in ("image", "block")], ["shape"], [Stage for Stage in args.stages if Stage in ("ocr", "llm")]):
+            if not Stages or not set(Stages) <= set(args.stages) or not Runs: continue
+            for Begin_date, End_date in (Runs if Stages != ["shape"] else [(args.begin, args.end)]):
+                Status |= Stages_Year(YEAR, argparse.Namespace(**dict(vars(args), stages=Stages, begin=Begin_date, end=End_date, canonical_only=False)), Log_File_Path)
+        return Status
+    Status = 0
+    for Stage in args.stages:
+        if Stage == "image":
+            if not Year_Exists(args.root, YEAR, Log_File_Path=Log_File_Path): return Status
+            from RMRBCore.RMRB_AD_v6 import Genetare_AD_Image, Genetare_AD_Image_New
+            Generator = Genetare_AD_Image_New if args.engine == "new" else Genetare_AD_Image
+            Options = {"Detect_Engine": args.detect} if args.engine == "new" and args.detect else {}
+            if Generator(YEAR=YEAR, Folder_Path=args.root, Begin_date=args.begin, End_date=args.end, Log_File_Path=Log_File_Path, **Options): Status = 1
+            continue
+        if not Year_Exists(args.root, YEAR, AD=True, Log_File_Path=Log_File_Path): return Status
+        if Stage == "block":
+            from Config.Config import AD_SINGLE_PASS
+            if "image" in args.stages and args.engine == "new" and AD_SINGLE_PASS:
+                THREAD_SAFE_PRINT("RMRB CLI", f"{YEAR}: blocks already clipped by the image stage (AD_SINGLE_PASS)", Log_File_Path)
+                continue
+            from RMRBCore.RMRB_AD_v6 import Extract_AD_Block
+            Extract_AD_Block(YEAR=YEAR, Folder_Path=args.root, Begin_date=args.begin, End_date=args.end, Log_File_Path=Log_File_Path)
+        elif Stage == "shape":
+            from RMRBCore.RMRB_AD_v6 import AD_Shape_Analysis, Check_Duplicated_Images
+            AD_Shape_Analysis(YEAR=YEAR, Folder_Path=args.root, IS_CMD=True, Log_File_Path=Log_File_Path)
+            Check_Duplicated_Images(YEAR=YEAR, Folder_Path=args.root, IS_CMD=True, Log_File_Path=Log_File_Path)
+        elif Stage == "ocr":
+            from RMRBCore.RMRB_OCR_v6 import Text_Recognition, Check_OCR_Completion
+            Complete = Check_OCR_Completion(YEAR=YEAR, Folder_Path=args.root, Begin_date=args.begin, End_date=args.end, Log_File_Path=Log_File_Path)
+            if not Complete:
+                Text_Recognition(YEAR=YEAR, Folder_Path=args.root, Pipeline=Get_OCR_Pipeline(), Begin_date=args.begin, End_date=args.end, Log_File_Path=Log_File_Path)
+        elif Stage == "llm":
+            from RMRBCore.RMRB_LLM_v6 import Check_Summary_Completion, Text_Summary
+            All_Models, API_Usage_File = Get_LLM_Models(args.root, Log_File_Path)
+            Complete, Number_Dict = Check_Summary_Completion(YEAR=YEAR, Folder_Path=args.root, Begin_date=args.begin, End_date=args.end, Threshold_Num=args.threshold, Log_File_Path=Log_File_Path)
+            if not Complete:
+                Text_Summary(
+                    YEAR=YEAR, Folder_Path=args.root, All_Models=All_Models, API_Usage_File_Path=API_Usage_File,
+                    Begin_date=args.begin, End_date=args.end,
+                    All_Num=Number_Dict["ALL_NUM"], Exist_All_Num=Number_Dict["EXIST_ALL_NUM"],
+                    Threshold_Num=args.threshold, Log_File_Path=Log_File_Path)
+    return Status
+
+def Run_Years(Year_Fun, args, Log_File_Path):
+    # Serial, or one process per year (at most --workers at a time); a year fails if it raises or returns a non-zero status
+    if args.workers <= 1 or len(args.years) <= 1:
+        Failed = [YEAR for YEAR in args.years if Year_Fun(YEAR, args, Log_File_Path)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(args.years))) as executor:
+            Futures = {YEAR: executor.submit(Year_Fun, YEAR, args, Log_File_Path) for YEAR in args.years}
+        Failed = []
+        for YEAR, future in Futures.items():
+            if future.exception(): THREAD_SAFE_PRINT("RMRB CLI", f"❌{YEAR} failed: {future.exception()}", Log_File_Path)
+            elif not future.result(): continue
+            Failed.append(YEAR)
+    if Failed: THREAD_SAFE_PRINT("RMRB CLI", f"❌Failed years: {Failed}", Log_File_Path)
+    return 1 if Failed else 0
+
+def Run_Tools(args, Log_File_Path): return Run_Years(Tools_Year, args, Log_File_Path)
+
+def Run_Maintain(args, Log_File_Path): return Run_Years(Maintain_Year, args, Log_File_Path)
+
+def Run_Catalog(args, Log_File_Path): return Run_Years(Catalog_Year, args, Log_File_Path)
+
+def Run_Roots(args, Log_File_Path):
+    from RMRBCore.RMRB_Roots_v6 import Build_Roots_Index, Merge_Roots
+    if args.action == "index": return 1 if Build_Roots_Index(args.begin, args.end, Log_File_Path=Log_File_Path)["Conflicts"] else 0
+    return 1 if Merge_Roots(args.root, args.begin, args.end, Dry_Run=args.dry_run, Log_File_Path=Log_File_Path)["Conflicts"] else 0
+
+def Run_Undo(args, Log_File_Path):
+    from RMRBCore.RMRB_Maintenance_v6 import Undo_Maintenance
+    return 1 if Undo_Maintenance(args.journal, Log_File_Path)["Failed"] else 0
+
+def Run_Stages(args, Log_File_Path):
+    if "llm" in args.stages and args.threshold is None:
+        THREAD_SAFE_PRINT("RMRB CLI", "❌❌❌--threshold is required by the llm stage", Log_File_Path)
+        return 2
+    return Run_Years(Stages_Year, args, Log_File_Path)
+
+def Build_Parser():
+    parser = argparse.ArgumentParser(prog="RMRB_CLI.py", description="RMRB pipeline command line", formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    parser.add_argument("--root", default="1", help="Data root path, or its number in EXTERNAL_PATH_LIST (default: 1)")
+    parser.add_argument("--sleep", type=int, default=0, help="Seconds to wait before starting (default: 0)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    TODAY = datetime.today().strftime("%Y%m%d")
+    # Date range commands
+    for name, fun, help_text in (
+        ("download", Run_Download, "Download the PDFs of a date range"),
+        ("gap-fill", Run_Gap_Fill, "Fill the missing PDFs of a date range, most recent first"),
+        ("check", Run_Check, "List the dates with missing PDFs"),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--begin", type=Parse_Date(8), default="20260101" if name != "download" else TODAY, help="YYYYMMDD")
+        sub.add_argument("--end", type=Parse_Date(8), default=TODAY, help="YYYYMMDD (default: today)")
+        sub.add_argument("--workers", type=Parse_Workers, default=DOWNLOAD_MAX_WORKERS)
+        sub.add_argument("--refresh", action="store_true", help="Revalidate cached edition manifests")
+        sub.set_defaults(fun=fun)
+    # Year commands
+    def Year_Arguments(sub):
+        sub.add_argument("--years", type=Parse_Years, required=True, help='"2024", "2020-2024" or "2020,2022"')
+        sub.add_argument("--begin", type=Parse_Date(4), default="0101", help="MMDD (default: 0101)")
+        sub.add_argument("--end", type=Parse_Date(4), default="1231", help="MMDD (default: 1231)")
+        sub.add_argument("--workers", type=Parse_Workers, default=1, help="Parallel processes over years (default: 1)")
+        sub.add_argument("--canonical-only", action="store_true", help="Only dates whose canonical copy is on --root")
+    sub = subparsers.add_parser("tools", help="PDF tools")
+    sub.add_argument("tool", choices=["mac", "format", "exist", "split", "fix-name"])
+    Year_Arguments(sub)
+    sub.set_defaults(fun=Run_Tools)
+    sub = subparsers.add_parser("maintain", help="MAC-file removal, name fixing and empty-folder pruning in one pass, with an undo journal")
+    sub.add_argument("--rules", type=lambda text: text.split(","), default=["mac", "name", "prune"], help="Comma-separated subset of mac,name,prune")
+    sub.add_argument("--dry-run", action="store_true", help="Only write the plan, change nothing")
+    Year_Arguments(sub)
+    sub.set_defaults(fun=Run_Maintain)
+    sub = subparsers.add_parser("undo", help="Revert a maintenance run")
+    sub.add_argument("--journal", required=True, help="{Folder}.Maintenance/{Stamp}_Journal.jsonl")
+    sub.set_defaults(fun=Run_Undo)
+    sub = subparsers.add_parser("catalog", help="Rescan the AD images and their OCR/summary status into the catalog")
+    Year_Arguments(sub)
+    sub.set_defaults(fun=Run_Catalog)
+    sub = subparsers.add_parser("roots", help="Content-hash index of the PDF copies on all roots, or merge them into --root")
+    sub.add_argument("action", choices=["index", "merge"])
+    sub.add_argument("--begin", type=Parse_Date(8), required=True, help="YYYYMMDD")
+    sub.add_argument("--end", type=Parse_Date(8), default=TODAY, help="YYYYMMDD (default: today)")
+    sub.add_argument("--dry-run", action="store_true", help="merge: only list what would be copied")
+    sub.set_defaults(fun=Run_Roots)
+    sub = subparsers.add_parser("ad", help="Generate AD images, extract AD blocks or filter shapes/duplicates")
+    sub.add_argument("stage", choices=["image", "block", "shape"])
+    sub.add_argument("--engine", choices=["new", "old"], default="new", help="AD image generator (default: new)")
+    sub.add_argument("--detect", choices=["cv", "vector"], default=None, help="Ad block detection of the new generator (default: AD_DETECT_ENGINE)")
+    Year_Arguments(sub)
+    sub.set_defaults(fun=Run_Stages, threshold=None)
+    sub = subparsers.add_parser("ocr", help="OCR of the AD images")
+    Year_Arguments(sub)
+    sub.set_defaults(fun=Run_Stages, stages=["ocr"], threshold=None)
+    sub = subparsers.add_parser("llm", help="LLM summary of the OCR text")
+    sub.add_argument("--threshold", type=int, required=True)
+    Year_Arguments(sub)
+    sub.set_defaults(fun=Run_Stages, stages=["llm"])
+    sub = subparsers.add_parser("pipeline", help="Run selected stages in order: " + ",".join(STAGES))
+    sub.add_argument("--stages", type=Parse_Stages, default=STAGES)
+    sub.add_argument("--engine", choices=["new", "old"], default="new")
+    sub.add_argument("--detect", choices=["cv", "vector"], default=None)
+    sub.add_argument("--threshold", type=int, default=None, help="Required by the llm stage")
+    Year_Arguments(sub)
+    sub.set_defaults(fun=Run_Stages)
+    return parser
+
+def main(argv=None, Command=""):
+    """
+    - Command: fixed by the entry scripts (e.g. "ocr" for `python RMRB_OCR.py --years 2024`), inserted after the global options
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if Command:
+        index = 0
+        while index < len(argv) and argv[index].split("=")[0] in ("--root", "--sleep"): index += 1 if "=" in argv[index] else 2
+        argv.insert(index, Command)
+    args = Build_Parser().parse_args(argv)
+    args.root = Parse_Root(args.root)
+    if args.command == "ad": args.stages = [args.stage]
+    LOG_PATH = args.root + "Log/" + datetime.now().strftime("%Y-%m") + "/"
+    LogFilePath = LOG_PATH + "RMRB-CLI-" + args.command + "-" + NowTime(LogFormat=True) + ".log"
+    Check_Folder(LOG_PATH, LogFilePath)
+    THREAD_SAFE_PRINT("RMRB CLI", f"{args.command}: {' '.join(argv)}", LogFilePath)
+    if args.sleep:
+        THREAD_SAFE_PRINT("RMRB CLI", f"Sleeping for {args.sleep}s...", LogFilePath)
+        time.sleep(args.sleep)
+    return args.fun(args, LogFilePath)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.append(script_dir)
 
-from RMRB_Main import RMRB_PDF_Downloader, Check_RMRB_Exist
+from RMRB_Main import RMRB_PDF_Downloader, Check_RMRB_Exist, RMRB_Gap_Fill
 from Config.Config import EXTERNAL_PATH_LIST, EXTERNAL_PATH, WEEKDAY_DICT
 # from Config.Config import LOG_PATH
 from datetime import datetime
@@ -17,7 +17,11 @@ THREAD_SAFE_PRINT = PrintUtils.THREAD_SAFE_PRINT
 NowTime = TimeUtils.NowTime
 
 if __name__ == "__main__":
-    
+    # Non-interactive: python RMRB_Downloader.py [--root PATH|N] {download,gap-fill,check} [options] (see RMRB_CLI.py)
+    if len(sys.argv) > 1:
+        from RMRB_CLI import main
+        sys.exit(main())
+
     # Choose external path
     EXTERNAL_MSG = "Choose the external path.\n"
     EXTERNAL_PATH_CHOICE_DICT = {}
@@ -77,8 +81,7 @@ if __name__ == "__main__":
                     THREAD_SAFE_PRINT("RMRB Downloader Main", date, LogFilePath)
                 Download = input("Download (Y/N)? ")
                 if Download == "Y":
-                    for date in Missing_Dates:
-                        RMRB_PDF_Downloader(Begin_date=date, End_date=date, Download_Path=External_Path, Log_File_Path=LogFilePath)
+                    RMRB_Gap_Fill(Begin_date="20260101", End_date=TODAY, Download_Path=External_Path, Log_File_Path=LogFilePath)
                 elif Download == "N": exit()
                 else: THREAD_SAFE_PRINT("RMRB Downloader Main", "Invalid input, please input Y or N.", LogFilePath)
             else: 
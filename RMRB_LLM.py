@@ -22,6 +22,10 @@ Choose_A_Year = InputUtils.Choose_A_Year
 Sleeping = InputUtils.Sleeping
 
 if __name__ == "__main__":
+    # Non-interactive: python RMRB_LLM.py [--root PATH|N] --years 2024 --threshold N (see RMRB_CLI.py)
+    if len(sys.argv) > 1:
+        from RMRB_CLI import main
+        sys.exit(main(Command="llm"))
     # Choose external path
     EXTERNAL_MSG = "Choose the external path.\n"
     EXTERNAL_PATH_CHOICE_DICT = {}
@@ -1,33 +1,54 @@
-from RMRBCore.RMRB_AD_v6 import AD_Shape_Analysis, Genetare_AD_Image, Genetare_AD_Image_New, Extract_AD_Block, Check_Duplicated_Images
-from RMRBCore.RMRB_Downloader_v2 import Extract_Version_Num, Get_PDF_Link, RMRB_PDF_Downloader, Check_RMRB_Exist
-from RMRBCore.RMRB_Image_v6 import CV_Detect_Ads
-from RMRBCore.RMRB_PDF_v6 import Check_Mac, Check_PDF_Exist, PDF_Split_All, Fix_PDF_Name
-from RMRBCore.RMRB_OCR_v6 import Text_Recognition, OCR, Check_OCR_Completion
-from RMRBCore.RMRB_LLM_v6 import Check_Summary_Completion, Text_Summary, Get_All_Models, API_Usage_Recorder, Exit_Error_Detector
+"""
+- Lazily-resolved facade over the RMRBCore modules
+- `from RMRB_Main import Check_RMRB_Exist` only imports the module that defines it (see `EXPORTS`),
+so short utility runs do not pay for cv2, fitz, pdfplumber, matplotlib or google.genai
+"""
+import importlib
+
+EXPORTS = {
+    "AD_Shape_Analysis": "RMRBCore.RMRB_AD_v6",
+    "Genetare_AD_Image": "RMRBCore.RMRB_AD_v6",
+    "Genetare_AD_Image_New": "RMRBCore.RMRB_AD_v6",
+    "Extract_AD_Block": "RMRBCore.RMRB_AD_v6",
+    "Check_Duplicated_Images": "RMRBCore.RMRB_AD_v6",
+    "Extract_Version_Num": "RMRBCore.RMRB_Downloader_v2",
+    "Get_PDF_Link": "RMRBCore.RMRB_Downloader_v2",
+    "RMRB_PDF_Downloader": "RMRBCore.RMRB_Downloader_v2",
+    "Check_RMRB_Exist": "RMRBCore.RMRB_Downloader_v2",
+    "RMRB_Gap_Fill": "RMRBCore.RMRB_Downloader_v2",
+    "CV_Detect_Ads": "RMRBCore.RMRB_Image_v6",
+    "Vector_Detect_Ads": "RMRBCore.RMRB_Image_v6",
+    "Check_Mac": "RMRBCore.RMRB_PDF_v6",
+    "Check_PDF_Exist": "RMRBCore.RMRB_PDF_v6",
+    "PDF_Split_All": "RMRBCore.RMRB_PDF_v6",
+    "Fix_PDF_Name": "RMRBCore.RMRB_PDF_v6",
+    "Run_Maintenance": "RMRBCore.RMRB_Maintenance_v6",
+    "Undo_Maintenance": "RMRBCore.RMRB_Maintenance_v6",
+    "Catalog_Sync": "RMRBCore.RMRB_Catalog_v6",
+    "Build_Roots_Index": "RMRBCore.RMRB_Roots_v6",
+    "Resolve_Date": "RMRBCore.RMRB_Roots_v6",
+    "Merge_Roots": "RMRBCore.RMRB_Roots_v6",
+    "Text_Recognition": "RMRBCore.RMRB_OCR_v6",
+    "OCR": "RMRBCore.RMRB_OCR_v6",
+    "Check_OCR_Completion": "RMRBCore.RMRB_OCR_v6",
+    "Check_Summary_Completion": "RMRBCore.RMRB_LLM_v6",
+    "Text_Summary": "RMRBCore.RMRB_LLM_v6",
+    "Get_All_Models": "RMRBCore.RMRB_LLM_v6",
+    "API_Usage_Recorder": "RMRBCore.RMRB_LLM_v6",
+    "Exit_Error_Detector": "RMRBCore.RMRB_Error_v6",
+}
+__all__ = list(EXPORTS)
+
+def __getattr__(name):
+    # Import the defining module on first access, then cache the name in this module
+    if name not in EXPORTS: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 if __name__ == "__main__":
-    # Analysis_AD_Position()
-    # Genetare_AD_Image()
-    # Extract_Ad_Block()
-    AD_Shape_Analysis()
-    Extract_Version_Num()
-    Get_PDF_Link()
-    RMRB_PDF_Downloader()
-    Check_RMRB_Exist()
-    CV_Detect_Ads()
-    Genetare_AD_Image()
-    Genetare_AD_Image_New()
-    Check_Duplicated_Images()
-    Extract_AD_Block()
-    Check_Mac()
-    Check_PDF_Exist()
-    PDF_Split_All()
-    Fix_PDF_Name()
-    Text_Recognition()
-    OCR()
-    Check_OCR_Completion()
-    Check_Summary_Completion()
-    Text_Summary()
-    Get_All_Models()
-    API_Usage_Recorder()
-    Exit_Error_Detector()
\ No newline at end of file
+    # Resolve every export (import check of all core modules)
+    for name in __all__: print(f"{name}: {__getattr__(name).__module__}")
@@ -21,7 +21,6 @@ import faulthandler
 faulthandler.enable()
 
 from RMRB_Main import Text_Recognition, Check_OCR_Completion
-from paddleocr import PPStructureV3
 from Config.Config import EXTERNAL_PATH_LIST, EXTERNAL_PATH, MODEL_PATH
 from datetime import datetime
 from Utils.main import PrintUtils, JsonUtils, FileUtils, TimeUtils, SystemUtils, InputUtils
@@ -37,6 +36,7 @@ Sleeping = InputUtils.Sleeping
 Choose_Date = InputUtils.Choose_Date
 
 def PPStructureV3_Pipeline(Model_Path):
+    from paddleocr import PPStructureV3 # Heavy: only imported when the pipeline is built
     pipeline_v3 = PPStructureV3(
         use_doc_orientation_classify=False,
         use_doc_unwarping=False,
@@ -60,6 +60,10 @@ def PPStructureV3_Pipeline(Model_Path):
     return pipeline_v3
 
 if __name__ == "__main__":
+    # Non-interactive: python RMRB_OCR.py [--root PATH|N] --years 2024 [--begin MMDD --end MMDD] (see RMRB_CLI.py)
+    if len(sys.argv) > 1:
+        from RMRB_CLI import main
+        sys.exit(main(Command="ocr"))
     # Choose external path
     EXTERNAL_MSG = "Choose the external path.\n"
     EXTERNAL_PATH_CHOICE_DICT = {}
@@ -47,6 +47,10 @@ def Folder_Formatter(YEAR, Folder_Path, Log_File_Path=""):
                 THREAD_SAFE_PRINT("Folder Formatter", f"Moved {filename} to {date_part}/", Log_File_Path)
 
 if __name__ == "__main__":
+    # Non-interactive: python RMRB_PDFTools.py [--root PATH|N] {mac,format,exist,split,fix-name} --years 2024 (see RMRB_CLI.py)
+    if len(sys.argv) > 1:
+        from RMRB_CLI import main
+        sys.exit(main(Command="tools"))
     # Choose external path
     EXTERNAL_MSG = "Choose the external path.\n"
     EXTERNAL_PATH_CHOICE_DICT = {}
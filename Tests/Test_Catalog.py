@@ -0,0 +1,37 @@
+"""
+- AD image catalog round trip for every image format of `Save_Image` (png, webp, npy)
+- A block's JSON sidecar is found whatever the suffix length, so a sync never drops the OCR status
+"""
+import os
+import sys
+import json
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path: sys.path.append(script_dir)
+import pytest
+import numpy as np
+from RMRBCore.RMRB_Image_v6 import Save_Image, Load_Image
+from RMRBCore.RMRB_Catalog_v6 import Catalog_Sync, Catalog_Record_Sidecar, Catalog_OCR_Status
+
+@pytest.mark.parametrize("Format", ["png", "webp", "npy"])
+def test_sidecar_status_survives_sync(tmp_path, Format):
+    Folder_Path = str(tmp_path) + "/"
+    Log_File_Path = str(tmp_path / "Test.log")
+    AD_Folder_PATH = Folder_Path + "2020_AD/20200105/"
+    os.makedirs(AD_Folder_PATH)
+    Image = (np.random.default_rng(0).random((40, 60, 3)) * 255).astype(np.uint8)
+    Image_Path = Save_Image(Image, AD_Folder_PATH + "20200105_03_CV_Block_1", Format=Format)
+    assert Image_Path.endswith(f".{Format}")
+    assert np.array_equal(np.asarray(Load_Image(Image_Path)), Image)
+    with open(Folder_Path + "2020_AD/2020_Shape_Dict_Final_Filter_Outlier.json", "w", encoding="utf-8") as file:
+        json.dump({"Final_Filter": [os.path.basename(Image_Path)], "Final_Outlier": []}, file)
+    Catalog_Sync("2020", Folder_Path, Log_File_Path=Log_File_Path)
+    assert [Image["OCR_Len"] for Image in Catalog_OCR_Status("2020", Folder_Path, "Test", Log_File_Path=Log_File_Path)] == [None]
+    # OCR writes the sidecar, then the catalog is refreshed for that image
+    with open(AD_Folder_PATH + "20200105_03_CV_Block_1.json", "w", encoding="utf-8") as file:
+        json.dump({"OCR_Test": "广告文本内容", "OCR_Test_Len": 6}, file, ensure_ascii=False)
+    Catalog_Record_Sidecar(Folder_Path, Image_Path, Log_File_Path)
+    assert [Image["OCR_Len"] for Image in Catalog_OCR_Status("2020", Folder_Path, "Test", Log_File_Path=Log_File_Path)] == [6]
+    # A later sync keeps the status
+    Summary = Catalog_Sync("2020", Folder_Path, Log_File_Path=Log_File_Path)
+    assert Summary["Sidecars"] == 0
+    assert [Image["OCR_Len"] for Image in Catalog_OCR_Status("2020", Folder_Path, "Test", Log_File_Path=Log_File_Path)] == [6]
@@ -0,0 +1,113 @@
+"""
+- Concurrent downloader end to end against a local `http.server` stand-in of both channels (no network)
+- The stand-in serves node_XX.html pages (swiper box + "PDF下载" link), one-page PDFs and whole-day JOJO PDFs
+- Checks the {root}YYYY/YYYYMMDD/YYYYMMDDVV.pdf layout, and that a second run reuses the manifest and the index
+- A kept whole-day JOJO PDF goes to {root}Archive/YYYY/, never into the date folder
+"""
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path: sys.path.append(script_dir)
+import fitz
+import pytest
+from RMRBCore import RMRB_Downloader_v2
+from RMRBCore.RMRB_Downloader_v2 import RMRB_PDF_Downloader_Concurrent, Run_Download_Jobs, Extract_Version_Num, Download_JOJO_Date
+from RMRBCore.RMRB_PDF_v6 import Validate_PDF_Year
+
+DATE = "20250102"
+NO_SWIPER_DATE = "20250103"
+VERSION_NUM = 3
+JOJO_DATE = "20150102"
+JOJO_PAGES = 4
+
+def Node_Page(Version_str):
+    Slides = "".join(f'<div class="swiper-slide"><a href="node_{Version:02d}.html">{Version:02d}版</a></div>' for Version in range(1, VERSION_NUM + 1))
+    return (f'<html><head><meta charset="utf-8"></head><body>'
+            f'<div class="swiper-box"><div class="swiper-container">{Slides}</div></div>'
+            f'<p class="right btn"><a href="../../../attachement/{DATE[:6]}/{DATE[6:]}/{DATE}{Version_str}.pdf">PDF下载</a></p>'
+            f'</body></html>').encode("utf-8")
+
+def Make_PDF(Pages=1):
+    doc = fitz.open()
+    for _ in range(Pages): doc.new_page()
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+class Handler(BaseHTTPRequestHandler):
+    # /layout/YYYYMM/DD/node_XX.html, /attachement/YYYYMM/DD/YYYYMMDDVV.pdf and /jojo/YYYY/YYYYMMDD.pdf
+    def do_GET(self):
+        with self.server.Lock: self.server.Paths.append(self.path)
+        name = self.path.rsplit("/", 1)[-1]
+        if self.path.startswith(f"/layout/{DATE[:6]}/{DATE[6:]}/node_"):
+            body, content_type = Node_Page(name[5:7]), "text/html; charset=utf-8"
+        elif self.path.startswith(f"/layout/{NO_SWIPER_DATE[:6]}/{NO_SWIPER_DATE[6:]}/node_"):
+            body, content_type = b"<html><body><div>No edition</div></body></html>", "text/html; charset=utf-8"
+        elif self.path.startswith(f"/attachement/{DATE[:6]}/{DATE[6:]}/{DATE}"):
+            body, content_type = self.server.PDF, "application/pdf"
+        elif self.path == f"/jojo/{JOJO_DATE[:4]}/{JOJO_DATE}.pdf":
+            body, content_type = self.server.Day_PDF, "application/pdf"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args): pass
+
+@pytest.fixture
+def server(monkeypatch):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.Lock, httpd.Paths, httpd.PDF, httpd.Day_PDF = threading.Lock(), [], Make_PDF(), Make_PDF(JOJO_PAGES)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(RMRB_Downloader_v2, "OFFICIAL_URL", f"http://127.0.0.1:{httpd.server_address[1]}/layout/")
+    monkeypatch.setattr(RMRB_Downloader_v2, "JOJO_URL", f"http://127.0.0.1:{httpd.server_address[1]}/jojo/")
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_concurrent_download_layout_and_rerun(server, tmp_path):
+    Download_Path = str(tmp_path) + "/"
+    Log_File_Path = str(tmp_path / "Test.log")
+    Result = RMRB_PDF_Downloader_Concurrent(DATE, DATE, Download_Path, Max_Workers=2, Log_File_Path=Log_File_Path)
+    Expected = [f"{DATE}{Version:02d}" for Version in range(1, VERSION_NUM + 1)]
+    assert Result == {"Success": Expected, "Failed": []}
+    Date_Folder = tmp_path / DATE[:4] / DATE
+    assert sorted(os.listdir(Date_Folder)) == [f"{name}.pdf" for name in Expected]
+    for name in Expected: assert (Date_Folder / f"{name}.pdf").read_bytes() == server.PDF
+    assert (tmp_path / "Manifest" / DATE[:4] / f"{DATE}.json").exists()
+    # node_01 for the version number, then one page and one PDF per version
+    assert sum(path.endswith(".html") for path in server.Paths) == 1 + VERSION_NUM
+    assert sum(path.endswith(".pdf") for path in server.Paths) == VERSION_NUM
+    # Second run: complete manifest and verified files, nothing is requested
+    Requests = len(server.Paths)
+    Result = RMRB_PDF_Downloader_Concurrent(DATE, DATE, Download_Path, Max_Workers=2, Log_File_Path=Log_File_Path)
+    assert Result == {"Success": Expected, "Failed": []}
+    assert server.Paths[Requests:] == []
+
+def test_jojo_keep_original_goes_to_archive(server, tmp_path):
+    Download_Path = str(tmp_path) + "/"
+    Log_File_Path = str(tmp_path / "Test.log")
+    assert Download_JOJO_Date(JOJO_DATE, Download_Path, Keep_Original=True, Log_File_Path=Log_File_Path)
+    Date_Folder = tmp_path / JOJO_DATE[:4] / JOJO_DATE
+    assert sorted(os.listdir(Date_Folder)) == [f"{JOJO_DATE}{Version:02d}.pdf" for Version in range(1, JOJO_PAGES + 1)]
+    assert (tmp_path / "Archive" / JOJO_DATE[:4] / f"{JOJO_DATE}.pdf").read_bytes() == server.Day_PDF
+    Report = Validate_PDF_Year(JOJO_DATE[:4], Download_Path, JOJO_DATE[4:], JOJO_DATE[4:], Write_Report=False, Log_File_Path=Log_File_Path)
+    Entry = Report["Dates"][0]
+    assert (Entry["Pages"], Entry["Files"]) == (JOJO_PAGES, JOJO_PAGES)
+
+def test_extract_version_num_never_prompts_by_default(server, tmp_path, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda *args: pytest.fail("input() called"))
+    Log_File_Path = str(tmp_path / "Test.log")
+    assert Extract_Version_Num(DATE[:4], DATE[4:6], DATE[6:], Log_File_Path=Log_File_Path) == VERSION_NUM
+    assert Extract_Version_Num(NO_SWIPER_DATE[:4], NO_SWIPER_DATE[4:6], NO_SWIPER_DATE[6:], Log_File_Path=Log_File_Path) is None
+
+def test_run_download_jobs_rejects_no_worker(tmp_path):
+    with pytest.raises(ValueError):
+        Run_Download_Jobs({DATE: None}, str(tmp_path) + "/", Max_Workers=0, Log_File_Path=str(tmp_path / "Test.log"))
@@ -0,0 +1,24 @@
+"""
+- Fast tokenizer/regex parsers of the official node_XX.html pages agree with the BeautifulSoup fallback
+- Fixtures in Tests/Fixtures: a normal page, a page without PDF link, a GBK page declared by <meta charset>
+"""
+import os
+import sys
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path: sys.path.append(script_dir)
+import pytest
+from RMRBCore.RMRB_Downloader_v2 import Decode_HTML, Fast_Version_Num, Fast_PDF_Link, Soup_Version_Num, Soup_PDF_Link
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Fixtures")
+URL = "http://paper.people.com.cn/rmrb/pc/layout/202501/02/node_01.html"
+PDF_URL = "http://paper.people.com.cn/rmrb/pc/attachement/202501/02/7a1c0e6b-0d7e-4f4b-9a7e-2b1f1f1a3c01.pdf"
+
+@pytest.mark.parametrize("name, Version_Num, PDF_Link", [
+    ("node_01.html", 20, PDF_URL),
+    ("node_02_nolink.html", 20, None),
+    ("node_03_gbk.html", 8, PDF_URL),
+])
+def test_fast_parsers_match_soup(name, Version_Num, PDF_Link):
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as file: text = Decode_HTML(file.read())
+    assert Fast_Version_Num(text) == Soup_Version_Num(text) == Version_Num
+    assert Fast_PDF_Link(text, URL) == Soup_PDF_Link(text, URL) == PDF_Link
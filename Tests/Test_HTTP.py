@@ -0,0 +1,108 @@
+"""
+- Downloader HTTP layer against a local `http.server` stand-in (no network)
+- Per-host limiter: concurrency cap and token-bucket rate
+- `Stream_To_File`: Range resume after a cut-off stream (in one run and across runs), atomic rename
+"""
+import os
+import sys
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if script_dir not in sys.path: sys.path.append(script_dir)
+import pytest
+import requests
+from RMRBCore.RMRB_HTTP_v6 import HostLimiter, Build_Session, Limited_Get, Stream_To_File
+
+BODY = os.urandom(64 * 1024)
+
+class Handler(BaseHTTPRequestHandler):
+    # Serves BODY with Range support; `Cut` requests are dropped after half of the body
+    def do_GET(self):
+        server = self.server
+        with server.Lock:
+            server.Ranges.append(self.headers.get("Range"))
+            server.Active += 1
+            server.Peak = max(server.Peak, server.Active)
+            cut = server.Cut > 0
+            if cut: server.Cut -= 1
+        try:
+            time.sleep(server.Delay)
+            Offset = 0
+            if self.headers.get("Range"): Offset = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            self.send_response(206 if Offset else 200)
+            if Offset: self.send_header("Content-Range", f"bytes {Offset}-{len(BODY) - 1}/{len(BODY)}")
+            self.send_header("Content-Length", str(len(BODY) - Offset))
+            self.send_header("ETag", '"body"')
+            self.end_headers()
+            if cut:
+                self.wfile.write(BODY[Offset:len(BODY) // 2])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write(BODY[Offset:])
+        finally:
+            with server.Lock: server.Active -= 1
+
+    def log_message(self, *args): pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.Lock = threading.Lock()
+    httpd.Ranges, httpd.Active, httpd.Peak, httpd.Cut, httpd.Delay = [], 0, 0, 0, 0.0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.URL = f"http://127.0.0.1:{httpd.server_address[1]}/2020010101.pdf"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_limiter_caps_concurrency_and_rate(server):
+    server.Delay = 0.1
+    Limiter = HostLimiter(Max_Concurrency=2, Rate=10, Burst=2)
+    Session = Build_Session(Max_Retries=0)
+    begin = time.monotonic()
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        Codes = list(pool.map(lambda _: Limited_Get(server.URL, Limiter=Limiter, Session=Session).status_code, range(6)))
+    Elapsed = time.monotonic() - begin
+    assert Codes == [200] * 6
+    assert server.Peak <= 2
+    # Burst of 2, then 4 tokens at 10/s
+    assert Elapsed >= 0.35
+
+def test_stream_resumes_after_cut(server, tmp_path):
+    server.Cut = 1
+    Store_Path = str(tmp_path / "2020010101.pdf")
+    Result = Stream_To_File(server.URL, Store_Path, Chunk_Size=1024, Checkpoint_Size=1024,
+                            Limiter=HostLimiter(Rate=100), Session=Build_Session(Max_Retries=0), Log_File_Path=str(tmp_path / "Test.log"))
+    with open(Store_Path, "rb") as file: assert file.read() == BODY
+    assert Result["Size"] == len(BODY)
+    assert Result["SHA256"] == hashlib.sha256(BODY).hexdigest()
+    assert server.Ranges == [None, f"bytes={len(BODY) // 2}-"]
+    assert not os.path.exists(Store_Path + ".part") and not os.path.exists(Store_Path + ".part.json")
+
+def test_stream_resumes_across_runs(server, tmp_path):
+    server.Cut = 1
+    Store_Path = str(tmp_path / "2020010101.pdf")
+    Options = dict(Chunk_Size=1024, Checkpoint_Size=1024, Limiter=HostLimiter(Rate=100), Session=Build_Session(Max_Retries=0),
+                   Log_File_Path=str(tmp_path / "Test.log"))
+    with pytest.raises(requests.exceptions.RequestException):
+        Stream_To_File(server.URL, Store_Path, Max_Resumes=0, **Options)
+    # The interrupted run keeps `.part` and its checkpoint, never the final name
+    assert not os.path.exists(Store_Path)
+    assert os.path.getsize(Store_Path + ".part") == len(BODY) // 2
+    Result = Stream_To_File(server.URL, Store_Path, **Options)
+    with open(Store_Path, "rb") as file: assert file.read() == BODY
+    assert Result["SHA256"] == hashlib.sha256(BODY).hexdigest()
+    assert server.Ranges[-1] == f"bytes={len(BODY) // 2}-"
+
+def test_stream_rejected_body_is_never_renamed(server, tmp_path):
+    Store_Path = str(tmp_path / "Download" / "2020010101.pdf")
+    os.makedirs(tmp_path / "Download")
+    with pytest.raises(ValueError):
+        Stream_To_File(server.URL, Store_Path, Validate=lambda path: False,
+                       Limiter=HostLimiter(Rate=100), Session=Build_Session(Max_Retries=0), Log_File_Path=str(tmp_path / "Test.log"))
+    assert os.listdir(tmp_path / "Download") == []
@@ -1,10 +1,10 @@
 from datetime import datetime, timedelta
 import time
 import shutil
+import hashlib
 import threading
 import os
 import sys
-import psutil
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
@@ -102,6 +102,14 @@ class FileUtils:
             PrintUtils.THREAD_SAFE_PRINT("Get File Size", f"File not found: {file_path}", Log_File_Path)
             return -1
 
+    @staticmethod
+    def File_SHA256(File_Path, Chunk_Size=1024 * 1024):
+        """Returns the SHA-256 hex digest of a file, read chunk by chunk."""
+        sha256 = hashlib.sha256()
+        with open(File_Path, "rb") as file:
+            for chunk in iter(lambda: file.read(Chunk_Size), b""): sha256.update(chunk)
+        return sha256.hexdigest()
+
     @staticmethod
     def Compare_File_Sizes(file1, file2, Log_File_Path=""):
         """Compares the sizes of two files and returns the larger one."""
@@ -318,6 +326,7 @@ class TextUtils:
 class SystemUtils:
     @staticmethod
     def RAM_USAGE(Log_File_Path=""):
+        import psutil # Deferred: only needed here
         
         # Get the current process ID
         pid = os.getpid()